@@ -1,5 +1,7 @@
 import os
 
+import click
+
 from dotenv import load_dotenv
 from flask import Flask, jsonify, make_response, Response, request
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
@@ -8,14 +10,32 @@ from flask_login import LoginManager, login_user, logout_user, login_required, c
 from config import ProductionConfig
 
 from boxing.db import db
+from boxing.models.boxer_snapshot import WEIGHT_CLASSES, BoxerSnapshot
 from boxing.models.boxers_model import Boxers
+from boxing.models.job_model import FIGHT_JOB, IMPORT_BOXERS_JOB, TOURNAMENT_JOB, Jobs
+from boxing.models.matchmaking_model import MatchmakingModel
+from boxing.models.rating_model import FightRecord, Ratings
 from boxing.models.ring_model import RingModel
+from boxing.models.ring_slot_model import RingSlots
+from boxing.models.search_model import ensure_search_indexes, search_boxers
+from boxing.models.tournament_model import TournamentBouts, TournamentEntrants, Tournaments
 from boxing.models.user_model import Users
+from boxing.utils.cache import get_cached_entity, init_cache, row_tags, table_tags
+from boxing.utils.db_utils import configure_sqlite, load_fixtures, reset_tables, restore_template, save_template
+from boxing.utils.events import init_events
+from boxing.utils.fight_utils import get_fighting_skill, simulate_win_count, win_probability, wilson_interval
+from boxing.utils.idempotency import init_idempotency
 from boxing.utils.logger import configure_logger
+from boxing.utils.profiling import init_profiling
+from boxing.utils.rate_limit import ConcurrencyGate, init_rate_limiter
+from boxing.utils.session_store import init_session_store, regenerate_session
 
 
 load_dotenv()
 
+# Tables that refer to boxers by ID, emptied whenever boxer IDs restart
+BOXER_DEPENDENT_MODELS = (Ratings, FightRecord, RingSlots, TournamentBouts, TournamentEntrants, Tournaments, Jobs)
+
 def create_app(config_class=ProductionConfig):
     app = Flask(__name__)
     configure_logger(app.logger)
@@ -24,7 +44,32 @@ def create_app(config_class=ProductionConfig):
 
     db.init_app(app)  # Initialize db with app
     with app.app_context():
+        configure_sqlite(db.engine, app.config.get("SQLITE_BUSY_TIMEOUT_MS", 5000),
+                         app.config.get("SQLITE_WAL_ENABLED", True))
         db.create_all()  # Recreate all tables
+        ensure_search_indexes(db.engine)
+
+    session_store = init_session_store(app)  # None when using signed cookie sessions
+    init_profiling(app)
+
+    limiter = init_rate_limiter(app)
+    # Per worker process; under the gthread worker it only bites below GUNICORN_THREADS
+    fight_gate = ConcurrencyGate(app.config.get("FIGHT_MAX_CONCURRENCY", 8))
+    idempotent = init_idempotency(app)
+    events = init_events(app)
+
+    caches = init_cache(app)
+    # Users are never put in the shared tier, to keep password hashes out of it. Without the redis
+    # backend other workers are not told when a user is deleted, so their entries must expire quickly
+    users_ttl = app.config.get("CACHE_USERS_TTL", 60)
+    if app.config.get("CACHE_BACKEND", "memory") != "redis":
+        users_ttl = min(users_ttl, app.config.get("CACHE_USERS_LOCAL_TTL", 3))
+    users_cache = caches.cache("users", app.config.get("CACHE_USERS_SIZE", 10000), users_ttl, shared=False)
+    boxers_cache = caches.cache("boxers", app.config.get("CACHE_BOXERS_SIZE", 10000),
+                                app.config.get("CACHE_BOXERS_TTL", 30))
+    leaderboard_cache = caches.cache("leaderboard", 8, app.config.get("CACHE_LEADERBOARD_TTL", 5))
+    predictions_cache = caches.cache("predictions", app.config.get("CACHE_PREDICTIONS_SIZE", 10000),
+                                     app.config.get("CACHE_PREDICTIONS_TTL", 3600))
 
     login_manager = LoginManager()
     login_manager.init_app(app)
@@ -32,7 +77,9 @@ def create_app(config_class=ProductionConfig):
 
     @login_manager.user_loader
     def load_user(user_id):
-        return Users.query.filter_by(username=user_id).first()
+        # Runs on every authenticated request, so it is served from the cache after the first load
+        return get_cached_entity(users_cache, Users, user_id,
+                                 lambda: Users.query.filter_by(username=user_id).first())
 
     @login_manager.unauthorized_handler
     def unauthorized():
@@ -42,7 +89,7 @@ def create_app(config_class=ProductionConfig):
         }), 401)
 
 
-    ring_model = RingModel()
+    matchmaker = MatchmakingModel(app.config.get("MATCHMAKING_REFRESH_SECONDS", 300))
 
 
     ####################################################
@@ -68,6 +115,22 @@ def create_app(config_class=ProductionConfig):
         }), 200)
 
 
+    @app.route('/api/cache-stats', methods=['GET'])
+    @login_required
+    def cache_stats() -> Response:
+        """
+        Route to get hit, miss and eviction counts of this worker's caches, for tuning their sizes and TTLs.
+
+        Returns:
+            JSON response with the stats of each cache.
+
+        """
+        return make_response(jsonify({
+            "status": "success",
+            "caches": caches.get_stats()
+        }), 200)
+
+
     ##########################################################
     #
     # User Management
@@ -75,6 +138,7 @@ def create_app(config_class=ProductionConfig):
     #########################################################
 
     @app.route('/api/create-user', methods=['PUT'])
+    @idempotent
     def create_user() -> Response:
         """Register a new user account.
 
@@ -82,11 +146,16 @@ def create_app(config_class=ProductionConfig):
             - username (str): The desired username.
             - password (str): The desired password.
 
+        Headers:
+            - Idempotency-Key (str, optional): Retries with the same key get the original response.
+
         Returns:
             JSON response indicating the success of the user creation.
 
         Raises:
             400 error if the username or password is missing.
+            409 error if a request with the same idempotency key is still in progress.
+            422 error if the idempotency key was used for a different request.
             500 error if there is an issue creating the user in the database.
         """
         try:
@@ -120,6 +189,7 @@ def create_app(config_class=ProductionConfig):
             }), 500)
 
     @app.route('/api/login', methods=['POST'])
+    @limiter.limit("ip", app.config.get("RATE_LIMIT_LOGIN", "10/minute"))
     def login() -> Response:
         """Authenticate a user and log them in.
 
@@ -132,6 +202,7 @@ def create_app(config_class=ProductionConfig):
 
         Raises:
             401 error if the username or password is incorrect.
+            429 error if too many login attempts were made from the client's IP.
         """
         try:
             data = request.get_json()
@@ -146,6 +217,7 @@ def create_app(config_class=ProductionConfig):
 
             if Users.check_password(username, password):
                 user = Users.query.filter_by(username=username).first()
+                regenerate_session()  # Prevent session fixation
                 login_user(user)
                 return make_response(jsonify({
                     "status": "success",
@@ -232,7 +304,7 @@ def create_app(config_class=ProductionConfig):
 
     @app.route('/api/reset-users', methods=['DELETE'])
     def reset_users() -> Response:
-        """Recreate the users table to delete all users.
+        """Delete all users, by emptying the users table or, with RESET_MODE=recreate, recreating it.
 
         Returns:
             JSON response indicating the success of recreating the Users table.
@@ -242,9 +314,17 @@ def create_app(config_class=ProductionConfig):
         """
         try:
             app.logger.info("Received request to recreate Users table")
-            with app.app_context():
-                Users.__table__.drop(db.engine)
-                Users.__table__.create(db.engine)
+            if app.config.get("RESET_MODE", "fast") == "recreate":
+                with app.app_context():
+                    Users.__table__.drop(db.engine)
+                    Users.__table__.create(db.engine)
+            else:
+                db.session.remove()
+                reset_tables(db.engine, Users)
+            caches.invalidate(table_tags("users"))
+            if session_store is not None:
+                session_store.clear()  # Sessions of deleted users must not stay valid
+            idempotent.clear()
             app.logger.info("Users table recreated successfully")
             return make_response(jsonify({
                 "status": "success",
@@ -267,7 +347,10 @@ def create_app(config_class=ProductionConfig):
 
     @app.route('/api/reset-boxers', methods=['DELETE'])
     def reset_boxers() -> Response:
-        """Recreate the boxers table to delete boxers users.
+        """Delete all boxers along with their ratings, fight history, tournaments and jobs.
+
+        Boxers are deleted by emptying the table or, with RESET_MODE=recreate, by recreating it.
+        IDs restart in both modes, so everything that refers to boxers by ID is removed too.
 
         Returns:
             JSON response indicating the success of recreating the Boxers table.
@@ -277,9 +360,19 @@ def create_app(config_class=ProductionConfig):
         """
         try:
             app.logger.info("Received request to recreate Boxers table")
-            with app.app_context():
-                Boxers.__table__.drop(db.engine)
-                Boxers.__table__.create(db.engine)
+            if app.config.get("RESET_MODE", "fast") == "recreate":
+                with app.app_context():
+                    Boxers.__table__.drop(db.engine)
+                    Boxers.__table__.create(db.engine)
+                    ensure_search_indexes(db.engine, rebuild=True)
+                    reset_tables(db.engine, *BOXER_DEPENDENT_MODELS)
+            else:
+                db.session.remove()
+                reset_tables(db.engine, Boxers, *BOXER_DEPENDENT_MODELS)
+            caches.invalidate((*table_tags("boxers"), *table_tags("ratings")))
+            matchmaker.invalidate()
+            idempotent.clear()  # Stored responses refer to boxers that no longer exist
+            events.publish("leaderboard", {"reload": True})
             app.logger.info("Boxers table recreated successfully")
             return make_response(jsonify({
                 "status": "success",
@@ -297,6 +390,7 @@ def create_app(config_class=ProductionConfig):
 
     @app.route('/api/add-boxer', methods=['POST'])
     @login_required
+    @idempotent
     def add_boxer() -> Response:
         """Route to add a new boxer to the gym.
 
@@ -307,11 +401,16 @@ def create_app(config_class=ProductionConfig):
             - reach (float): The boxer's reach in inches.
             - age (int): The boxer's age.
 
+        Headers:
+            - Idempotency-Key (str, optional): Retries with the same key get the original response.
+
         Returns:
             JSON response indicating the success of the boxer addition.
 
         Raises:
             400 error if input validation fails.
+            409 error if a request with the same idempotency key is still in progress.
+            422 error if the idempotency key was used for a different request.
             500 error if there is an issue adding the boxer to the database.
 
         """
@@ -352,6 +451,9 @@ def create_app(config_class=ProductionConfig):
             app.logger.info(f"Adding boxer: {name}, {weight}kg, {height}cm, {reach} inches, {age} years old")
             Boxers.create_boxer(name, weight, height, reach, age)
 
+            boxer = Boxers.get_boxer_by_name(name)
+            matchmaker.add_boxer(BoxerSnapshot.from_boxer(boxer, Ratings.get_ratings([boxer.id])[boxer.id]))
+
             app.logger.info(f"Boxer added successfully: {name}")
             return make_response(jsonify({
                 "status": "success",
@@ -367,6 +469,76 @@ def create_app(config_class=ProductionConfig):
             }), 500)
 
 
+    @app.route('/api/import-boxers', methods=['POST'])
+    @login_required
+    @idempotent
+    def import_boxers() -> Response:
+        """Route to add many boxers at once, in the background.
+
+        Expected JSON Input:
+            - boxers (list): Boxers with the same fields as /api/add-boxer.
+
+        Returns:
+            202 JSON response with the ID of the import job; poll /api/jobs/<id> for the result.
+
+        Raises:
+            400 error if input validation fails or there are too many boxers.
+            500 error if there is an issue queueing the import.
+
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            boxers = data.get("boxers")
+            max_boxers = app.config.get("IMPORT_MAX_BOXERS", 10000)
+
+            if not isinstance(boxers, list) or not boxers:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "boxers must be a non-empty list"
+                }), 400)
+            if len(boxers) > max_boxers:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": f"Cannot import more than {max_boxers} boxers at once"
+                }), 400)
+
+            required_fields = ["name", "weight", "height", "reach", "age"]
+            for index, boxer in enumerate(boxers):
+                if (
+                    not isinstance(boxer, dict)
+                    or any(field not in boxer for field in required_fields)
+                    or not isinstance(boxer["name"], str)
+                    or not all(isinstance(boxer[field], (int, float)) for field in ("weight", "height", "reach"))
+                    or not isinstance(boxer["age"], int)
+                ):
+                    app.logger.warning(f"Invalid boxer at index {index} in import")
+                    return make_response(jsonify({
+                        "status": "error",
+                        "message": f"Invalid boxer at index {index}: {', '.join(required_fields)} are required; name should be a string, weight/height/reach should be numbers, age should be an integer"
+                    }), 400)
+
+            job = Jobs.enqueue(IMPORT_BOXERS_JOB, {"boxers": [
+                {field: boxer[field] for field in required_fields} for boxer in boxers
+            ]}, created_by=current_user.username, max_attempts=app.config.get("JOB_MAX_ATTEMPTS", 3))
+
+            app.logger.info(f"Import of {len(boxers)} boxers queued as job {job.id}")
+            response = make_response(jsonify({
+                "status": "success",
+                "message": f"Import of {len(boxers)} boxers queued",
+                "job_id": job.id
+            }), 202)
+            response.headers["Location"] = f"/api/jobs/{job.id}"
+            return response
+
+        except Exception as e:
+            app.logger.error(f"Failed to queue boxer import: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while queueing the import",
+                "details": str(e)
+            }), 500)
+
+
     @app.route('/api/delete-boxer/<int:boxer_id>', methods=['DELETE'])
     @login_required
     def delete_boxer(boxer_id: int) -> Response:
@@ -396,6 +568,8 @@ def create_app(config_class=ProductionConfig):
                 }), 400)
 
             Boxers.delete_boxer(boxer_id)
+            RingSlots.remove(boxer_id)
+            matchmaker.remove_boxer(boxer_id)
             app.logger.info(f"Successfully deleted boxer with ID {boxer_id}")
 
             return make_response(jsonify({
@@ -431,7 +605,8 @@ def create_app(config_class=ProductionConfig):
         try:
             app.logger.info(f"Received request to retrieve boxer with ID {boxer_id}")
 
-            boxer = Boxers.get_boxer_by_id(boxer_id)
+            boxer = get_cached_entity(boxers_cache, Boxers, f"id:{boxer_id}",
+                                      lambda: Boxers.get_boxer_by_id(boxer_id))
 
             if not boxer:
                 app.logger.warning(f"Boxer with ID {boxer_id} not found.")
@@ -474,7 +649,8 @@ def create_app(config_class=ProductionConfig):
         try:
             app.logger.info(f"Received request to retrieve boxer with name '{boxer_name}'")
 
-            boxer = Boxers.get_boxer_by_name(boxer_name)
+            boxer = get_cached_entity(boxers_cache, Boxers, f"name:{boxer_name}",
+                                      lambda: Boxers.get_boxer_by_name(boxer_name))
 
             if not boxer:
                 app.logger.warning(f"Boxer '{boxer_name}' not found.")
@@ -498,6 +674,71 @@ def create_app(config_class=ProductionConfig):
             }), 500)
 
 
+    @app.route('/api/boxers', methods=['GET'])
+    @login_required
+    def find_boxers() -> Response:
+        """Route to search boxers by attributes, one page at a time.
+
+        Query Parameters:
+            - weight_min (int): Minimum weight, inclusive.
+            - weight_max (int): Maximum weight, inclusive.
+            - age (int): Exact age.
+            - reach_min (float): Minimum reach, inclusive.
+            - reach_max (float): Maximum reach, inclusive.
+            - name_prefix (str): Matches boxers with a name word starting with this text.
+            - after (str): Cursor from the previous page's 'next_cursor', sent with the same filters.
+            - limit (int): Page size (default 50, max 500).
+
+        Returns:
+            JSON response with the matching boxers and the cursor of the next page.
+
+        Raises:
+            400 error if a parameter is invalid.
+            500 error if there is an issue searching the boxers.
+
+        """
+        try:
+            try:
+                filters = {
+                    "weight_min": request.args.get('weight_min', type=int),
+                    "weight_max": request.args.get('weight_max', type=int),
+                    "age": request.args.get('age', type=int),
+                    "reach_min": request.args.get('reach_min', type=float),
+                    "reach_max": request.args.get('reach_max', type=float),
+                }
+                for field in filters:
+                    if field in request.args and filters[field] is None:
+                        raise ValueError(f"Invalid value for '{field}': must be a number")
+                limit = int(request.args.get('limit', 50))
+                boxers, next_cursor = search_boxers(
+                    name_prefix=request.args.get('name_prefix'),
+                    after=request.args.get('after'),
+                    limit=limit,
+                    **filters
+                )
+            except ValueError as e:
+                app.logger.warning(f"Invalid boxer search: {e}")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": str(e)
+                }), 400)
+
+            app.logger.info(f"Boxer search returned {len(boxers)} boxer(s)")
+            return make_response(jsonify({
+                "status": "success",
+                "boxers": boxers,
+                "next_cursor": next_cursor
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Error searching boxers: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while searching boxers",
+                "details": str(e)
+            }), 500)
+
+
     ############################################################
     #
     # Ring
@@ -505,25 +746,220 @@ def create_app(config_class=ProductionConfig):
     ############################################################
 
 
+    def load_boxer(boxer_id: int):
+        """Look up a boxer by ID through the cache, or None if it does not exist."""
+        try:
+            return get_cached_entity(boxers_cache, Boxers, f"id:{boxer_id}",
+                                     lambda: Boxers.get_boxer_by_id(boxer_id))
+        except ValueError:
+            return None
+
+
+    def get_ring_boxers(boxer_ids: list[int]) -> list[BoxerSnapshot]:
+        """Snapshots of the given ring boxers, which are kept in the database as IDs only.
+
+        Raises:
+            ValueError: If a boxer no longer exists.
+        """
+        ratings = Ratings.get_ratings(boxer_ids)
+        boxers = []
+        for boxer_id in boxer_ids:
+            boxer = load_boxer(boxer_id)
+            if boxer is None:
+                raise ValueError(f"Boxer with ID {boxer_id} not found")
+            boxers.append(BoxerSnapshot.from_boxer(boxer, ratings[boxer_id]))
+        return boxers
+
+
+    @app.route('/api/predict', methods=['GET'])
+    @login_required
+    # Each uncached prediction can simulate PREDICT_MAX_TRIALS fights, so they are limited across all users
+    @limiter.limit("global", app.config.get("RATE_LIMIT_PREDICT_GLOBAL", "120/minute"))
+    def predict() -> Response:
+        """Route to estimate who would win a fight, without fighting or changing any stats.
+
+        Runs a Monte Carlo simulation of the fight with a local random generator,
+        using the same skills and win probability as /api/fight. Results are cached
+        per boxer pair until either boxer changes.
+
+        Query Parameters:
+            - a (int): The ID of the boxer who enters the ring first.
+            - b (int): The ID of the boxer who enters the ring second.
+            - n (int, optional): The number of fights to simulate.
+            - seed (int, optional): Seed of the random generator, for reproducible results.
+
+        Returns:
+            JSON response with boxer a's simulated win probability, its 95% confidence
+            interval and the exact probability it estimates.
+
+        Raises:
+            400 error if a parameter is missing or invalid, or a boxer is not found.
+            429 error if the global prediction rate limit is exceeded.
+            500 error if there is an issue running the prediction.
+
+        """
+        try:
+            boxer_a_id = request.args.get('a', type=int)
+            boxer_b_id = request.args.get('b', type=int)
+            trials = request.args.get('n', app.config.get("PREDICT_DEFAULT_TRIALS", 10000), type=int)
+            seed = request.args.get('seed', type=int)
+            max_trials = app.config.get("PREDICT_MAX_TRIALS", 1000000)
+
+            if boxer_a_id is None or boxer_b_id is None:
+                app.logger.warning("Prediction requested without two boxer IDs")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Query parameters 'a' and 'b' must be boxer IDs"
+                }), 400)
+            if boxer_a_id == boxer_b_id:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "A boxer cannot fight themselves"
+                }), 400)
+            if trials is None or not 1 <= trials <= max_trials:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": f"Query parameter 'n' must be an integer between 1 and {max_trials}"
+                }), 400)
+            if seed is not None and seed < 0:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Query parameter 'seed' must be a non-negative integer"
+                }), 400)
+
+            boxers = []
+            for boxer_id in (boxer_a_id, boxer_b_id):
+                boxer = load_boxer(boxer_id)
+                if not boxer:
+                    app.logger.warning(f"Boxer with ID {boxer_id} not found.")
+                    return make_response(jsonify({
+                        "status": "error",
+                        "message": f"Boxer with ID {boxer_id} not found"
+                    }), 400)
+                boxers.append(boxer)
+
+            skill_a, skill_b = (
+                get_fighting_skill(boxer.weight, boxer.name, boxer.reach, boxer.age) for boxer in boxers
+            )
+
+            def run_prediction() -> dict:
+                wins = simulate_win_count(seed, skill_a, skill_b, trials)
+                lower, upper = wilson_interval(wins, trials)
+                return {
+                    "trials": trials,
+                    "wins_a": wins,
+                    "probability_a": wins / trials,
+                    "confidence_interval": [lower, upper],
+                    "exact_probability_a": float(win_probability(skill_a, skill_b)),
+                }
+
+            # The skills act as the stats version: an edited boxer gets a new entry and its row tags drop the old one
+            app.logger.info(f"Predicting fight between boxers {boxer_a_id} and {boxer_b_id} over {trials} trials")
+            prediction = predictions_cache.get_or_set(
+                f"{boxer_a_id}:{boxer_b_id}:{trials}:{seed}:{skill_a!r}:{skill_b!r}", run_prediction,
+                tags=(*row_tags("boxers", boxer_a_id), *row_tags("boxers", boxer_b_id))
+            )
+
+            return make_response(jsonify({
+                "status": "success",
+                "boxer_a": {"id": boxers[0].id, "name": boxers[0].name},
+                "boxer_b": {"id": boxers[1].id, "name": boxers[1].name},
+                **prediction
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Error predicting fight: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while predicting the fight",
+                "details": str(e)
+            }), 500)
+
+
     @app.route('/api/fight', methods=['GET'])
     @login_required
+    @idempotent
+    # Global first, so requests it turns away do not use up the caller's own quota
+    @limiter.limit("global", app.config.get("RATE_LIMIT_FIGHT_GLOBAL", "600/minute"))
+    @limiter.limit("user", app.config.get("RATE_LIMIT_FIGHT_USER", "30/minute"))
+    @fight_gate
     def bout() -> Response:
         """Route that triggers the fight between the two current boxers.
 
+        Query Parameters:
+            - async (str, optional): '1' or 'true' to queue the fight for the job worker
+              and return its job ID right away. The boxers leave the ring when queued.
+
+        Headers:
+            - Idempotency-Key (str, optional): Retries with the same key get the original
+              result instead of starting another fight.
+
         Returns:
-            JSON response indicating the winner of the fight.
+            JSON response indicating the winner of the fight, or 202 with the job ID when async.
 
         Raises:
             400 error if the fight cannot be triggered due to insufficient combatants.
+            409 error if a request with the same idempotency key is still in progress.
+            422 error if the idempotency key was used for a different request.
+            429 error if the user or global fight rate limit is exceeded.
             500 error if there is an issue during the fight.
+            503 error if FIGHT_MAX_CONCURRENCY fights are already in progress in this worker process.
 
         """
         try:
+            if request.args.get("async", "").lower() in ("1", "true"):
+                boxer_ids = RingSlots.take_all()
+                try:
+                    job = Jobs.enqueue(FIGHT_JOB, {"boxer_ids": boxer_ids},
+                                       created_by=current_user.username,
+                                       max_attempts=app.config.get("JOB_MAX_ATTEMPTS", 3))
+                except Exception:
+                    RingSlots.restore(boxer_ids)
+                    raise
+                events.publish("ring", {"action": "clear", "boxers": []})
+
+                app.logger.info(f"Fight queued as job {job.id}")
+                response = make_response(jsonify({
+                    "status": "success",
+                    "message": "Fight queued",
+                    "job_id": job.id
+                }), 202)
+                response.headers["Location"] = f"/api/jobs/{job.id}"
+                return response
+
             app.logger.info("Initiating fight...")
 
-            winner = ring_model.fight()
+            # Taking the boxers out first means a concurrent request cannot fight the same pair
+            boxer_ids = RingSlots.take_all()
+            try:
+                boxers = get_ring_boxers(boxer_ids)
+                ring = RingModel()
+                for boxer in boxers:
+                    ring.enter_ring(boxer)
+                winner = ring.fight()
+            except Exception:
+                RingSlots.restore(boxer_ids)
+                raise
 
             app.logger.info(f"Fight complete. Winner: {winner}")
+
+            new_ratings = {}
+            try:
+                winner_boxer = next(boxer for boxer in boxers if boxer.name == winner)
+                loser_boxer = next(boxer for boxer in boxers if boxer.name != winner)
+                new_ratings = Ratings.record_fight(winner_boxer.id, loser_boxer.id)
+                for boxer_id, rating in new_ratings.items():
+                    matchmaker.update_rating(boxer_id, rating["rating"])
+            except Exception as e:
+                # The fight itself has already been recorded, so don't fail the request
+                app.logger.error(f"Failed to update ratings after fight: {e}")
+
+            events.publish("fight", {
+                "winner": winner,
+                "boxers": [{"id": boxer.id, "name": boxer.name} for boxer in boxers]
+            })
+            if new_ratings:
+                events.publish("leaderboard", {"ratings": list(new_ratings.values())})
             return make_response(jsonify({
                 "status": "success",
                 "message": "Fight complete",
@@ -561,7 +997,8 @@ def create_app(config_class=ProductionConfig):
         try:
             app.logger.info("Clearing all boxers...")
 
-            ring_model.clear_ring()
+            RingSlots.clear()
+            events.publish("ring", {"action": "clear", "boxers": []})
 
             app.logger.info("Boxers cleared from ring successfully.")
             return make_response(jsonify({
@@ -607,7 +1044,8 @@ def create_app(config_class=ProductionConfig):
 
             app.logger.info(f"Attempting to enter {boxer_name} into the ring.")
 
-            boxer = Boxers.get_boxer_by_name(boxer_name)
+            boxer = get_cached_entity(boxers_cache, Boxers, f"name:{boxer_name}",
+                                      lambda: Boxers.get_boxer_by_name(boxer_name))
 
             if not boxer:
                 app.logger.warning(f"Boxer '{boxer_name}' not found.")
@@ -617,7 +1055,7 @@ def create_app(config_class=ProductionConfig):
                 }), 400)
 
             try:
-                ring_model.enter_ring(boxer)
+                boxers = get_ring_boxers(RingSlots.enter(boxer.id))
             except ValueError as e:
                 app.logger.warning(f"Cannot enter {boxer_name}: {e}")
                 return make_response(jsonify({
@@ -625,14 +1063,14 @@ def create_app(config_class=ProductionConfig):
                     "message": str(e)
                 }), 400)
 
-            boxers = ring_model.get_boxers()
+            events.publish("ring", {"action": "enter", "boxers": [boxer.to_dict() for boxer in boxers]})
 
             app.logger.info(f"Boxer '{boxer_name}' entered the ring. Current boxers: {boxers}")
 
             return make_response(jsonify({
                 "status": "success",
                 "message": f"Boxer '{boxer_name}' is now in the ring.",
-                "boxers": boxers
+                "boxers": [boxer.to_dict() for boxer in boxers]
             }), 200)
 
         except Exception as e:
@@ -659,12 +1097,12 @@ def create_app(config_class=ProductionConfig):
         try:
             app.logger.info("Retrieving list of boxers...")
 
-            boxers = ring_model.get_boxers()
+            boxers = get_ring_boxers(RingSlots.get_boxer_ids())
 
             app.logger.info(f"Retrieved {len(boxers)} boxer(s).")
             return make_response(jsonify({
                 "status": "success",
-                "boxers": boxers
+                "boxers": [boxer.to_dict() for boxer in boxers]
             }), 200)
 
         except Exception as e:
@@ -676,6 +1114,367 @@ def create_app(config_class=ProductionConfig):
             }), 500)
 
 
+    @app.route('/api/matchmake', methods=['POST'])
+    @login_required
+    def matchmake() -> Response:
+        """Route to pair boxers of similar rating, either to fill the ring or to build a card.
+
+        Expected JSON Input:
+            - weight_class (str, optional): Only pair boxers of this weight class.
+            - bouts (int, optional): Build a card of this many bouts instead of filling the ring.
+            - max_reach_diff (float, optional): Maximum reach difference between opponents.
+            - max_age_diff (int, optional): Maximum age difference between opponents.
+
+        Returns:
+            JSON response with the boxers now in the ring, or with the card of bouts.
+
+        Raises:
+            400 error if the input is invalid, the ring is full, a matched boxer no
+            longer exists or no match can be made.
+            500 error if there is an issue making the match.
+
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            weight_class = data.get("weight_class")
+            bouts = data.get("bouts")
+            max_reach_diff = data.get("max_reach_diff")
+            max_age_diff = data.get("max_age_diff")
+
+            for field, value, types in (("max_reach_diff", max_reach_diff, (int, float)),
+                                        ("max_age_diff", max_age_diff, (int,))):
+                if value is not None and (isinstance(value, bool) or not isinstance(value, types) or value < 0):
+                    kind = "number" if float in types else "integer"
+                    return make_response(jsonify({
+                        "status": "error",
+                        "message": f"{field} must be a non-negative {kind}"
+                    }), 400)
+
+            if weight_class is not None and weight_class not in WEIGHT_CLASSES:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": f"Invalid weight class '{weight_class}'. Must be one of: {', '.join(WEIGHT_CLASSES)}"
+                }), 400)
+
+            if bouts is not None:
+                if not isinstance(bouts, int) or bouts <= 0:
+                    return make_response(jsonify({
+                        "status": "error",
+                        "message": "bouts must be a positive integer"
+                    }), 400)
+
+                app.logger.info(f"Building a card of {bouts} bout(s)")
+                card = matchmaker.make_card(bouts, weight_class, max_reach_diff=max_reach_diff,
+                                            max_age_diff=max_age_diff)
+                app.logger.info(f"Built a card of {len(card)} bout(s)")
+                return make_response(jsonify({
+                    "status": "success",
+                    "card": [[boxer_1.to_dict(), boxer_2.to_dict()] for boxer_1, boxer_2 in card]
+                }), 200)
+
+            try:
+                in_ring = get_ring_boxers(RingSlots.get_boxer_ids())
+                if len(in_ring) >= 2:
+                    raise ValueError("Ring is full, cannot add more boxers.")
+
+                if in_ring:
+                    opponent = matchmaker.find_opponent(in_ring[0].id, exclude=frozenset([in_ring[0].id]),
+                                                        max_reach_diff=max_reach_diff, max_age_diff=max_age_diff)
+                    if opponent is None:
+                        raise ValueError(f"No eligible opponent found for '{in_ring[0].name}'")
+                    match = [opponent]
+                else:
+                    match = list(matchmaker.pick_pair(weight_class, max_reach_diff=max_reach_diff,
+                                                      max_age_diff=max_age_diff))
+
+                # The index can lag behind deletions made by other workers
+                for boxer in match:
+                    if load_boxer(boxer.id) is None:
+                        matchmaker.remove_boxer(boxer.id)
+                        raise ValueError(f"Boxer '{boxer.name}' no longer exists. Try matchmaking again")
+
+                entered = []
+                try:
+                    for boxer in match:
+                        boxer_ids = RingSlots.enter(boxer.id)
+                        entered.append(boxer.id)
+                except ValueError:
+                    # Another request filled the ring first; do not leave half a match behind
+                    for boxer_id in entered:
+                        RingSlots.remove(boxer_id)
+                    raise
+
+                boxers = get_ring_boxers(boxer_ids)
+            except ValueError as e:
+                app.logger.warning(f"Matchmaking failed: {e}")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": str(e)
+                }), 400)
+
+            events.publish("ring", {"action": "enter", "boxers": [boxer.to_dict() for boxer in boxers]})
+            app.logger.info(f"Matchmaking filled the ring. Current boxers: {boxers}")
+            return make_response(jsonify({
+                "status": "success",
+                "message": "Ring filled by matchmaking",
+                "boxers": [boxer.to_dict() for boxer in boxers]
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Matchmaking failed: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while matchmaking",
+                "details": str(e)
+            }), 500)
+
+
+    ############################################################
+    #
+    # Tournaments
+    #
+    ############################################################
+
+
+    @app.route('/api/tournaments', methods=['POST'])
+    @login_required
+    def create_tournament() -> Response:
+        """Route to create a tournament and queue a job to run it.
+
+        The tournament is run by worker.py, so it survives web worker restarts;
+        poll /api/tournaments/<id> or /api/jobs/<job_id> for progress.
+
+        Expected JSON Input:
+            - name (str): The tournament name.
+            - format (str): 'single_elimination', 'round_robin' or 'swiss'.
+            - boxer_ids (list[int], optional): The entrants. Defaults to every boxer.
+            - seed (int, optional): Seed for reproducible results.
+            - rounds (int, optional): Number of Swiss rounds.
+
+        Returns:
+            JSON response with the tournament ID, its job ID and its initial progress.
+
+        Raises:
+            400 error if the input is invalid or a boxer is listed twice.
+            500 error if there is an issue creating the tournament or queueing its job.
+
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            name = data.get("name")
+            tournament_format = data.get("format")
+            boxer_ids = data.get("boxer_ids")
+            seed = data.get("seed")
+            rounds = data.get("rounds")
+
+            if not name or not tournament_format:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Tournament name and format are required"
+                }), 400)
+
+            if (
+                (boxer_ids is not None and (not isinstance(boxer_ids, list)
+                                            or not all(isinstance(i, int) for i in boxer_ids)))
+                or (seed is not None and not isinstance(seed, int))
+                or (rounds is not None and not isinstance(rounds, int))
+            ):
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Invalid input types: boxer_ids should be a list of integers, seed and rounds should be integers"
+                }), 400)
+
+            app.logger.info(f"Creating {tournament_format} tournament '{name}'")
+            try:
+                tournament = Tournaments.create_tournament(name, tournament_format, boxer_ids, seed, rounds)
+            except ValueError as e:
+                app.logger.warning(f"Cannot create tournament: {e}")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": str(e)
+                }), 400)
+
+            try:
+                job = Jobs.enqueue(TOURNAMENT_JOB, {"tournament_id": tournament.id},
+                                   created_by=current_user.username,
+                                   max_attempts=app.config.get("JOB_MAX_ATTEMPTS", 3))
+            except Exception:
+                tournament.status = "failed"
+                tournament.error = "Could not queue the tournament job"
+                db.session.commit()
+                raise
+            tournament.job_id = job.id
+            db.session.commit()
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": f"Tournament '{name}' queued",
+                "job_id": job.id,
+                "tournament": tournament.get_progress()
+            }), 202)
+
+        except Exception as e:
+            app.logger.error(f"Failed to create tournament: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while creating the tournament",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/tournaments/<int:tournament_id>', methods=['GET'])
+    @login_required
+    def get_tournament(tournament_id: int) -> Response:
+        """Route to get the progress and standings of a tournament.
+
+        Path Parameter:
+            - tournament_id (int): The ID of the tournament.
+
+        Query Parameters:
+            - top (int): Number of entrants in the standings. Default is 10.
+
+        Returns:
+            JSON response with the tournament status, current round and standings.
+
+        Raises:
+            400 error if the tournament is not found.
+            500 error if there is an issue retrieving the tournament.
+
+        """
+        try:
+            tournament = db.session.get(Tournaments, tournament_id)
+            if not tournament:
+                app.logger.warning(f"Tournament with ID {tournament_id} not found.")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": f"Tournament with ID {tournament_id} not found"
+                }), 400)
+
+            top = min(max(request.args.get('top', 10, type=int), 1), 1000)
+            return make_response(jsonify({
+                "status": "success",
+                "tournament": tournament.get_progress(top)
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Error retrieving tournament {tournament_id}: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while retrieving the tournament",
+                "details": str(e)
+            }), 500)
+
+
+    ############################################################
+    #
+    # Jobs
+    #
+    ############################################################
+
+
+    @app.route('/api/jobs/<int:job_id>', methods=['GET'])
+    @login_required
+    def get_job(job_id: int) -> Response:
+        """Route to get the status and result of a background job.
+
+        Path Parameter:
+            - job_id (int): The ID of the job, as returned when it was queued.
+
+        Returns:
+            JSON response with the job's status ('queued', 'running', 'succeeded' or 'failed'),
+            attempts, and its result or error.
+
+        Raises:
+            404 error if the job does not exist or belongs to another user.
+            500 error if there is an issue retrieving the job.
+
+        """
+        try:
+            job = Jobs.get_job(job_id)
+            if job.created_by != current_user.username:
+                raise ValueError(f"Job with ID {job_id} not found")
+
+            return make_response(jsonify({
+                "status": "success",
+                "job": job.to_dict()
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Job {job_id} not found for user {current_user.username}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 404)
+        except Exception as e:
+            app.logger.error(f"Error retrieving job {job_id}: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while retrieving the job",
+                "details": str(e)
+            }), 500)
+
+
+    ############################################################
+    #
+    # Events
+    #
+    ############################################################
+
+
+    @app.route('/api/events', methods=['GET'])
+    @login_required
+    def stream_events() -> Response:
+        """Route to stream live updates as server-sent events, instead of polling.
+
+        Event types:
+            - fight: a fight finished, with the winner and both boxers.
+            - ring: boxers entered the ring or it was cleared, with the boxers now in it.
+            - leaderboard: new ratings of the boxers in a fight, or 'reload' when every rating changed.
+            - reset: events were missed since Last-Event-ID; refetch the current state.
+
+        Query Parameters:
+            - types (str, optional): Comma-separated event types to receive. Default is all.
+            - last_event_id (int, optional): Resume after this event, for clients that cannot
+              send the Last-Event-ID header.
+
+        Returns:
+            A text/event-stream response that stays open.
+
+        Raises:
+            400 error if the last event ID is not an integer.
+            503 error if this server has reached its subscriber limit.
+
+        """
+        last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+        if last_event_id is not None:
+            try:
+                last_event_id = int(last_event_id)
+            except ValueError:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Last event ID must be an integer"
+                }), 400)
+
+        types = request.args.get("types")
+        event_types = {name.strip() for name in types.split(",") if name.strip()} if types else None
+
+        stream = events.open_stream(last_event_id, event_types)
+        if stream is None:
+            app.logger.warning(f"Event subscriber limit reached ({events.subscriber_count} open streams)")
+            response = make_response(jsonify({
+                "status": "error",
+                "message": "Too many event subscribers. Try again shortly"
+            }), 503)
+            response.headers["Retry-After"] = "5"
+            return response
+
+        app.logger.info(f"Opened event stream (types: {types or 'all'}, last event ID: {last_event_id})")
+        return Response(stream, mimetype="text/event-stream", headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Stop reverse proxies from buffering the stream
+        })
+
+
     ############################################################
     #
     # Leaderboard
@@ -684,17 +1483,19 @@ def create_app(config_class=ProductionConfig):
 
 
     @app.route('/api/leaderboard', methods=['GET'])
+    @limiter.limit("ip", app.config.get("RATE_LIMIT_LEADERBOARD", "120/minute"))
     def get_leaderboard() -> Response:
-        """Route to get the leaderboard of boxers sorted by wins or win percentage.
+        """Route to get the leaderboard of boxers sorted by wins, win percentage or rating.
 
         Query Parameters:
-            - sort (str): The field to sort by ('wins', or 'win_pct'). Default is 'wins'.
+            - sort (str): The field to sort by ('wins', 'win_pct' or 'rating'). Default is 'wins'.
 
         Returns:
             JSON response with a sorted leaderboard of boxers.
 
         Raises:
             400 error if an invalid sort parameter is provided.
+            429 error if the client's IP exceeds the leaderboard rate limit.
             500 error if there is an issue generating the leaderboard.
 
         """
@@ -702,7 +1503,7 @@ def create_app(config_class=ProductionConfig):
             # Get the sort parameter from the query string, default to 'wins'
             sort_by = request.args.get('sort', 'wins').lower()
 
-            valid_sort_fields = {'wins', 'win_pct'}
+            valid_sort_fields = {'wins', 'win_pct', 'rating'}
 
             if sort_by not in valid_sort_fields:
                 app.logger.warning(f"Invalid sort parameter: '{sort_by}'")
@@ -713,7 +1514,13 @@ def create_app(config_class=ProductionConfig):
 
             app.logger.info(f"Generating leaderboard sorted by '{sort_by}'")
 
-            leaderboard_data = Boxers.get_leaderboard(sort_by)
+            # Invalidated by any change to boxers or ratings; the TTL bounds staleness across workers
+            if sort_by == 'rating':
+                leaderboard_data = leaderboard_cache.get_or_set(sort_by, Ratings.get_leaderboard,
+                                                                tags=("boxers", "ratings"))
+            else:
+                leaderboard_data = leaderboard_cache.get_or_set(sort_by, lambda: Boxers.get_leaderboard(sort_by),
+                                                                tags=("boxers", "ratings"))
 
             app.logger.info(f"Leaderboard generated successfully. {len(leaderboard_data)} boxers ranked.")
 
@@ -730,10 +1537,76 @@ def create_app(config_class=ProductionConfig):
                 "details": str(e)
             }), 500)
 
+
+    @app.route('/api/recompute-ratings', methods=['POST'])
+    @login_required
+    def recompute_ratings() -> Response:
+        """Route to rebuild all boxer ratings from the stored fight history.
+
+        Returns:
+            JSON response with the number of fights replayed.
+
+        Raises:
+            500 error if there is an issue recomputing the ratings.
+
+        """
+        try:
+            app.logger.info("Recomputing ratings from fight history")
+
+            fights = Ratings.recompute_all()
+            matchmaker.invalidate()
+            events.publish("leaderboard", {"reload": True})  # Every rating may have changed
+
+            app.logger.info(f"Ratings recomputed from {fights} fights")
+            return make_response(jsonify({
+                "status": "success",
+                "message": "Ratings recomputed successfully",
+                "fights": fights
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Error recomputing ratings: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while recomputing ratings",
+                "details": str(e)
+            }), 500)
+
+    ############################################################
+    #
+    # Fixtures
+    #
+    ############################################################
+
+
+    @app.cli.command("load-fixtures")
+    @click.option("--boxers", default=1000, show_default=True, help="Number of boxers to create.")
+    @click.option("--users", default=100, show_default=True, help="Number of users to create.")
+    @click.option("--password", default="password", show_default=True, help="Password of every fixture user.")
+    @click.option("--template", default=None,
+                  help="SQLite template file: restored if it exists, otherwise saved after seeding.")
+    def load_fixtures_command(boxers: int, users: int, password: str, template: str) -> None:
+        """Reset the database and seed it with generated boxers and users."""
+        db.session.remove()
+        if template and os.path.exists(template):
+            restore_template(db.engine, template)
+            caches.invalidate(tag for table in ("users", "boxers", "ratings") for tag in table_tags(table))
+            click.echo(f"Restored database from template {template}")
+            return
+
+        reset_tables(db.engine, Boxers, Users, *BOXER_DEPENDENT_MODELS)
+        caches.invalidate(tag for table in ("users", "boxers", "ratings") for tag in table_tags(table))
+        load_fixtures(boxers, users, password)
+        click.echo(f"Loaded {boxers} boxers and {users} users")
+        if template:
+            save_template(db.engine, template)
+            click.echo(f"Saved database template to {template}")
+
     return app
 
 
 if __name__ == '__main__':
+    # Development server only; production uses gunicorn (see gunicorn.conf.py)
     app = create_app()
     app.logger.info("Starting Flask app...")
     try:
@@ -0,0 +1,85 @@
+"""Compare Boxers ORM instances with BoxerSnapshot and BoxerRoster.
+
+Reports memory per boxer and fight throughput (skill calculation plus the
+win draw, as in RingModel.fight) for each representation. No database is
+needed: ORM instances are created transient, as they would be after loading.
+
+Usage:
+    python benchmarks/bench_boxer_snapshot.py [number_of_boxers]
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from app import create_app
+from config import TestConfig
+from boxing.models.boxer_snapshot import BoxerRoster, BoxerSnapshot
+from boxing.models.boxers_model import Boxers
+from boxing.utils.fight_utils import get_fighting_skill, simulate_bouts, win_probability
+
+
+def make_rows(n: int) -> list[tuple]:
+    rng = random.Random(0)
+    return [
+        (i + 1, f"Boxer {i}", rng.randint(125, 250), rng.randint(60, 80), rng.randint(60, 85), rng.randint(18, 40))
+        for i in range(n)
+    ]
+
+
+def measure(build) -> tuple[object, float]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def fights_per_second(boxers: list, n_fights: int) -> float:
+    rng = random.Random(1)
+    pairs = [(rng.choice(boxers), rng.choice(boxers)) for _ in range(n_fights)]
+    start = time.perf_counter()
+    for boxer_1, boxer_2 in pairs:
+        skill_1 = get_fighting_skill(boxer_1.weight, boxer_1.name, boxer_1.reach, boxer_1.age)
+        skill_2 = get_fighting_skill(boxer_2.weight, boxer_2.name, boxer_2.reach, boxer_2.age)
+        _ = rng.random() < win_probability(skill_1, skill_2)
+    return n_fights / (time.perf_counter() - start)
+
+
+def main(n: int) -> None:
+    rows = make_rows(n)
+    n_fights = min(n * 2, 200000)
+
+    orm, orm_bytes = measure(lambda: [
+        Boxers(id=i, name=name, weight=weight, height=height, reach=reach, age=age)
+        for i, name, weight, height, reach, age in rows
+    ])
+    snapshots, snapshot_bytes = measure(lambda: [BoxerSnapshot(*row, 1500.0) for row in rows])
+    roster, roster_bytes = measure(lambda: BoxerRoster.from_rows(
+        (i, name, weight, reach, age) for i, name, weight, _, reach, age in rows
+    ))
+
+    rng = np.random.default_rng(2)
+    first = rng.integers(0, n, n_fights)
+    second = rng.integers(0, n, n_fights)
+    start = time.perf_counter()
+    skills = roster.skills()
+    simulate_bouts(3, skills[first], skills[second])
+    roster_rate = n_fights / (time.perf_counter() - start)
+
+    print(f"{n} boxers, {n_fights} fights")
+    print(f"{'representation':<16}{'bytes/boxer':>14}{'fights/s':>16}")
+    print(f"{'Boxers (ORM)':<16}{orm_bytes / n:>14.0f}{fights_per_second(orm, n_fights):>16,.0f}")
+    print(f"{'BoxerSnapshot':<16}{snapshot_bytes / n:>14.0f}{fights_per_second(snapshots, n_fights):>16,.0f}")
+    print(f"{'BoxerRoster':<16}{roster_bytes / n:>14.0f}{roster_rate:>16,.0f}")
+
+
+if __name__ == "__main__":
+    app = create_app(TestConfig)
+    with app.app_context():
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -13,8 +13,72 @@ class ProductionConfig():
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "sqlite:////app/db/app.db")  # Production database URI from environment
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))  # Wait this long for a lock held by the worker or web app
+    SQLITE_WAL_ENABLED = os.getenv("SQLITE_WAL_ENABLED", "true").lower() == "true"  # Let reads run alongside a write
+    SESSION_BACKEND = os.getenv("SESSION_BACKEND", "cookie")  # cookie, memory, sqlite or redis
+    SESSION_LIFETIME_SECONDS = int(os.getenv("SESSION_LIFETIME_SECONDS", 86400))
+    SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH", "/app/db/sessions.db")
+    SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory or redis (shared by workers)
+    RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "10/minute")
+    RATE_LIMIT_FIGHT_USER = os.getenv("RATE_LIMIT_FIGHT_USER", "30/minute")
+    RATE_LIMIT_FIGHT_GLOBAL = os.getenv("RATE_LIMIT_FIGHT_GLOBAL", "600/minute")
+    RATE_LIMIT_LEADERBOARD = os.getenv("RATE_LIMIT_LEADERBOARD", "120/minute")
+    RATE_LIMIT_PREDICT_GLOBAL = os.getenv("RATE_LIMIT_PREDICT_GLOBAL", "120/minute")
+    FIGHT_MAX_CONCURRENCY = int(os.getenv("FIGHT_MAX_CONCURRENCY", 8))  # Per worker; keep below GUNICORN_THREADS with gthread
+    MATCHMAKING_REFRESH_SECONDS = int(os.getenv("MATCHMAKING_REFRESH_SECONDS", 300))
+    PROFILE_ALL_REQUESTS = os.getenv("PROFILE_ALL_REQUESTS", "false").lower() == "true"
+    PROFILE_HEADER_ENABLED = os.getenv("PROFILE_HEADER_ENABLED", "false").lower() == "true"
+    PROFILE_HEADER_TOKEN = os.getenv("PROFILE_HEADER_TOKEN")  # Required value of the X-Profile header; must be set to enable it
+    SQL_TRACE_ENABLED = os.getenv("SQL_TRACE_ENABLED", "false").lower() == "true"
+    SQL_TRACE_SLOWEST_N = int(os.getenv("SQL_TRACE_SLOWEST_N", 5))
+    SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 0))  # 0 disables the slow request log
+    SLOW_REQUEST_SAMPLE_RATE = float(os.getenv("SLOW_REQUEST_SAMPLE_RATE", 1.0))
+    RESET_MODE = os.getenv("RESET_MODE", "fast")  # fast (delete rows) or recreate (drop and create tables)
+    IDEMPOTENCY_ENABLED = os.getenv("IDEMPOTENCY_ENABLED", "true").lower() == "true"
+    IDEMPOTENCY_BACKEND = os.getenv("IDEMPOTENCY_BACKEND", "memory")  # memory or redis (shared by workers)
+    IDEMPOTENCY_REDIS_URL = os.getenv("IDEMPOTENCY_REDIS_URL", "redis://localhost:6379/0")
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+    IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", 30))  # Hold on a running request's key; about GUNICORN_TIMEOUT
+    IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", 10000))  # Per process, memory backend only
+    EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")  # memory (per worker) or redis (across workers)
+    EVENTS_REDIS_URL = os.getenv("EVENTS_REDIS_URL", "redis://localhost:6379/0")
+    EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", 1000))  # Events kept for Last-Event-ID resumes
+    # Per process. Under the gthread worker each stream holds a request thread, so half of them are left for the API
+    EVENTS_MAX_SUBSCRIBERS = int(os.getenv(
+        "EVENTS_MAX_SUBSCRIBERS",
+        1000 if os.getenv("GUNICORN_WORKER_CLASS", "gevent") == "gevent" else int(os.getenv("GUNICORN_THREADS", 4)) // 2
+    ))
+    EVENTS_KEEPALIVE_SECONDS = int(os.getenv("EVENTS_KEEPALIVE_SECONDS", 15))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", 2.0))  # Doubled after each failed attempt
+    JOB_WORKER_THREADS = int(os.getenv("JOB_WORKER_THREADS", 4))  # Per worker.py process
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", 0.5))
+    JOB_TIMEOUT_SECONDS = int(os.getenv("JOB_TIMEOUT_SECONDS", 300))  # Running jobs that have not heartbeated for this long are retried
+    JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", 604800))
+    JOB_FIGHT_CONCURRENCY = int(os.getenv("JOB_FIGHT_CONCURRENCY", 4))  # Across all workers
+    JOB_IMPORT_CONCURRENCY = int(os.getenv("JOB_IMPORT_CONCURRENCY", 1))
+    JOB_TOURNAMENT_CONCURRENCY = int(os.getenv("JOB_TOURNAMENT_CONCURRENCY", 1))  # Each uses TOURNAMENT_WORKERS processes
+    IMPORT_MAX_BOXERS = int(os.getenv("IMPORT_MAX_BOXERS", 10000))
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # memory or redis (shared tier and cross-worker invalidation)
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_USERS_SIZE = int(os.getenv("CACHE_USERS_SIZE", 10000))
+    CACHE_USERS_TTL = float(os.getenv("CACHE_USERS_TTL", 60))  # With the redis backend, which tells every worker of changes
+    CACHE_USERS_LOCAL_TTL = float(os.getenv("CACHE_USERS_LOCAL_TTL", 3))  # Used instead with the memory backend
+    CACHE_BOXERS_SIZE = int(os.getenv("CACHE_BOXERS_SIZE", 10000))
+    CACHE_BOXERS_TTL = float(os.getenv("CACHE_BOXERS_TTL", 30))
+    CACHE_LEADERBOARD_TTL = float(os.getenv("CACHE_LEADERBOARD_TTL", 5))
+    CACHE_PREDICTIONS_SIZE = int(os.getenv("CACHE_PREDICTIONS_SIZE", 10000))
+    CACHE_PREDICTIONS_TTL = float(os.getenv("CACHE_PREDICTIONS_TTL", 3600))  # Also dropped when either boxer changes
+    PREDICT_DEFAULT_TRIALS = int(os.getenv("PREDICT_DEFAULT_TRIALS", 10000))
+    PREDICT_MAX_TRIALS = int(os.getenv("PREDICT_MAX_TRIALS", 1000000))
 
 class TestConfig():
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    SESSION_BACKEND = 'memory'
+    RATE_LIMIT_ENABLED = False
@@ -0,0 +1,87 @@
+"""Gunicorn configuration for serving the app in production.
+
+Every setting can be overridden through the environment, e.g.
+GUNICORN_THREADS=8 gunicorn -c gunicorn.conf.py
+
+More than one worker process needs the redis backends, see below.
+
+The gevent worker is the default so that open /api/events streams are cheap
+greenlets. With GUNICORN_WORKER_CLASS=gthread each stream holds one of the
+worker's GUNICORN_THREADS, so EVENTS_MAX_SUBSCRIBERS must stay below it.
+"""
+import os
+
+from config import ProductionConfig as config
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+
+wsgi_app = "app:create_app()"
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5001)}"
+
+# One worker by default: the rate limit, idempotency, event and memory session
+# stores, the caches and the matchmaking index all live in process memory.
+# Greenlets (or threads, with gthread) cover time spent waiting on the database and random.org.
+workers = int(os.getenv("GUNICORN_WORKERS", 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))  # gthread only
+
+if workers > 1:
+    # The ring is in the database, but these stores must be shared too for several workers to agree
+    per_process = [
+        name for name, backend, enabled in (
+            ("SESSION_BACKEND", config.SESSION_BACKEND, True),
+            ("RATE_LIMIT_BACKEND", config.RATE_LIMIT_BACKEND, config.RATE_LIMIT_ENABLED),
+            ("IDEMPOTENCY_BACKEND", config.IDEMPOTENCY_BACKEND, config.IDEMPOTENCY_ENABLED),
+            ("EVENTS_BACKEND", config.EVENTS_BACKEND, True),
+        )
+        if enabled and backend == "memory"
+    ]
+    if per_process:
+        raise RuntimeError(
+            f"GUNICORN_WORKERS={workers} needs state shared by every worker, but {', '.join(per_process)} "
+            f"{'is' if len(per_process) == 1 else 'are'} 'memory'. Set them to 'redis' or run one worker."
+        )
+
+if worker_class == "gthread" and config.EVENTS_MAX_SUBSCRIBERS >= threads:
+    raise RuntimeError(
+        f"EVENTS_MAX_SUBSCRIBERS={config.EVENTS_MAX_SUBSCRIBERS} would let event streams take all "
+        f"{threads} GUNICORN_THREADS of the gthread worker. Lower it or use the gevent worker."
+    )
+
+# Concurrent connections per gevent worker, mostly idle event streams
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 2000))
+
+# Import the app once in the master so forked workers share its memory pages
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Reload workers on code changes; only useful in development and incompatible with preloading
+reload = os.getenv("GUNICORN_RELOAD", "false").lower() == "true"
+# The gevent worker monkey-patches after the fork, so the app must be imported after that too;
+# otherwise its locks and sockets are the unpatched, blocking ones
+if reload or worker_class == "gevent":
+    preload_app = False
+
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+# Recycle workers periodically to bound memory growth; jitter avoids restarting them all at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 1000))
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the master so workers never share sockets."""
+    if not preload_app:
+        return
+
+    from boxing.db import db
+
+    app = server.app.wsgi()
+    with app.app_context():
+        db.engine.dispose(close=False)
+    server.log.info("Worker %s disposed inherited database connections", worker.pid)
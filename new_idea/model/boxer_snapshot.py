@@ -0,0 +1,146 @@
+import logging
+from dataclasses import dataclass, replace
+from typing import Iterable
+
+import numpy as np
+
+from boxing.db import db
+from boxing.models.rating_model import DEFAULT_RATING
+from boxing.utils.fight_utils import get_fighting_skill
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# The classes Boxers.get_weight_class can return, heaviest first
+WEIGHT_CLASSES = ("HEAVYWEIGHT", "MIDDLEWEIGHT", "LIGHTWEIGHT", "FEATHERWEIGHT")
+
+
+@dataclass(frozen=True)
+class BoxerSnapshot:
+    """
+    Immutable copy of the boxer fields needed to fight, match and rank.
+
+    Unlike a Boxers instance it carries no SQLAlchemy state and is not tied to
+    a session, so it can be kept across requests (e.g. in the ring) without
+    lazy loads or DetachedInstanceError. Slots keep it a few dozen bytes.
+    """
+    __slots__ = ("id", "name", "weight", "height", "reach", "age", "rating")
+
+    id: int
+    name: str
+    weight: float
+    height: float
+    reach: float
+    age: int
+    rating: float
+
+    @classmethod
+    def from_boxer(cls, boxer, rating: float) -> "BoxerSnapshot":
+        """
+        Copy the fields of a Boxers instance.
+
+        Args:
+            boxer (Boxers): The boxer to copy.
+            rating (float): The boxer's current rating, e.g. from Ratings.get_ratings.
+
+        Returns:
+            BoxerSnapshot: The snapshot.
+        """
+        return cls(boxer.id, boxer.name, boxer.weight, boxer.height, boxer.reach, boxer.age, rating)
+
+    def __reduce__(self):
+        # Frozen dataclasses with __slots__ cannot be unpickled by the default protocol
+        return self.__class__, (self.id, self.name, self.weight, self.height, self.reach, self.age, self.rating)
+
+    def with_rating(self, rating: float) -> "BoxerSnapshot":
+        return replace(self, rating=rating)
+
+    @property
+    def weight_class(self) -> str:
+        from boxing.models.boxers_model import Boxers
+
+        return Boxers.get_weight_class(self.weight)
+
+    @property
+    def skill(self) -> float:
+        return get_fighting_skill(self.weight, self.name, self.reach, self.age)
+
+    def update_stats(self, result: str) -> None:
+        """
+        Record a fight result on the stored boxer, so RingModel can treat a
+        snapshot like the Boxers instance it was taken from.
+
+        Args:
+            result (str): 'win' or 'loss'.
+
+        Raises:
+            ValueError: If the boxer no longer exists.
+        """
+        from boxing.models.boxers_model import Boxers
+
+        boxer = db.session.get(Boxers, self.id)
+        if boxer is None:
+            logger.info("Boxer with ID %d not found", self.id)
+            raise ValueError(f"Boxer with ID {self.id} not found")
+        boxer.update_stats(result)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "weight": self.weight,
+            "height": self.height,
+            "reach": self.reach,
+            "age": self.age,
+            "weight_class": self.weight_class,
+            "rating": round(self.rating, 1),
+        }
+
+
+class BoxerRoster:
+    """
+    Column-oriented roster for simulations: one NumPy array per field, so a
+    whole roster's fighting skills are computed in a single vectorized pass.
+    """
+
+    def __init__(self, ids: np.ndarray, name_lengths: np.ndarray, weights: np.ndarray,
+                 reaches: np.ndarray, ages: np.ndarray, ratings: np.ndarray):
+        self.ids = ids
+        self.name_lengths = name_lengths
+        self.weights = weights
+        self.reaches = reaches
+        self.ages = ages
+        self.ratings = ratings
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "BoxerRoster":
+        """
+        Build a roster from (id, name, weight, reach, age[, rating]) rows.
+        """
+        rows = list(rows)
+        return cls(
+            np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)),
+            np.fromiter((len(row[1]) for row in rows), dtype=np.int64, count=len(rows)),
+            np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows)),
+            np.fromiter((row[3] for row in rows), dtype=np.float64, count=len(rows)),
+            np.fromiter((row[4] for row in rows), dtype=np.int64, count=len(rows)),
+            np.fromiter((row[5] if len(row) > 5 and row[5] is not None else DEFAULT_RATING for row in rows),
+                        dtype=np.float64, count=len(rows)),
+        )
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[BoxerSnapshot]) -> "BoxerRoster":
+        return cls.from_rows((s.id, s.name, s.weight, s.reach, s.age, s.rating) for s in snapshots)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def skills(self) -> np.ndarray:
+        """
+        Fighting skills of every boxer, using the same formula as get_fighting_skill.
+        """
+        age_modifiers = np.where(self.ages < 25, -1, np.where(self.ages > 35, -2, 0))
+        return self.weights * self.name_lengths + self.reaches / 10 + age_modifiers
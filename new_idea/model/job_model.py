@@ -0,0 +1,309 @@
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import func, select, update
+
+from boxing.db import db
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+FIGHT_JOB = "fight"
+IMPORT_BOXERS_JOB = "import_boxers"
+TOURNAMENT_JOB = "tournament"
+JOB_KINDS = (FIGHT_JOB, IMPORT_BOXERS_JOB, TOURNAMENT_JOB)
+
+# Queued jobs looked at per claim; more than one so a kind at its concurrency limit does not block the others
+CLAIM_BATCH = 20
+
+
+class JobLostError(Exception):
+    """
+    Raised when a job was requeued and claimed by another worker while this one was still running it.
+    """
+
+
+class Jobs(db.Model):
+    """
+    Background job stored in the database, which doubles as the queue.
+
+    Workers claim a queued job with a conditional UPDATE, so a job runs on one
+    worker only, and a per-kind limit on running jobs is enforced in the same
+    statement.
+
+    Handlers save their progress in checkpoint, in the same commit as the work
+    it describes, so a retried job skips what an earlier attempt finished.
+    Running jobs heartbeat locked_at, so requeue_stale only recovers jobs whose
+    worker stopped, not jobs that are merely long.
+    """
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default="queued")
+    payload = db.Column(db.Text, nullable=False)
+    result = db.Column(db.Text)
+    checkpoint = db.Column(db.Text)  # JSON progress of the handler, kept across attempts
+    error = db.Column(db.String(255))
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    created_by = db.Column(db.String(80))
+    run_after = db.Column(db.Float, nullable=False)  # Epoch seconds; later than now while backing off
+    locked_by = db.Column(db.String(64))
+    locked_at = db.Column(db.Float)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index("idx_jobs_status_run_after", "status", "run_after"),
+    )
+
+    @classmethod
+    def enqueue(cls, kind: str, payload: dict, created_by: Optional[str] = None,
+                max_attempts: int = 3) -> "Jobs":
+        """
+        Add a job to the queue.
+
+        Args:
+            kind (str): The job kind, one of JOB_KINDS.
+            payload (dict): JSON-serializable arguments of the job.
+            created_by (str, optional): Username of the user who created the job.
+            max_attempts (int): How many times the job is tried before it fails.
+
+        Returns:
+            Jobs: The queued job.
+
+        Raises:
+            ValueError: If the kind or max_attempts is invalid.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Invalid job kind '{kind}'. Must be one of: {', '.join(JOB_KINDS)}")
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be a positive integer")
+
+        try:
+            job = cls(kind=kind, status="queued", payload=json.dumps(payload), created_by=created_by,
+                      max_attempts=max_attempts, run_after=time.time())
+            db.session.add(job)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Database error while queueing %s job: %s", kind, str(e))
+            raise
+        logger.info("Queued %s job %d", kind, job.id)
+        return job
+
+    @classmethod
+    def get_job(cls, job_id: int) -> "Jobs":
+        """
+        Retrieve a job by ID.
+
+        Raises:
+            ValueError: If the job does not exist.
+        """
+        job = db.session.get(cls, job_id)
+        if job is None:
+            logger.info("Job with ID %d not found", job_id)
+            raise ValueError(f"Job with ID {job_id} not found")
+        return job
+
+    @classmethod
+    def claim_next(cls, worker_id: str, kinds: tuple, concurrency: dict[str, int]) -> Optional["Jobs"]:
+        """
+        Claim the oldest runnable job of the given kinds.
+
+        Args:
+            worker_id (str): Identifies the claiming worker in locked_by.
+            kinds (tuple): The job kinds this worker can run.
+            concurrency (dict): Maximum running jobs per kind, across all workers.
+
+        Returns:
+            Jobs: The claimed job, now running, or None if there is nothing to run.
+        """
+        now = time.time()
+        candidates = (
+            db.session.query(cls.id, cls.kind)
+            .filter(cls.status == "queued", cls.run_after <= now, cls.kind.in_(kinds))
+            .order_by(cls.run_after, cls.id)
+            .limit(CLAIM_BATCH)
+            .all()
+        )
+        db.session.commit()  # End the read transaction before writing
+
+        for job_id, kind in candidates:
+            statement = update(cls).where(cls.id == job_id, cls.status == "queued")
+            limit = concurrency.get(kind)
+            if limit is not None:
+                running = (
+                    select(func.count()).select_from(cls)
+                    .where(cls.kind == kind, cls.status == "running")
+                    .scalar_subquery()
+                )
+                statement = statement.where(running < limit)
+            result = db.session.execute(statement.values(
+                status="running", locked_by=worker_id, locked_at=now, attempts=cls.attempts + 1
+            ))
+            db.session.commit()
+            if result.rowcount == 1:
+                job = db.session.get(cls, job_id)
+                job.worker_id = worker_id  # locked_by is reloaded from the database; this is who claimed it
+                return job
+        return None
+
+    def get_payload(self) -> dict:
+        return json.loads(self.payload)
+
+    def get_checkpoint(self) -> Optional[dict]:
+        return json.loads(self.checkpoint) if self.checkpoint is not None else None
+
+    def stage_checkpoint(self, state: dict) -> None:
+        """
+        Record progress without committing it, so that it is saved by the same
+        commit as the work it describes.
+
+        Args:
+            state (dict): JSON-serializable progress of the handler.
+        """
+        self.checkpoint = json.dumps(state)
+        self.locked_at = time.time()
+
+    def hold(self) -> None:
+        """
+        Check that this worker still holds the job, within the current
+        transaction, so the work committed with it is only saved by the holder.
+        Also refreshes locked_at, so a job checked this way needs no heartbeat.
+
+        Raises:
+            JobLostError: If the job timed out and was claimed again meanwhile;
+                the pending work is rolled back.
+        """
+        worker_id = getattr(self, "worker_id", self.locked_by)
+        owned = db.session.execute(
+            update(Jobs)
+            .where(Jobs.id == self.id, Jobs.status == "running", Jobs.locked_by == worker_id)
+            .values(locked_at=time.time())
+        ).rowcount
+        if not owned:
+            db.session.rollback()
+            raise JobLostError(f"Job {self.id} is no longer held by {worker_id}")
+
+    def heartbeat(self) -> None:
+        """
+        Commit pending work and mark the job as still running, so requeue_stale leaves it alone.
+
+        Raises:
+            JobLostError: If the job timed out and was claimed again meanwhile;
+                the pending work is rolled back.
+        """
+        self.hold()
+        db.session.commit()
+
+    def complete(self, result: dict) -> None:
+        """
+        Mark the job as succeeded with its result, committing any work the
+        handler left pending in the same transaction.
+
+        Raises:
+            JobLostError: If the job timed out and was claimed again meanwhile;
+                the pending work is rolled back.
+        """
+        self.hold()
+        self.status = "succeeded"
+        self.result = json.dumps(result)
+        self.error = None
+        self.locked_by = None
+        self.finished_at = datetime.now(timezone.utc)
+        db.session.commit()
+        logger.info("Job %d (%s) succeeded after %d attempt(s)", self.id, self.kind, self.attempts)
+
+    def fail(self, error: str, retry: bool = True, backoff_seconds: float = 2.0) -> None:
+        """
+        Record a failed attempt, queueing the job again with exponential backoff
+        if it is retryable and has attempts left.
+
+        Args:
+            error (str): What went wrong.
+            retry (bool): False for errors that would fail again, e.g. invalid input.
+            backoff_seconds (float): Delay before the second attempt; doubled for each later one.
+
+        Raises:
+            JobLostError: If the job timed out and was claimed again meanwhile.
+        """
+        self.hold()
+        self.error = error[:255]
+        self.locked_by = None
+        if retry and self.attempts < self.max_attempts:
+            self.status = "queued"
+            self.run_after = time.time() + backoff_seconds * 2 ** (self.attempts - 1)
+            logger.warning("Job %d (%s) attempt %d failed, retrying: %s", self.id, self.kind, self.attempts, error)
+        else:
+            self.status = "failed"
+            self.finished_at = datetime.now(timezone.utc)
+            logger.error("Job %d (%s) failed after %d attempt(s): %s", self.id, self.kind, self.attempts, error)
+        db.session.commit()
+
+    @classmethod
+    def requeue_stale(cls, timeout_seconds: float) -> int:
+        """
+        Recover jobs left running by a worker that died: queue them again, or
+        fail them if they have no attempts left.
+
+        Args:
+            timeout_seconds (float): How long a job may run before it is considered abandoned.
+
+        Returns:
+            int: The number of jobs recovered.
+        """
+        cutoff = time.time() - timeout_seconds
+        stale = (cls.status == "running", cls.locked_at < cutoff)
+        requeued = db.session.execute(
+            update(cls).where(*stale, cls.attempts < cls.max_attempts)
+            .values(status="queued", locked_by=None, run_after=time.time(), error="Worker timed out")
+        ).rowcount
+        failed = db.session.execute(
+            update(cls).where(*stale, cls.attempts >= cls.max_attempts)
+            .values(status="failed", locked_by=None, error="Worker timed out",
+                    finished_at=datetime.now(timezone.utc))
+        ).rowcount
+        db.session.commit()
+        if requeued or failed:
+            logger.warning("Recovered stale jobs: %d requeued, %d failed", requeued, failed)
+        return requeued + failed
+
+    @classmethod
+    def purge_finished(cls, older_than_seconds: float) -> int:
+        """
+        Delete succeeded and failed jobs that finished more than older_than_seconds ago.
+
+        Returns:
+            int: The number of jobs deleted.
+        """
+        cutoff = datetime.fromtimestamp(time.time() - older_than_seconds, timezone.utc)
+        deleted = (
+            db.session.query(cls)
+            .filter(cls.status.in_(("succeeded", "failed")), cls.finished_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        db.session.commit()
+        if deleted:
+            logger.info("Purged %d finished jobs", deleted)
+        return deleted
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "result": json.loads(self.result) if self.result is not None else None,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,255 @@
+import bisect
+import heapq
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+from boxing.db import db
+from boxing.models.boxer_snapshot import BoxerSnapshot
+from boxing.models.rating_model import DEFAULT_RATING, RATING_SYSTEM, Ratings
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# How many rating neighbours to inspect before giving up on constraints
+MAX_CANDIDATES = 64
+
+
+def _within_limits(boxer: BoxerSnapshot, opponent: BoxerSnapshot,
+                   max_reach_diff: Optional[float], max_age_diff: Optional[int]) -> bool:
+    if max_reach_diff is not None and abs(opponent.reach - boxer.reach) > max_reach_diff:
+        return False
+    if max_age_diff is not None and abs(opponent.age - boxer.age) > max_age_diff:
+        return False
+    return True
+
+
+class MatchmakingModel:
+    """
+    In-memory index of boxers for pairing them into fights.
+
+    Boxers are bucketed by weight class, and each bucket is kept sorted by
+    (rating, id), so the closest-rated opponent is found with a binary search
+    instead of a table scan. The index is built lazily, kept up to date by the
+    routes that change boxers or ratings, and rebuilt after refresh_seconds to
+    pick up changes made by other worker processes.
+    """
+
+    def __init__(self, refresh_seconds: int = 300):
+        self.refresh_seconds = refresh_seconds
+        self._buckets: dict[str, list[tuple[float, int]]] = {}
+        self._boxers: dict[int, BoxerSnapshot] = {}
+        self._built_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def rebuild(self) -> None:
+        """
+        Rebuild the index from the database.
+        """
+        from boxing.models.boxers_model import Boxers
+
+        rating_column = Ratings.elo if RATING_SYSTEM == "elo" else Ratings.glicko
+        rows = (
+            db.session.query(Boxers.id, Boxers.name, Boxers.weight, Boxers.height, Boxers.reach, Boxers.age,
+                             rating_column)
+            .outerjoin(Ratings, Ratings.boxer_id == Boxers.id)
+            .all()
+        )
+
+        boxers = {}
+        buckets: dict[str, list[tuple[float, int]]] = {}
+        for boxer_id, name, weight, height, reach, age, rating in rows:
+            boxer = BoxerSnapshot(boxer_id, name, weight, height, reach, age,
+                                  rating if rating is not None else DEFAULT_RATING)
+            boxers[boxer_id] = boxer
+            buckets.setdefault(boxer.weight_class, []).append((boxer.rating, boxer_id))
+        for bucket in buckets.values():
+            bucket.sort()
+
+        with self._lock:
+            self._boxers = boxers
+            self._buckets = buckets
+            self._built_at = time.monotonic()
+        logger.info("Matchmaking index rebuilt with %d boxers", len(boxers))
+
+    def _ensure_fresh(self) -> None:
+        if self._built_at is None or time.monotonic() - self._built_at > self.refresh_seconds:
+            self.rebuild()
+
+    def invalidate(self) -> None:
+        """
+        Drop the index so it is rebuilt on next use.
+        """
+        with self._lock:
+            self._boxers = {}
+            self._buckets = {}
+            self._built_at = None
+
+    def add_boxer(self, boxer: BoxerSnapshot) -> None:
+        """
+        Add a boxer to the index, replacing any previous entry.
+        """
+        if self._built_at is None:
+            return  # Will be picked up by the first rebuild
+        with self._lock:
+            self.remove_boxer(boxer.id)
+            self._boxers[boxer.id] = boxer
+            bisect.insort(self._buckets.setdefault(boxer.weight_class, []), (boxer.rating, boxer.id))
+
+    def remove_boxer(self, boxer_id: int) -> None:
+        """
+        Remove a boxer from the index if present.
+        """
+        with self._lock:
+            boxer = self._boxers.pop(boxer_id, None)
+            if boxer is None:
+                return
+            bucket = self._buckets[boxer.weight_class]
+            position = bisect.bisect_left(bucket, (boxer.rating, boxer_id))
+            if position < len(bucket) and bucket[position][1] == boxer_id:
+                del bucket[position]
+
+    def update_rating(self, boxer_id: int, rating: float) -> None:
+        """
+        Move a boxer to its new position after a rating change.
+        """
+        with self._lock:
+            boxer = self._boxers.get(boxer_id)
+            if boxer is not None:
+                self.add_boxer(boxer.with_rating(rating))
+
+    def get_boxer(self, boxer_id: int) -> Optional[BoxerSnapshot]:
+        self._ensure_fresh()
+        return self._boxers.get(boxer_id)
+
+    def find_opponent(self, boxer_id: int, exclude: frozenset = frozenset(),
+                      max_reach_diff: Optional[float] = None,
+                      max_age_diff: Optional[int] = None) -> Optional[BoxerSnapshot]:
+        """
+        Find the closest-rated opponent in the boxer's weight class.
+
+        Args:
+            boxer_id (int): The boxer to find an opponent for.
+            exclude (frozenset): Boxer IDs that cannot be picked.
+            max_reach_diff (float, optional): Maximum reach difference allowed.
+            max_age_diff (int, optional): Maximum age difference allowed.
+
+        Returns:
+            BoxerSnapshot: The opponent, or None if no eligible boxer was found.
+
+        Raises:
+            ValueError: If the boxer is not in the index.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            boxer = self._boxers.get(boxer_id)
+            if boxer is None:
+                raise ValueError(f"Boxer with ID {boxer_id} not found")
+
+            bucket = self._buckets.get(boxer.weight_class, [])
+            position = bisect.bisect_left(bucket, (boxer.rating, boxer_id))
+            lower, upper = position - 1, position + 1
+
+            for _ in range(MAX_CANDIDATES):
+                below = bucket[lower] if lower >= 0 else None
+                above = bucket[upper] if upper < len(bucket) else None
+                if below is None and above is None:
+                    return None
+                if above is None or (below is not None and boxer.rating - below[0] <= above[0] - boxer.rating):
+                    candidate_id = below[1]
+                    lower -= 1
+                else:
+                    candidate_id = above[1]
+                    upper += 1
+
+                candidate = self._boxers[candidate_id]
+                if candidate_id in exclude:
+                    continue
+                if not _within_limits(boxer, candidate, max_reach_diff, max_age_diff):
+                    continue
+                return candidate
+        return None
+
+    def pick_pair(self, weight_class: Optional[str] = None, exclude: frozenset = frozenset(),
+                  max_reach_diff: Optional[float] = None,
+                  max_age_diff: Optional[int] = None) -> tuple[BoxerSnapshot, BoxerSnapshot]:
+        """
+        Pick a random boxer and pair them with their closest-rated opponent.
+
+        Args:
+            weight_class (str, optional): Restrict the pair to this weight class.
+            exclude (frozenset): Boxer IDs that cannot be picked.
+            max_reach_diff (float, optional): Maximum reach difference allowed.
+            max_age_diff (int, optional): Maximum age difference allowed.
+
+        Returns:
+            tuple: The two boxers.
+
+        Raises:
+            ValueError: If there are not enough eligible boxers.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            if weight_class is not None:
+                candidates = [weight_class] if len(self._buckets.get(weight_class, [])) >= 2 else []
+            else:
+                candidates = [name for name, bucket in self._buckets.items() if len(bucket) >= 2]
+
+            for _ in range(MAX_CANDIDATES):
+                if not candidates:
+                    break
+                # Weight buckets by size so every boxer is equally likely to be the anchor
+                bucket_name = random.choices(candidates, [len(self._buckets[c]) for c in candidates])[0]
+                _, anchor_id = random.choice(self._buckets[bucket_name])
+                if anchor_id in exclude:
+                    continue
+                opponent = self.find_opponent(anchor_id, exclude=exclude | {anchor_id},
+                                              max_reach_diff=max_reach_diff, max_age_diff=max_age_diff)
+                if opponent is not None:
+                    return self._boxers[anchor_id], opponent
+
+        raise ValueError("Not enough eligible boxers to make a match")
+
+    def make_card(self, bouts: int, weight_class: Optional[str] = None,
+                  max_reach_diff: Optional[float] = None,
+                  max_age_diff: Optional[int] = None) -> list[tuple[BoxerSnapshot, BoxerSnapshot]]:
+        """
+        Build a card of the most evenly matched bouts, with every boxer fighting at most once.
+
+        Neighbours in each rating-sorted bucket are paired, and the pairs with
+        the smallest rating gaps are kept. Pairs outside the reach or age limits
+        are left off the card.
+
+        Args:
+            bouts (int): The number of bouts wanted.
+            weight_class (str, optional): Restrict the card to this weight class.
+            max_reach_diff (float, optional): Maximum reach difference allowed.
+            max_age_diff (int, optional): Maximum age difference allowed.
+
+        Returns:
+            list: Up to `bouts` pairs of boxers, most even first.
+
+        Raises:
+            ValueError: If bouts is not positive.
+        """
+        if bouts <= 0:
+            raise ValueError("Number of bouts must be a positive integer")
+
+        self._ensure_fresh()
+        with self._lock:
+            names = [weight_class] if weight_class is not None else list(self._buckets)
+            pairs = (
+                (bucket[i + 1][0] - bucket[i][0], bucket[i][1], bucket[i + 1][1])
+                for name in names
+                for bucket in [self._buckets.get(name, [])]
+                for i in range(0, len(bucket) - 1, 2)
+                if _within_limits(self._boxers[bucket[i][1]], self._boxers[bucket[i + 1][1]],
+                                  max_reach_diff, max_age_diff)
+            )
+            card = heapq.nsmallest(bouts, pairs)
+            return [(self._boxers[a], self._boxers[b]) for _, a, b in card]
@@ -0,0 +1,300 @@
+import logging
+import math
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from boxing.db import db
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+RATING_SYSTEM = os.getenv("RATING_SYSTEM", "glicko").lower()
+ELO_K_FACTOR = float(os.getenv("ELO_K_FACTOR", 32))
+
+DEFAULT_RATING = 1500.0
+DEFAULT_RD = 350.0
+MIN_RD = 30.0
+
+GLICKO_Q = math.log(10) / 400
+
+
+class FightRecord(db.Model):
+    __tablename__ = 'fight_records'
+
+    id = db.Column(db.Integer, primary_key=True)
+    winner_id = db.Column(db.Integer, nullable=False, index=True)
+    loser_id = db.Column(db.Integer, nullable=False, index=True)
+    fought_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+
+class Ratings(db.Model):
+    __tablename__ = 'ratings'
+
+    boxer_id = db.Column(db.Integer, primary_key=True)
+    elo = db.Column(db.Float, nullable=False, default=DEFAULT_RATING)
+    glicko = db.Column(db.Float, nullable=False, default=DEFAULT_RATING)
+    glicko_rd = db.Column(db.Float, nullable=False, default=DEFAULT_RD)
+    fights = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def _get_or_create(cls, boxer_id: int) -> "Ratings":
+        rating = db.session.get(cls, boxer_id)
+        if rating is None:
+            rating = cls(boxer_id=boxer_id, elo=DEFAULT_RATING, glicko=DEFAULT_RATING,
+                         glicko_rd=DEFAULT_RD, fights=0)
+            db.session.add(rating)
+        return rating
+
+    @classmethod
+    def record_fight(cls, winner_id: int, loser_id: int, commit: bool = True) -> dict:
+        """
+        Store the result of a fight and incrementally update both boxers' ratings.
+
+        Args:
+            winner_id (int): The ID of the winning boxer.
+            loser_id (int): The ID of the losing boxer.
+            commit (bool): False to only flush, leaving the caller to commit
+                the ratings together with the rest of its work.
+
+        Returns:
+            dict: The new ratings of both boxers, keyed by boxer ID.
+
+        Raises:
+            ValueError: If a boxer is recorded as fighting themself.
+        """
+        if winner_id == loser_id:
+            raise ValueError("A boxer cannot fight themself")
+
+        try:
+            winner = cls._get_or_create(winner_id)
+            loser = cls._get_or_create(loser_id)
+
+            winner.elo, loser.elo = elo_update(winner.elo, loser.elo)
+            winner.glicko, winner.glicko_rd, loser.glicko, loser.glicko_rd = glicko_update(
+                winner.glicko, winner.glicko_rd, loser.glicko, loser.glicko_rd
+            )
+            winner.fights += 1
+            loser.fights += 1
+
+            db.session.add(FightRecord(winner_id=winner_id, loser_id=loser_id))
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
+            logger.info("Ratings updated after fight: winner %d, loser %d", winner_id, loser_id)
+            return {rating.boxer_id: rating.to_dict() for rating in (winner, loser)}
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Database error while updating ratings: %s", str(e))
+            raise
+
+    @classmethod
+    def recompute_all(cls) -> int:
+        """
+        Rebuild every rating from the full fight history in a vectorized pass.
+
+        Returns:
+            int: The number of fights replayed.
+        """
+        rows = db.session.execute(
+            select(FightRecord.winner_id, FightRecord.loser_id).order_by(FightRecord.id)
+        ).all()
+        winner_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        loser_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+
+        logger.info("Recomputing ratings from %d fights", len(rows))
+        boxer_ids, elo, glicko, glicko_rd, fights = compute_ratings(winner_ids, loser_ids)
+
+        try:
+            db.session.execute(delete(cls))
+            if len(boxer_ids):
+                db.session.execute(insert(cls), [
+                    {
+                        "boxer_id": int(boxer_ids[i]),
+                        "elo": float(elo[i]),
+                        "glicko": float(glicko[i]),
+                        "glicko_rd": float(glicko_rd[i]),
+                        "fights": int(fights[i]),
+                    }
+                    for i in range(len(boxer_ids))
+                ])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Database error while recomputing ratings: %s", str(e))
+            raise
+
+        logger.info("Ratings recomputed for %d boxers", len(boxer_ids))
+        return len(rows)
+
+    @classmethod
+    def get_ratings(cls, boxer_ids: list[int]) -> dict[int, float]:
+        """
+        Get the current ratings of some boxers in the configured rating system.
+
+        Args:
+            boxer_ids (list[int]): The boxers to look up.
+
+        Returns:
+            dict: Ratings keyed by boxer ID. Boxers who have not fought yet have DEFAULT_RATING.
+        """
+        rating_column = cls.elo if RATING_SYSTEM == "elo" else cls.glicko
+        ratings = dict(db.session.execute(
+            select(cls.boxer_id, rating_column).where(cls.boxer_id.in_(boxer_ids))
+        ).all())
+        return {boxer_id: ratings.get(boxer_id, DEFAULT_RATING) for boxer_id in boxer_ids}
+
+    @classmethod
+    def get_leaderboard(cls, limit: int = 100) -> list[dict]:
+        """
+        Get boxers ordered by rating.
+
+        For Glicko the conservative rating (rating - 2 * RD) is used for ordering,
+        so boxers with only a few fights do not jump to the top on a lucky win.
+
+        Args:
+            limit (int): The maximum number of boxers to return.
+
+        Returns:
+            list[dict]: The ranked boxers with their rating details.
+        """
+        from boxing.models.boxers_model import Boxers
+
+        if RATING_SYSTEM == "elo":
+            order = cls.elo.desc()
+        else:
+            order = (cls.glicko - 2 * cls.glicko_rd).desc()
+
+        rows = (
+            db.session.query(cls, Boxers.name)
+            .join(Boxers, Boxers.id == cls.boxer_id)
+            .order_by(order, cls.boxer_id)
+            .limit(limit)
+            .all()
+        )
+        return [dict(rating.to_dict(), name=name) for rating, name in rows]
+
+    def to_dict(self) -> dict:
+        """
+        Convert the rating to a dictionary using the configured rating system.
+
+        Returns:
+            dict: The boxer ID, rating, rating deviation and fight count.
+        """
+        if RATING_SYSTEM == "elo":
+            return {"id": self.boxer_id, "rating": round(self.elo, 1), "rd": None, "fights": self.fights}
+        return {
+            "id": self.boxer_id,
+            "rating": round(self.glicko, 1),
+            "rd": round(self.glicko_rd, 1),
+            "fights": self.fights,
+        }
+
+
+def elo_expected(rating_a, rating_b):
+    """
+    Expected score of A against B. Works on floats and NumPy arrays.
+    """
+    return 1.0 / (1.0 + 10.0 ** ((rating_b - rating_a) / 400.0))
+
+
+def elo_update(winner_rating, loser_rating, k: float = ELO_K_FACTOR):
+    """
+    Apply one Elo update for a decisive result.
+
+    Returns:
+        tuple: The new winner and loser ratings.
+    """
+    change = k * (1.0 - elo_expected(winner_rating, loser_rating))
+    return winner_rating + change, loser_rating - change
+
+
+def _glicko_g(rd):
+    return 1.0 / np.sqrt(1.0 + 3.0 * GLICKO_Q ** 2 * rd ** 2 / math.pi ** 2)
+
+
+def _glicko_player(rating, rd, opp_rating, opp_rd, score):
+    g = _glicko_g(opp_rd)
+    expected = 1.0 / (1.0 + 10.0 ** (-g * (rating - opp_rating) / 400.0))
+    d_squared_inv = GLICKO_Q ** 2 * g ** 2 * expected * (1.0 - expected)
+    precision = 1.0 / rd ** 2 + d_squared_inv
+    new_rating = rating + GLICKO_Q / precision * g * (score - expected)
+    new_rd = np.maximum(np.sqrt(1.0 / precision), MIN_RD)
+    return new_rating, new_rd
+
+
+def glicko_update(winner_rating, winner_rd, loser_rating, loser_rd):
+    """
+    Apply one Glicko-1 update, treating the fight as its own rating period.
+    Works on floats and NumPy arrays.
+
+    Returns:
+        tuple: The new winner rating and RD, then the new loser rating and RD.
+    """
+    new_w, new_w_rd = _glicko_player(winner_rating, winner_rd, loser_rating, loser_rd, 1.0)
+    new_l, new_l_rd = _glicko_player(loser_rating, loser_rd, winner_rating, winner_rd, 0.0)
+    return new_w, new_w_rd, new_l, new_l_rd
+
+
+def _schedule_rounds(winner_idx: np.ndarray, loser_idx: np.ndarray, n_boxers: int) -> np.ndarray:
+    """
+    Assign each fight to the earliest round after every earlier fight of both
+    boxers, so no boxer appears twice in a round and per-boxer order is kept.
+    """
+    last_round = [0] * n_boxers
+    rounds = [0] * len(winner_idx)
+    for i, (w, l) in enumerate(zip(winner_idx.tolist(), loser_idx.tolist())):
+        current = max(last_round[w], last_round[l]) + 1
+        last_round[w] = last_round[l] = current
+        rounds[i] = current
+    return np.asarray(rounds, dtype=np.int64)
+
+
+def compute_ratings(winner_ids: np.ndarray, loser_ids: np.ndarray) -> tuple:
+    """
+    Replay a fight history and compute final Elo and Glicko ratings.
+
+    Fights are grouped into rounds in which every boxer appears at most once.
+    Each round is then applied as a single vectorized update, which gives the
+    same result as replaying the fights one by one.
+
+    Args:
+        winner_ids (np.ndarray): Winner boxer IDs, in fight order.
+        loser_ids (np.ndarray): Loser boxer IDs, in fight order.
+
+    Returns:
+        tuple: Arrays of boxer IDs, Elo ratings, Glicko ratings, Glicko RDs and fight counts.
+    """
+    n_fights = len(winner_ids)
+    boxer_ids, inverse = np.unique(np.concatenate([winner_ids, loser_ids]), return_inverse=True)
+    winner_idx = inverse[:n_fights]
+    loser_idx = inverse[n_fights:]
+
+    elo = np.full(len(boxer_ids), DEFAULT_RATING)
+    glicko = np.full(len(boxer_ids), DEFAULT_RATING)
+    glicko_rd = np.full(len(boxer_ids), DEFAULT_RD)
+    fights = np.bincount(inverse, minlength=len(boxer_ids))
+
+    if n_fights == 0:
+        return boxer_ids, elo, glicko, glicko_rd, fights
+
+    rounds = _schedule_rounds(winner_idx, loser_idx, len(boxer_ids))
+    order = np.argsort(rounds, kind="stable")
+    boundaries = np.flatnonzero(np.diff(rounds[order])) + 1
+
+    for batch in np.split(order, boundaries):
+        w = winner_idx[batch]
+        l = loser_idx[batch]
+
+        elo[w], elo[l] = elo_update(elo[w], elo[l])
+        glicko[w], glicko_rd[w], glicko[l], glicko_rd[l] = glicko_update(
+            glicko[w], glicko_rd[w], glicko[l], glicko_rd[l]
+        )
+
+    return boxer_ids, elo, glicko, glicko_rd, fights
@@ -0,0 +1,128 @@
+import logging
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+
+from boxing.db import db
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+RING_CAPACITY = 2
+
+
+class RingSlots(db.Model):
+    """
+    The boxers waiting in the ring, kept in the database so that every worker
+    process sees the same ring. RingModel is only built per request, to fight
+    the boxers taken out of here.
+
+    Slots are ordered by position: the boxer who entered first is boxer 1 of
+    the fight. Positions are unique, so two workers filling the last slot at
+    the same time cannot both succeed.
+    """
+    __tablename__ = 'ring_slots'
+
+    position = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    boxer_id = db.Column(db.Integer, nullable=False)
+
+    @classmethod
+    def get_boxer_ids(cls) -> list[int]:
+        """
+        Get the IDs of the boxers in the ring, in the order they entered.
+        """
+        return list(db.session.scalars(select(cls.boxer_id).order_by(cls.position)))
+
+    @classmethod
+    def enter(cls, boxer_id: int) -> list[int]:
+        """
+        Add a boxer to the ring.
+
+        Args:
+            boxer_id (int): The ID of the boxer entering the ring.
+
+        Returns:
+            list[int]: The IDs of the boxers now in the ring.
+
+        Raises:
+            ValueError: If the ring is full.
+        """
+        for _ in range(RING_CAPACITY):
+            boxer_ids = cls.get_boxer_ids()
+            if len(boxer_ids) >= RING_CAPACITY:
+                break
+            next_position = (db.session.scalar(select(func.max(cls.position))) or 0) + 1
+            try:
+                db.session.add(cls(position=next_position, boxer_id=boxer_id))
+                db.session.commit()
+            except IntegrityError:
+                # Another worker took the slot first; look at the ring again
+                db.session.rollback()
+                continue
+            logger.info("Boxer %d entered the ring", boxer_id)
+            return boxer_ids + [boxer_id]
+
+        logger.warning("Boxer %d cannot enter: the ring is full", boxer_id)
+        raise ValueError("Ring is full, cannot add more boxers.")
+
+    @classmethod
+    def take_all(cls) -> list[int]:
+        """
+        Take both boxers out of the ring to fight them. Only one caller can take
+        a given pair, so a fight cannot start twice.
+
+        Returns:
+            list[int]: The IDs of the boxers taken, in the order they entered.
+
+        Raises:
+            ValueError: If the ring does not hold two boxers.
+        """
+        slots = db.session.execute(select(cls.position, cls.boxer_id).order_by(cls.position)).all()
+        if len(slots) < RING_CAPACITY:
+            db.session.commit()  # End the read transaction
+            raise ValueError("There must be two boxers to start a fight.")
+
+        result = db.session.execute(delete(cls).where(cls.position.in_([position for position, _ in slots])))
+        if result.rowcount != len(slots):
+            db.session.rollback()
+            logger.warning("Ring was emptied by another request while starting a fight")
+            raise ValueError("There must be two boxers to start a fight.")
+        db.session.commit()
+        return [boxer_id for _, boxer_id in slots]
+
+    @classmethod
+    def restore(cls, boxer_ids: list[int]) -> None:
+        """
+        Put boxers taken by take_all back into the ring, e.g. after the fight failed.
+        Nothing is restored if the ring was refilled in the meantime.
+        """
+        try:
+            if db.session.scalar(select(func.count()).select_from(cls)):
+                logger.warning("Ring was refilled, not restoring boxers %s", boxer_ids)
+                return
+            db.session.add_all(cls(position=position, boxer_id=boxer_id)
+                               for position, boxer_id in enumerate(boxer_ids, start=1))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            logger.warning("Ring was refilled, not restoring boxers %s", boxer_ids)
+
+    @classmethod
+    def remove(cls, boxer_id: int) -> None:
+        """
+        Take a boxer out of the ring, e.g. because it was deleted.
+        """
+        db.session.execute(delete(cls).where(cls.boxer_id == boxer_id))
+        db.session.commit()
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Empty the ring.
+        """
+        db.session.execute(delete(cls))
+        db.session.commit()
+        logger.info("Ring cleared")
@@ -0,0 +1,204 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from boxing.db import db
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Kept in sync with sql/init_db.sql, which creates the same objects for fresh databases.
+# Each index ends with id, so a page is read in (column, id) order straight from the
+# index instead of sorting every matching row.
+SEARCH_INDEXES = [
+    "DROP INDEX IF EXISTS idx_boxers_weight_age",
+    "DROP INDEX IF EXISTS idx_boxers_age_weight",
+    "DROP INDEX IF EXISTS idx_boxers_reach",
+    "CREATE INDEX IF NOT EXISTS idx_boxers_weight_id ON boxers(weight, id)",
+    "CREATE INDEX IF NOT EXISTS idx_boxers_age_weight_id ON boxers(age, weight, id)",
+    "CREATE INDEX IF NOT EXISTS idx_boxers_reach_id ON boxers(reach, id)",
+]
+
+FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS boxers_fts USING fts5("
+    "name, content='boxers', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS boxers_fts_ai AFTER INSERT ON boxers BEGIN "
+    "INSERT INTO boxers_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS boxers_fts_ad AFTER DELETE ON boxers BEGIN "
+    "INSERT INTO boxers_fts(boxers_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS boxers_fts_au AFTER UPDATE OF name ON boxers BEGIN "
+    "INSERT INTO boxers_fts(boxers_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO boxers_fts(rowid, name) VALUES (new.id, new.name); END",
+]
+
+_fts_available: Optional[bool] = None
+
+
+def ensure_search_indexes(engine: Engine, rebuild: bool = False) -> None:
+    """
+    Create the search indexes and, on SQLite, the FTS5 name index if they are missing.
+
+    Args:
+        engine (Engine): The engine of the database holding the boxers table.
+        rebuild (bool): Rebuild the name index even if it exists, e.g. after the
+            boxers table was recreated.
+    """
+    global _fts_available
+
+    with engine.begin() as conn:
+        for statement in SEARCH_INDEXES:
+            conn.execute(text(statement))
+
+        if engine.dialect.name != "sqlite":
+            _fts_available = False
+            return
+
+        existed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'boxers_fts'")
+        ).first() is not None
+        try:
+            for statement in FTS_SCHEMA:
+                conn.execute(text(statement))
+        except Exception as e:
+            logger.warning("FTS5 is unavailable, name search falls back to LIKE: %s", e)
+            _fts_available = False
+            return
+        if rebuild or not existed:
+            conn.execute(text("INSERT INTO boxers_fts(boxers_fts) VALUES ('rebuild')"))
+            logger.info("Built full-text index over boxer names")
+
+    _fts_available = True
+
+
+def _fts_query(prefix: str) -> str:
+    # Quote every word so user input is never parsed as FTS syntax, and match the last one as a prefix
+    words = ['"' + word.replace('"', '""') + '"' for word in prefix.split()]
+    return " ".join(words) + "*"
+
+
+def _sort_column(weight_filtered: bool, age_filtered: bool, reach_filtered: bool) -> Optional[str]:
+    # Page in the order of the index that serves the filters; None pages by ID alone
+    if weight_filtered or age_filtered:
+        return "weight"  # idx_boxers_weight_id, or idx_boxers_age_weight_id with an age
+    if reach_filtered:
+        return "reach"
+    return None
+
+
+def _parse_cursor(cursor: str, sort_column: Optional[str]) -> tuple:
+    try:
+        if sort_column is None:
+            return (int(cursor),)
+        value, boxer_id = cursor.split(":")
+        return (float(value) if sort_column == "reach" else int(value)), int(boxer_id)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid cursor '{cursor}'. Pass the next_cursor of the previous page with the same filters")
+
+
+def search_boxers(
+    weight_min: Optional[int] = None,
+    weight_max: Optional[int] = None,
+    age: Optional[int] = None,
+    reach_min: Optional[float] = None,
+    reach_max: Optional[float] = None,
+    name_prefix: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Search boxers by attributes with keyset pagination.
+
+    Pages continue from the last boxer seen, in the order of the index serving
+    the filters: by weight then ID when filtering on weight or age, by reach
+    then ID when filtering on reach only, otherwise by ID. A page is then read
+    straight from the index, so a deep page costs the same as the first one.
+
+    Args:
+        weight_min (int, optional): Minimum weight, inclusive.
+        weight_max (int, optional): Maximum weight, inclusive.
+        age (int, optional): Exact age.
+        reach_min (float, optional): Minimum reach, inclusive.
+        reach_max (float, optional): Maximum reach, inclusive.
+        name_prefix (str, optional): Matches names with words starting with these words.
+        after (str, optional): The cursor returned with the previous page, for the same filters.
+        limit (int): The page size, capped at MAX_PAGE_SIZE.
+
+    Returns:
+        tuple: The matching boxers and the cursor of the next page (None on the last page).
+
+    Raises:
+        ValueError: If the limit is not positive, a range is inverted or the cursor is invalid.
+    """
+    if limit <= 0:
+        raise ValueError("Limit must be a positive integer")
+    if weight_min is not None and weight_max is not None and weight_min > weight_max:
+        raise ValueError("weight_min cannot be greater than weight_max")
+    if reach_min is not None and reach_max is not None and reach_min > reach_max:
+        raise ValueError("reach_min cannot be greater than reach_max")
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    conditions = []
+    params = {"limit": limit + 1}
+
+    if weight_min is not None:
+        conditions.append("weight >= :weight_min")
+        params["weight_min"] = weight_min
+    if weight_max is not None:
+        conditions.append("weight <= :weight_max")
+        params["weight_max"] = weight_max
+    if age is not None:
+        conditions.append("age = :age")
+        params["age"] = age
+    if reach_min is not None:
+        conditions.append("reach >= :reach_min")
+        params["reach_min"] = reach_min
+    if reach_max is not None:
+        conditions.append("reach <= :reach_max")
+        params["reach_max"] = reach_max
+    if name_prefix and name_prefix.strip():
+        if _fts_available:
+            conditions.append("id IN (SELECT rowid FROM boxers_fts WHERE boxers_fts MATCH :name_query)")
+            params["name_query"] = _fts_query(name_prefix)
+        else:
+            conditions.append("name LIKE :name_like ESCAPE '\\'")
+            escaped = name_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params["name_like"] = escaped + "%"
+
+    sort_column = _sort_column(
+        weight_min is not None or weight_max is not None,
+        age is not None,
+        reach_min is not None or reach_max is not None,
+    )
+    if after is not None:
+        cursor = _parse_cursor(after, sort_column)
+        if sort_column is None:
+            conditions.append("id > :after_id")
+            params["after_id"] = cursor[0]
+        else:
+            conditions.append(f"({sort_column}, id) > (:after_value, :after_id)")
+            params["after_value"], params["after_id"] = cursor
+    order_by = "id" if sort_column is None else f"{sort_column}, id"
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = text(
+        f"SELECT id, name, weight, height, reach, age FROM boxers {where} ORDER BY {order_by} LIMIT :limit"
+    )
+
+    logger.info("Searching boxers with filters: %s", {k: v for k, v in params.items() if k != "limit"})
+    rows = db.session.execute(query, params).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = str(last["id"]) if sort_column is None else f"{last[sort_column]}:{last['id']}"
+
+    return [dict(row) for row in rows], next_cursor
@@ -0,0 +1,467 @@
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import numpy as np
+from sqlalchemy import delete, insert, select, update
+
+from boxing.db import db
+from boxing.models.boxer_snapshot import BoxerRoster
+from boxing.models.job_model import JobLostError
+from boxing.models.rating_model import DEFAULT_RATING, RATING_SYSTEM, Ratings
+from boxing.utils.fight_utils import simulate_bouts
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+FORMATS = ("single_elimination", "round_robin", "swiss")
+MAX_ROUND_ROBIN_ENTRANTS = 256
+
+# Rounds are simulated in fixed-size chunks with one seed per chunk, so results
+# only depend on the tournament seed and not on how many workers ran them
+CHUNK_SIZE = 8192
+TOURNAMENT_WORKERS = int(os.getenv("TOURNAMENT_WORKERS", os.cpu_count() or 1))
+# Below this many bouts a round is simulated inline; process start-up would cost more
+PARALLEL_MIN_BOUTS = int(os.getenv("TOURNAMENT_PARALLEL_MIN_BOUTS", 4 * CHUNK_SIZE))
+
+# How far down the standings Swiss pairing looks for an opponent not met before
+SWISS_REMATCH_WINDOW = 16
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # forkserver: forking a multi-threaded web worker directly is unsafe
+            _pool = ProcessPoolExecutor(max_workers=TOURNAMENT_WORKERS,
+                                        mp_context=multiprocessing.get_context("forkserver"))
+        return _pool
+
+
+class Tournaments(db.Model):
+    __tablename__ = 'tournaments'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    format = db.Column(db.String(32), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default="pending")
+    seed = db.Column(db.Integer, nullable=False)
+    entrants = db.Column(db.Integer, nullable=False)
+    current_round = db.Column(db.Integer, nullable=False, default=0)
+    total_rounds = db.Column(db.Integer, nullable=False)
+    error = db.Column(db.String(255))
+    job_id = db.Column(db.Integer)  # The job running the tournament
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    finished_at = db.Column(db.DateTime)
+
+    @classmethod
+    def create_tournament(cls, name: str, format: str, boxer_ids: Optional[list[int]] = None,
+                          seed: Optional[int] = None, rounds: Optional[int] = None) -> "Tournaments":
+        """
+        Create a tournament and its entrants. Entrants are seeded by rating.
+
+        Args:
+            name (str): The tournament name.
+            format (str): One of 'single_elimination', 'round_robin' or 'swiss'.
+            boxer_ids (list[int], optional): The entrants; all boxers when omitted.
+            seed (int, optional): Seed of the bout simulations; random when omitted.
+            rounds (int, optional): Number of Swiss rounds; log2 of the entrants when omitted.
+
+        Returns:
+            Tournaments: The new tournament.
+
+        Raises:
+            ValueError: If the format, entrants or rounds are invalid, or an entrant is listed twice.
+        """
+        from boxing.models.boxers_model import Boxers
+
+        if format not in FORMATS:
+            raise ValueError(f"Invalid format '{format}'. Must be one of: {', '.join(FORMATS)}")
+        if boxer_ids is not None and len(set(boxer_ids)) != len(boxer_ids):
+            duplicates = sorted({boxer_id for boxer_id in boxer_ids if boxer_ids.count(boxer_id) > 1})
+            raise ValueError(f"Duplicate boxer IDs: {duplicates[:10]}")
+
+        # Filtering in Python: an IN list of tens of thousands of IDs exceeds SQLite's parameter limit
+        all_ids = {row[0] for row in db.session.query(Boxers.id).all()}
+        if boxer_ids is not None:
+            missing = sorted(set(boxer_ids) - all_ids)
+            if missing:
+                raise ValueError(f"Boxers not found: {missing[:10]}")
+            entrant_ids = sorted(set(boxer_ids))
+        else:
+            entrant_ids = sorted(all_ids)
+        if len(entrant_ids) < 2:
+            raise ValueError("A tournament needs at least two boxers")
+        if format == "round_robin" and len(entrant_ids) > MAX_ROUND_ROBIN_ENTRANTS:
+            raise ValueError(f"Round robin is limited to {MAX_ROUND_ROBIN_ENTRANTS} boxers")
+
+        n = len(entrant_ids)
+        if format == "single_elimination":
+            total_rounds = math.ceil(math.log2(n))
+        elif format == "round_robin":
+            total_rounds = n - 1 if n % 2 == 0 else n
+        else:
+            total_rounds = rounds or math.ceil(math.log2(n))
+            if total_rounds <= 0:
+                raise ValueError("Number of rounds must be a positive integer")
+
+        rating_column = Ratings.elo if RATING_SYSTEM == "elo" else Ratings.glicko
+        ratings = dict(db.session.query(Ratings.boxer_id, rating_column).all())
+        entrant_ids.sort(key=lambda boxer_id: (-ratings.get(boxer_id, DEFAULT_RATING), boxer_id))
+
+        try:
+            tournament = cls(name=name, format=format, status="pending",
+                             seed=seed if seed is not None else int.from_bytes(os.urandom(4), "big"),
+                             entrants=n, current_round=0, total_rounds=total_rounds)
+            db.session.add(tournament)
+            db.session.flush()
+            db.session.execute(insert(TournamentEntrants), [
+                {"tournament_id": tournament.id, "boxer_id": boxer_id, "seed": position + 1,
+                 "score": 0.0, "eliminated": False}
+                for position, boxer_id in enumerate(entrant_ids)
+            ])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Database error while creating tournament: %s", str(e))
+            raise
+
+        logger.info("Tournament %d created: %s, %d entrants, %d rounds", tournament.id, format, n, total_rounds)
+        return tournament
+
+    @classmethod
+    def fail_abandoned(cls) -> int:
+        """
+        Fail unfinished tournaments whose job has failed, e.g. because the
+        worker running it died on its last attempt.
+
+        Returns:
+            int: The number of tournaments failed.
+        """
+        from boxing.models.job_model import Jobs
+
+        failed_jobs = select(Jobs.id).where(Jobs.status == "failed")
+        failed = db.session.execute(
+            update(cls)
+            .where(cls.status.in_(("pending", "running")), cls.job_id.in_(failed_jobs))
+            .values(status="failed", error="Tournament job failed", finished_at=datetime.now(timezone.utc))
+        ).rowcount
+        db.session.commit()
+        if failed:
+            logger.warning("Failed %d abandoned tournament(s)", failed)
+        return failed
+
+    def get_progress(self, top: int = 10) -> dict:
+        """
+        Get the tournament status and its current top standings.
+
+        Args:
+            top (int): How many entrants to include in the standings.
+
+        Returns:
+            dict: The tournament details and standings.
+        """
+        standings = (
+            db.session.query(TournamentEntrants)
+            .filter_by(tournament_id=self.id)
+            .order_by(TournamentEntrants.eliminated, TournamentEntrants.score.desc(), TournamentEntrants.seed)
+            .limit(top)
+            .all()
+        )
+        return {
+            "id": self.id,
+            "name": self.name,
+            "format": self.format,
+            "status": self.status,
+            "seed": self.seed,
+            "entrants": self.entrants,
+            "current_round": self.current_round,
+            "total_rounds": self.total_rounds,
+            "error": self.error,
+            "job_id": self.job_id,
+            "standings": [
+                {"boxer_id": entrant.boxer_id, "seed": entrant.seed, "score": entrant.score,
+                 "eliminated": entrant.eliminated}
+                for entrant in standings
+            ],
+        }
+
+
+class TournamentEntrants(db.Model):
+    __tablename__ = 'tournament_entrants'
+
+    tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id'), primary_key=True)
+    boxer_id = db.Column(db.Integer, primary_key=True)
+    seed = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float, nullable=False, default=0.0)
+    eliminated = db.Column(db.Boolean, nullable=False, default=False)
+
+
+class TournamentBouts(db.Model):
+    __tablename__ = 'tournament_bouts'
+
+    id = db.Column(db.Integer, primary_key=True)
+    tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id'), nullable=False, index=True)
+    round = db.Column(db.Integer, nullable=False)
+    boxer_1_id = db.Column(db.Integer, nullable=False)
+    boxer_2_id = db.Column(db.Integer)  # NULL for a bye
+    winner_id = db.Column(db.Integer, nullable=False)
+
+
+def _pair_single_elimination(alive: np.ndarray) -> tuple[np.ndarray, np.ndarray, Optional[int]]:
+    # Alive entrants are in seed order: the best remaining seed meets the worst
+    bye = None
+    if len(alive) % 2:
+        bye, alive = alive[0], alive[1:]
+    half = len(alive) // 2
+    return alive[:half], alive[::-1][:half], bye
+
+
+def _pair_round_robin(n: int, round_no: int) -> tuple[np.ndarray, np.ndarray, Optional[int]]:
+    # Circle method: entrant 0 stays put and the rest rotate one step per round
+    size = n + (n % 2)
+    rotating = np.roll(np.arange(1, size), round_no - 1)
+    order = np.concatenate([[0], rotating])
+    first, second = order[:size // 2], order[::-1][:size // 2]
+    if n % 2:
+        # Index n is the phantom entrant; whoever meets it has a bye
+        at = np.flatnonzero((first == n) | (second == n))[0]
+        bye = int(second[at] if first[at] == n else first[at])
+        return np.delete(first, at), np.delete(second, at), bye
+    return first, second, None
+
+
+def _pair_swiss(scores: np.ndarray, had_bye: np.ndarray, played: list[set]) -> tuple[np.ndarray, np.ndarray, Optional[int]]:
+    # Sort by score, then seed; pair down the standings avoiding rematches where possible
+    order = np.lexsort((np.arange(len(scores)), -scores)).tolist()
+    bye = None
+    if len(order) % 2:
+        # Lowest ranked entrant that has not had a bye yet
+        for position in range(len(order) - 1, -1, -1):
+            if not had_bye[order[position]]:
+                bye = order.pop(position)
+                break
+        else:
+            bye = order.pop()
+
+    first, second = [], []
+    paired = [False] * len(order)
+    for position, a in enumerate(order):
+        if paired[position]:
+            continue
+        paired[position] = True
+
+        partner, fallback, checked = None, None, 0
+        candidate = position + 1
+        while candidate < len(order) and checked < SWISS_REMATCH_WINDOW:
+            if not paired[candidate]:
+                if fallback is None:
+                    fallback = candidate
+                if order[candidate] not in played[a]:
+                    partner = candidate
+                    break
+                checked += 1
+            candidate += 1
+        partner = partner if partner is not None else fallback
+
+        paired[partner] = True
+        first.append(a)
+        second.append(order[partner])
+    return np.asarray(first, dtype=np.int64), np.asarray(second, dtype=np.int64), bye
+
+
+def _simulate_round(seed: int, round_no: int, skills_1: np.ndarray, skills_2: np.ndarray) -> np.ndarray:
+    n = len(skills_1)
+    chunks = range(0, n, CHUNK_SIZE)
+    seeds = [
+        int(np.random.SeedSequence([seed, round_no, chunk]).generate_state(1)[0])
+        for chunk in range(len(chunks))
+    ]
+    slices = [(start, min(start + CHUNK_SIZE, n)) for start in chunks]
+
+    if n < PARALLEL_MIN_BOUTS or TOURNAMENT_WORKERS <= 1:
+        results = [simulate_bouts(s, skills_1[a:b], skills_2[a:b]) for s, (a, b) in zip(seeds, slices)]
+    else:
+        pool = _get_pool()
+        results = list(pool.map(
+            simulate_bouts,
+            seeds,
+            [skills_1[a:b] for a, b in slices],
+            [skills_2[a:b] for a, b in slices],
+        ))
+    return np.concatenate(results) if results else np.zeros(0, dtype=bool)
+
+
+def run_tournament(tournament_id: int, before_commit: Optional[Callable[[], None]] = None) -> None:
+    """
+    Run every round of a tournament, committing each round's results in bulk.
+
+    Bouts within a round are independent, so they are simulated in parallel.
+    Must be called within an application context.
+
+    A tournament left running by a worker that died is started over: results
+    only depend on the seed, so the rerun gives the same bouts.
+
+    Args:
+        tournament_id (int): The ID of the tournament to run.
+        before_commit (Callable, optional): Called in the transaction of every
+            commit, just before it, e.g. to check that the worker still holds
+            the job running the tournament. Raising stops the tournament
+            without marking it failed.
+
+    Raises:
+        ValueError: If the tournament does not exist or has already finished.
+        JobLostError: If before_commit found that the job was taken over.
+    """
+    from boxing.models.boxers_model import Boxers
+
+    tournament = db.session.get(Tournaments, tournament_id)
+    if tournament is None:
+        raise ValueError(f"Tournament with ID {tournament_id} not found")
+    if tournament.status == "running":
+        logger.warning("Tournament %d was interrupted in round %d, starting over",
+                       tournament_id, tournament.current_round)
+        _reset_progress(tournament)
+    elif tournament.status != "pending":
+        raise ValueError(f"Tournament {tournament_id} is already {tournament.status}")
+
+    tournament.status = "running"
+    try:
+        if before_commit is not None:
+            before_commit()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    try:
+        roster = BoxerRoster.from_rows(
+            db.session.query(TournamentEntrants.boxer_id, Boxers.name, Boxers.weight, Boxers.reach, Boxers.age)
+            .join(Boxers, Boxers.id == TournamentEntrants.boxer_id)
+            .filter(TournamentEntrants.tournament_id == tournament_id)
+            .order_by(TournamentEntrants.seed)
+            .all()
+        )
+        boxer_ids = roster.ids
+        skills = roster.skills()
+        n = len(roster)
+
+        scores = np.zeros(n)
+        alive = np.ones(n, dtype=bool)
+        had_bye = np.zeros(n, dtype=bool)
+        played = [set() for _ in range(n)] if tournament.format == "swiss" else None
+
+        for round_no in range(1, tournament.total_rounds + 1):
+            if tournament.format == "single_elimination":
+                first, second, bye = _pair_single_elimination(np.flatnonzero(alive))
+            elif tournament.format == "round_robin":
+                first, second, bye = _pair_round_robin(n, round_no)
+            else:
+                first, second, bye = _pair_swiss(scores, had_bye, played)
+
+            first_won = _simulate_round(tournament.seed, round_no, skills[first], skills[second])
+            winners = np.where(first_won, first, second)
+            losers = np.where(first_won, second, first)
+
+            np.add.at(scores, winners, 1.0)
+            if tournament.format == "single_elimination":
+                alive[losers] = False
+            if played is not None:
+                for a, b in zip(first.tolist(), second.tolist()):
+                    played[a].add(b)
+                    played[b].add(a)
+            if bye is not None:
+                scores[bye] += 1.0
+                had_bye[bye] = True
+
+            # Only winners, the bye and knocked out boxers have a new standing
+            changed = [winners] + ([losers] if tournament.format == "single_elimination" else [])
+            if bye is not None:
+                changed.append(np.array([bye]))
+            _commit_round(tournament, round_no, boxer_ids, first, second, winners, bye,
+                          np.concatenate(changed), scores, alive, before_commit)
+            logger.info("Tournament %d: round %d/%d complete (%d bouts)",
+                        tournament_id, round_no, tournament.total_rounds, len(first))
+
+        tournament.status = "completed"
+        tournament.finished_at = datetime.now(timezone.utc)
+        if before_commit is not None:
+            before_commit()
+        db.session.commit()
+        logger.info("Tournament %d completed", tournament_id)
+
+    except JobLostError:
+        # The worker now holding the job starts the tournament over
+        db.session.rollback()
+        raise
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Tournament %d failed: %s", tournament_id, str(e))
+        tournament.status = "failed"
+        tournament.error = str(e)[:255]
+        db.session.commit()
+        raise
+
+
+def _reset_progress(tournament: Tournaments) -> None:
+    # Left for the caller to commit, together with the tournament's new status
+    db.session.execute(delete(TournamentBouts).where(TournamentBouts.tournament_id == tournament.id))
+    db.session.execute(
+        update(TournamentEntrants)
+        .where(TournamentEntrants.tournament_id == tournament.id)
+        .values(score=0.0, eliminated=False)
+    )
+    tournament.current_round = 0
+
+
+def _commit_round(tournament: Tournaments, round_no: int, boxer_ids: np.ndarray, first: np.ndarray,
+                  second: np.ndarray, winners: np.ndarray, bye: Optional[int], changed: np.ndarray,
+                  scores: np.ndarray, alive: np.ndarray,
+                  before_commit: Optional[Callable[[], None]] = None) -> None:
+    bouts = list(zip(
+        itertools.repeat(tournament.id),
+        itertools.repeat(round_no),
+        boxer_ids[first].tolist(),
+        boxer_ids[second].tolist(),
+        boxer_ids[winners].tolist(),
+    ))
+    if bye is not None:
+        bouts.append((tournament.id, round_no, int(boxer_ids[bye]), None, int(boxer_ids[bye])))
+    standings = list(zip(
+        scores[changed].tolist(),
+        (~alive[changed]).tolist(),
+        itertools.repeat(tournament.id),
+        boxer_ids[changed].tolist(),
+    ))
+
+    # Plain DB-API executemany: ORM and Core per-row parameter processing dominate at this size
+    try:
+        connection = db.session.connection()
+        connection.exec_driver_sql(
+            "INSERT INTO tournament_bouts (tournament_id, round, boxer_1_id, boxer_2_id, winner_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            bouts,
+        )
+        connection.exec_driver_sql(
+            "UPDATE tournament_entrants SET score = ?, eliminated = ? WHERE tournament_id = ? AND boxer_id = ?",
+            standings,
+        )
+        tournament.current_round = round_no
+        if before_commit is not None:
+            before_commit()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
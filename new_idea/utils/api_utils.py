@@ -1,5 +1,9 @@
 import logging
 import os
+import threading
+from collections import deque
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 import requests
 
 from boxing.utils.logger import configure_logger
@@ -12,11 +16,27 @@ configure_logger(logger)
 RANDOM_ORG_URL = os.getenv("RANDOM_ORG_URL",
                            "https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new")
 
+# Numbers fetched per request to random.org; the extras are kept for later calls
+RANDOM_ORG_BATCH_SIZE = int(os.getenv("RANDOM_ORG_BATCH_SIZE", 10))
+
+_random_buffer: deque = deque()
+_random_lock = threading.Lock()
+
+
+def _batch_url(url: str, count: int) -> str:
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query["num"] = str(count)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
 
 def get_random() -> float:
     """
     Fetches a random float between 0 and 1 from random.org.
 
+    Numbers are fetched RANDOM_ORG_BATCH_SIZE at a time, and the unused ones
+    are handed out by later calls, so most fights do not wait on random.org.
+
     Returns:
         float: The random number fetched from random.org.
 
@@ -25,24 +45,36 @@ def get_random() -> float:
         RuntimeError: If the request to random.org fails due to a timeout or other request-related error.
 
     """
+    with _random_lock:
+        if _random_buffer:
+            return _random_buffer.popleft()
+
+    url = RANDOM_ORG_URL if RANDOM_ORG_BATCH_SIZE <= 1 else _batch_url(RANDOM_ORG_URL, RANDOM_ORG_BATCH_SIZE)
     try:
-        logger.info(f"Fetching random number from {RANDOM_ORG_URL}")
+        logger.info(f"Fetching random number from {url}")
 
-        response = requests.get(RANDOM_ORG_URL, timeout=5)
+        response = requests.get(url, timeout=5)
 
         # Check if the request was successful
         response.raise_for_status()
 
-        random_number_str = response.text.strip()
+        random_number_strs = response.text.split()
 
         try:
-            random_number = float(random_number_str)
+            random_numbers = [float(random_number_str) for random_number_str in random_number_strs]
         except ValueError:
-            logger.error(f"Invalid response from random.org: {random_number_str}")
-            raise ValueError(f"Invalid response from random.org: {random_number_str}")
+            logger.error(f"Invalid response from random.org: {response.text.strip()}")
+            raise ValueError(f"Invalid response from random.org: {response.text.strip()}")
+        if not random_numbers:
+            logger.error("Empty response from random.org")
+            raise ValueError("Invalid response from random.org: empty response")
+
+        random_number = random_numbers[0]
+        with _random_lock:
+            _random_buffer.extend(random_numbers[1:])
 
         logger.debug(f"Received random number: {random_number:.3f}")
-        logger.info(f"Successfully fetched random number")
+        logger.info(f"Successfully fetched {len(random_numbers)} random number(s)")
 
         return random_number
 
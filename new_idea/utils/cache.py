@@ -0,0 +1,506 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Union
+
+from flask import Flask, g, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from boxing.db import db
+from boxing.utils.logger import configure_logger
+from boxing.utils.redis_client import RedisClient
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+Tags = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+# Every manager is invalidated by the session hooks, which are installed once for the shared db.session
+_managers: "weakref.WeakSet[CacheManager]" = weakref.WeakSet()
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+
+def row_tags(table: str, pk) -> tuple[str, str]:
+    """
+    Tags of a cached row: invalidated when that row changes, or by a bulk change to its table.
+    """
+    return f"{table}:{pk}", f"{table}:*"
+
+
+def table_tags(table: str) -> tuple[str, str]:
+    """
+    Tags invalidated by a bulk change to a table, such as a reset or an UPDATE statement.
+
+    The bare table name is also invalidated by every row change, so values
+    computed from a whole table (e.g. the leaderboard) are tagged with it.
+    """
+    return table, f"{table}:*"
+
+
+def entity_to_dict(instance) -> dict:
+    """
+    Copy the column values of a model instance, for caching.
+    """
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(instance).mapper.column_attrs}
+
+
+def entity_from_dict(model, values: dict):
+    """
+    Attach a cached row to the current session without querying the database.
+
+    The instance is built without calling the model's constructor and merged
+    with load=False, so it behaves like a row loaded by this session (lazy
+    loads, updates) and an instance already in the session is reused.
+    """
+    instance = model.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        setattr(instance, key, value)
+    make_transient_to_detached(instance)
+    return db.session.merge(instance, load=False)
+
+
+def get_cached_entity(cache: "Cache", model, key, load: Callable[[], Any]):
+    """
+    Look up a model instance through a cache that stores only its column values.
+
+    A missing row is cached too, tagged with the bare table name, so it is
+    found once a row is inserted.
+
+    Args:
+        cache (Cache): The cache to use.
+        model: The model class.
+        key: Identifies the lookup, e.g. 'id:5' or 'name:Ali'.
+        load (Callable): Loads the instance, or returns None if it does not exist.
+
+    Returns:
+        The instance attached to the current session, or None.
+    """
+    table = model.__table__.name
+    pk = model.__mapper__.primary_key[0].key
+
+    def load_values():
+        instance = load()
+        return entity_to_dict(instance) if instance is not None else None
+
+    values = cache.get_or_set(
+        key, load_values,
+        tags=lambda values: row_tags(table, values[pk]) if values is not None else table_tags(table)
+    )
+    return entity_from_dict(model, values) if values is not None else None
+
+
+class LRUCache:
+    """
+    Process-level cache with a size limit, a TTL and tag-based invalidation.
+
+    The least recently used entry is evicted once max_size entries are
+    stored. Each entry remembers its tags, and a tag index maps tags back to
+    keys, so invalidating a tag only touches the entries that carry it.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any, tuple]] = OrderedDict()
+        self._tag_index: dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Returns:
+            tuple: Whether the key was found, and its value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, tags: tuple = ()) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Remove every entry carrying one of the tags.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tag_index.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedCacheTier:
+    """
+    Cache tier shared by every worker through a Redis-protocol server.
+
+    Values are stored as JSON along with their tags; values that cannot be
+    serialized are only cached in process. Each tag is a set of the keys carrying it, so
+    invalidating a tag deletes exactly those keys. Invalidations are also
+    published, so other processes drop the tag from their local tiers.
+    """
+
+    def __init__(self, url: str, prefix: str = "cache:"):
+        self.client = RedisClient(url)
+        self.prefix = prefix
+        self.channel = f"{prefix}invalidate"
+        self._origin = uuid.uuid4().hex
+        self._listener_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def origin(self) -> str:
+        # Identifies this process in invalidation messages, so it can skip its own;
+        # includes the PID because forked workers share the parent's attributes
+        return f"{self._origin}:{os.getpid()}"
+
+    def get(self, cache_name: str, key: str) -> tuple[bool, Any, tuple]:
+        """
+        Returns:
+            tuple: Whether the key was found, its value and its tags.
+        """
+        raw = self.client.get(f"{self.prefix}{cache_name}:{key}")
+        if raw is None:
+            return False, None, ()
+        entry = json.loads(raw)
+        return True, entry["value"], tuple(entry["tags"])
+
+    def set(self, cache_name: str, key: str, value: Any, tags: tuple, ttl: float) -> None:
+        try:
+            raw = json.dumps({"value": value, "tags": list(tags)})
+        except (TypeError, ValueError):
+            return
+        full_key = f"{self.prefix}{cache_name}:{key}"
+        self.client.set(full_key, raw, max(1, int(ttl)))
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            self.client.execute("SADD", tag_key, full_key)
+            self.client.execute("EXPIRE", tag_key, max(1, int(ttl)) * 2)
+
+    def invalidate_tags(self, tags: tuple) -> None:
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            keys = self.client.execute("SMEMBERS", tag_key) or []
+            self.client.delete(tag_key, *keys)
+        self.client.publish(self.channel, json.dumps({"origin": self.origin, "tags": list(tags)}))
+
+    def start(self, manager: "CacheManager") -> None:
+        """
+        Start applying other processes' invalidations to the local tiers, once per process.
+        """
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+        threading.Thread(target=self._listen, args=(manager,), name="cache-invalidation", daemon=True).start()
+
+    def _listen(self, manager: "CacheManager") -> None:
+        while True:
+            try:
+                for _, message in self.client.subscribe(self.channel):
+                    data = json.loads(message)
+                    if data["origin"] != self.origin:
+                        manager.invalidate_local(data["tags"])
+            except Exception as e:
+                logger.error("Cache invalidation listener failed: %s", e)
+            time.sleep(1)  # Resubscribe after the connection was lost
+
+
+class Cache:
+    """
+    A named cache with three tiers, checked in order:
+
+    1. A per-request memo on flask.g, so one request never loads the same value twice.
+    2. The process-level LRUCache.
+    3. The shared tier, when the manager has one.
+
+    A miss in every tier calls the loader and fills all of them. Loader
+    exceptions are not cached.
+    """
+
+    def __init__(self, manager: "CacheManager", name: str, max_size: int, ttl: float, shared: bool = True):
+        self.manager = manager
+        self.name = name
+        self.local = LRUCache(max_size, ttl)
+        self.shared = shared
+        self.stats = {"memo_hits": 0, "local_hits": 0, "shared_hits": 0, "misses": 0}
+
+    def _memo(self) -> Optional[dict]:
+        if not has_app_context():
+            return None
+        if "_cache_memo" not in g:
+            g._cache_memo = {}
+        return g._cache_memo.setdefault(self.name, {})
+
+    def _shared_tier(self) -> Optional[SharedCacheTier]:
+        return self.manager.shared if self.shared else None
+
+    def get_or_set(self, key, loader: Callable[[], Any], tags: Tags = ()) -> Any:
+        """
+        Get a cached value, loading and caching it on a miss.
+
+        Args:
+            key: Identifies the value within this cache.
+            loader (Callable): Computes the value on a miss.
+            tags: Tags to invalidate the value by, or a function of the loaded value returning them.
+
+        Returns:
+            Any: The cached or loaded value.
+        """
+        if not self.manager.enabled:
+            return loader()
+        key = str(key)
+
+        memo = self._memo()
+        if memo is not None and key in memo:
+            self.stats["memo_hits"] += 1
+            return memo[key]
+
+        found, value = self.local.get(key)
+        if found:
+            self.stats["local_hits"] += 1
+        else:
+            shared = self._shared_tier()
+            if shared is not None:
+                try:
+                    found, value, entry_tags = shared.get(self.name, key)
+                except Exception as e:
+                    logger.error("Shared cache read failed for %s: %s", self.name, e)
+            if found:
+                self.stats["shared_hits"] += 1
+                self.local.set(key, value, entry_tags)
+            else:
+                self.stats["misses"] += 1
+                value = loader()
+                entry_tags = tuple(tags(value) if callable(tags) else tags)
+                self.local.set(key, value, entry_tags)
+                if shared is not None:
+                    try:
+                        shared.set(self.name, key, value, entry_tags, self.local.ttl)
+                    except Exception as e:
+                        logger.error("Shared cache write failed for %s: %s", self.name, e)
+
+        if memo is not None:
+            memo[key] = value
+        return value
+
+    def invalidate_local(self, tags: tuple) -> int:
+        removed = self.local.invalidate_tags(tags)
+        if has_app_context() and "_cache_memo" in g:
+            # The memo is small and lives for one request, so it is simply dropped
+            g._cache_memo.pop(self.name, None)
+        return removed
+
+    def clear(self) -> None:
+        self.local.clear()
+        if has_app_context() and "_cache_memo" in g:
+            g._cache_memo.pop(self.name, None)
+
+    def get_stats(self) -> dict:
+        lookups = sum(self.stats.values())
+        hits = lookups - self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "evictions": self.local.evictions,
+            "expirations": self.local.expirations,
+            "size": len(self.local),
+            "max_size": self.local.max_size,
+            "ttl": self.local.ttl,
+        }
+
+
+class CacheManager:
+    """
+    Registry of the app's caches, and the single place they are invalidated.
+
+    Through hooks on the SQLAlchemy session, the tables and rows changed by
+    each transaction are collected and their tags invalidated once the
+    transaction commits, so cached values never outlive the data they were
+    read from. Changes made outside the session (e.g. reset_tables) must call
+    invalidate() themselves.
+    """
+
+    def __init__(self, enabled: bool = True, shared: Optional[SharedCacheTier] = None):
+        self.enabled = enabled
+        self.shared = shared
+        self.caches: dict[str, Cache] = {}
+
+    def cache(self, name: str, max_size: int = 1024, ttl: float = 60, shared: bool = True) -> Cache:
+        """
+        Get the cache with this name, creating it on first use.
+
+        Args:
+            name (str): The cache name, used in stats and shared keys.
+            max_size (int): Maximum entries kept in process.
+            ttl (float): Seconds an entry is kept.
+            shared (bool): Whether to use the shared tier, when there is one.
+
+        Returns:
+            Cache: The cache.
+        """
+        if name not in self.caches:
+            self.caches[name] = Cache(self, name, max_size, ttl, shared)
+        return self.caches[name]
+
+    def invalidate_local(self, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        for cache in self.caches.values():
+            cache.invalidate_local(tags)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """
+        Invalidate tags in every cache and tier.
+        """
+        tags = tuple(tags)
+        if not tags:
+            return
+        self.invalidate_local(tags)
+        if self.shared is not None:
+            try:
+                self.shared.invalidate_tags(tags)
+            except Exception as e:
+                logger.error("Shared cache invalidation failed: %s", e)
+
+    def clear(self) -> None:
+        for cache in self.caches.values():
+            cache.clear()
+
+    def get_stats(self) -> dict:
+        return {name: cache.get_stats() for name, cache in self.caches.items()}
+
+
+def _pending_tags(session) -> set:
+    return session.info.setdefault("_cache_tags", set())
+
+
+def _collect_flushed(session, flush_context) -> None:
+    tags = _pending_tags(session)
+    for instance in session.new:
+        tags.add(inspect(instance).mapper.local_table.name)
+    for instance in (*session.dirty, *session.deleted):
+        mapper = inspect(instance).mapper
+        table = mapper.local_table.name
+        tags.add(table)
+        tags.update(row_tags(table, mapper.primary_key_from_instance(instance)[0]))
+
+
+def _collect_statements(orm_execute_state) -> None:
+    if orm_execute_state.is_insert:
+        _pending_tags(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+    elif orm_execute_state.is_update or orm_execute_state.is_delete:
+        _pending_tags(orm_execute_state.session).update(table_tags(orm_execute_state.statement.table.name))
+
+
+def _invalidate_committed(session) -> None:
+    tags = session.info.pop("_cache_tags", None)
+    if tags:
+        for manager in list(_managers):
+            manager.invalidate(tags)
+
+
+def _discard_rolled_back(session) -> None:
+    session.info.pop("_cache_tags", None)
+
+
+def _install_session_hooks() -> None:
+    """
+    Collect the rows and tables changed through db.session, and invalidate
+    their tags in every cache manager once the transaction commits.
+    """
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        event.listen(db.session, "after_flush", _collect_flushed)
+        event.listen(db.session, "do_orm_execute", _collect_statements)
+        event.listen(db.session, "after_commit", _invalidate_committed)
+        event.listen(db.session, "after_rollback", _discard_rolled_back)
+        _hooks_installed = True
+
+
+def init_cache(app: Flask) -> CacheManager:
+    """
+    Create the cache manager configured by CACHE_ENABLED and CACHE_BACKEND.
+
+    - memory: per-request memo and process LRU only; other workers see
+      changes once their entries expire.
+    - redis: adds the shared tier at CACHE_REDIS_URL, and broadcasts
+      invalidations to every worker.
+
+    Args:
+        app (Flask): The application to configure.
+
+    Returns:
+        CacheManager: The manager to create caches from.
+
+    Raises:
+        ValueError: If CACHE_BACKEND is not a supported backend.
+    """
+    enabled = app.config.get("CACHE_ENABLED", True)
+    backend_name = app.config.get("CACHE_BACKEND", "memory")
+
+    if backend_name == "memory":
+        shared = None
+    elif backend_name == "redis":
+        shared = SharedCacheTier(app.config["CACHE_REDIS_URL"])
+    else:
+        raise ValueError(f"Invalid cache backend '{backend_name}'. Must be one of: memory, redis")
+
+    manager = CacheManager(enabled=enabled, shared=shared)
+    if enabled:
+        _managers.add(manager)
+        _install_session_hooks()
+        if shared is not None:
+            # Started per request: threads do not survive the fork from a preloading gunicorn master
+            app.before_request(lambda: shared.start(manager))
+
+    logger.info("Caching %s (%s backend)", "enabled" if enabled else "disabled", backend_name)
+    return manager
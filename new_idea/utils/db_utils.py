@@ -0,0 +1,180 @@
+import logging
+import os
+import random
+import sqlite3
+from contextlib import closing
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Engine
+
+from boxing.db import db
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def configure_sqlite(engine: Engine, busy_timeout_ms: int = 5000, wal: bool = True) -> None:
+    """
+    Set up every new SQLite connection of the engine so the web app and the
+    job workers can share the database file. Does nothing for other databases.
+
+    A busy timeout makes a connection wait for another one's write to finish
+    instead of failing with 'database is locked', and WAL mode lets reads run
+    while a job is writing.
+
+    Args:
+        engine (Engine): The engine of the database.
+        busy_timeout_ms (int): How long to wait for a lock.
+        wal (bool): Whether to switch the database to WAL mode.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+            if wal:
+                # In-memory databases keep their 'memory' journal
+                cursor.execute("PRAGMA journal_mode = WAL")
+        finally:
+            cursor.close()
+
+    logger.info("SQLite busy timeout set to %dms%s", busy_timeout_ms, ", WAL mode" if wal else "")
+
+
+def reset_tables(engine: Engine, *models) -> None:
+    """
+    Delete every row of the models' tables and restart their ID sequences, in one transaction.
+
+    Unlike dropping and recreating the tables this takes no schema locks and
+    keeps indexes and triggers in place.
+
+    Args:
+        engine (Engine): The engine of the database.
+        *models: The models whose tables to empty.
+    """
+    tables = [model.__table__ for model in models]
+    names = [table.name for table in tables]
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text(f"TRUNCATE {', '.join(names)} RESTART IDENTITY CASCADE"))
+        else:
+            for table in tables:
+                conn.execute(table.delete())
+            if engine.dialect.name == "sqlite":
+                has_sequences = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'")
+                ).first()
+                if has_sequences:
+                    for name in names:
+                        conn.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": name})
+
+    logger.info("Reset tables: %s", ", ".join(names))
+
+
+def _sqlite_connection(engine: Engine):
+    if engine.dialect.name != "sqlite":
+        raise ValueError("Database templates are only supported for SQLite")
+    return engine.raw_connection()
+
+
+def save_template(engine: Engine, path: str) -> None:
+    """
+    Copy the whole SQLite database to a template file with the backup API.
+
+    Args:
+        engine (Engine): The engine of the database to copy.
+        path (str): The template file to write.
+
+    Raises:
+        ValueError: If the database is not SQLite.
+    """
+    source = _sqlite_connection(engine)
+    try:
+        # A sqlite3 connection's own context manager only commits, it does not close
+        with closing(sqlite3.connect(path)) as template:
+            source.driver_connection.backup(template)
+    finally:
+        source.close()
+    logger.info("Saved database template to %s", path)
+
+
+def restore_template(engine: Engine, path: str) -> None:
+    """
+    Replace the contents of the SQLite database with a template saved by save_template.
+
+    Args:
+        engine (Engine): The engine of the database to overwrite.
+        path (str): The template file to restore.
+
+    Raises:
+        ValueError: If the database is not SQLite or the template does not exist.
+    """
+    if not os.path.exists(path):
+        raise ValueError(f"Database template {path} not found")
+
+    target = _sqlite_connection(engine)
+    try:
+        with closing(sqlite3.connect(path)) as template:
+            template.backup(target.driver_connection)
+    finally:
+        target.close()
+    logger.info("Restored database from template %s", path)
+
+
+def load_fixtures(n_boxers: int = 1000, n_users: int = 100, password: str = "password", seed: int = 0) -> None:
+    """
+    Seed the database with generated boxers and users in bulk.
+
+    Boxers are named 'Boxer <n>' and users 'user<n>'. All users share the given
+    password, and its salted hash is computed only once.
+
+    Args:
+        n_boxers (int): The number of boxers to create.
+        n_users (int): The number of users to create.
+        password (str): The password of every fixture user.
+        seed (int): Seed for the generated boxer attributes.
+
+    Raises:
+        ValueError: If a count is negative.
+    """
+    from boxing.models.boxers_model import Boxers
+    from boxing.models.user_model import Users
+
+    if n_boxers < 0 or n_users < 0:
+        raise ValueError("Fixture counts cannot be negative")
+
+    rng = random.Random(seed)
+    boxers = [
+        {
+            "name": f"Boxer {i}",
+            "weight": rng.randint(125, 250),
+            "height": rng.randint(60, 84),
+            "reach": rng.randint(60, 86),
+            "age": rng.randint(18, 40),
+        }
+        for i in range(1, n_boxers + 1)
+    ]
+    salt, hashed_password = Users._generate_hashed_password(password)
+    users = [
+        {"username": f"user{i}", "salt": salt, "password": hashed_password}
+        for i in range(1, n_users + 1)
+    ]
+
+    try:
+        if boxers:
+            db.session.execute(insert(Boxers.__table__), boxers)
+        if users:
+            db.session.execute(insert(Users.__table__), users)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Database error while loading fixtures: %s", str(e))
+        raise
+
+    logger.info("Loaded fixtures: %d boxers, %d users", n_boxers, n_users)
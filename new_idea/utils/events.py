@@ -0,0 +1,231 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Iterator, Optional
+
+from flask import Flask
+
+from boxing.utils.logger import configure_logger
+from boxing.utils.redis_client import RedisClient
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Sent when a client's Last-Event-ID is no longer buffered: it missed events and must refetch
+RESET_EVENT = "reset"
+
+
+class RedisEventBridge:
+    """
+    Fans events out to every worker process through Redis PUBLISH/SUBSCRIBE.
+
+    Event IDs come from a shared counter, incremented and published in one
+    server-side script, so every worker sees the same IDs in the same order
+    and a client can resume with Last-Event-ID on any worker.
+    """
+
+    SCRIPT = """
+local id = redis.call('INCR', KEYS[1])
+redis.call('PUBLISH', ARGV[1], id .. '\\n' .. ARGV[2])
+return id
+"""
+
+    def __init__(self, url: str, channel: str = "boxing:events"):
+        self.client = RedisClient(url)
+        self.channel = channel
+        self._listener_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def publish(self, event_type: str, payload: str) -> int:
+        message = json.dumps({"event": event_type, "data": payload})
+        return self.client.execute("EVAL", self.SCRIPT, 1, f"{self.channel}:seq", self.channel, message)
+
+    def start(self, broker: "EventBroker") -> None:
+        """
+        Start delivering bridged events to the broker, once per process.
+
+        The listener thread is started lazily because threads do not survive
+        the fork from a preloading gunicorn master.
+        """
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+        threading.Thread(target=self._listen, args=(broker,), name="event-bridge", daemon=True).start()
+
+    def _listen(self, broker: "EventBroker") -> None:
+        while True:
+            try:
+                for _, message in self.client.subscribe(self.channel):
+                    event_id, body = message.split(b"\n", 1)
+                    event = json.loads(body)
+                    broker.deliver(int(event_id), event["event"], event["data"])
+            except Exception as e:
+                logger.error("Event bridge listener failed: %s", e)
+            time.sleep(1)  # Resubscribe after the connection was lost
+
+
+class EventBroker:
+    """
+    In-process publish/subscribe for server-sent events.
+
+    Published events go into a bounded ring buffer and wake every waiting
+    subscriber through one Condition. Subscribers keep no per-connection
+    queue, only the ID of the last event they sent, so an idle subscriber
+    costs a blocked generator. Under the default gevent worker that is a
+    greenlet rather than a thread, which lets one process hold thousands.
+
+    With a bridge, publishing goes through Redis and every worker's broker
+    (including this one) receives the event from the subscription.
+    """
+
+    def __init__(self, buffer_size: int = 1000, max_subscribers: int = 1000,
+                 keepalive_seconds: int = 15, bridge: Optional[RedisEventBridge] = None):
+        self.max_subscribers = max_subscribers
+        self.keepalive_seconds = keepalive_seconds
+        self.bridge = bridge
+        self._events: deque = deque(maxlen=buffer_size)
+        self._last_id = 0
+        self._subscribers = 0
+        self._condition = threading.Condition()
+
+    def publish(self, event_type: str, data) -> None:
+        """
+        Publish an event to every subscriber.
+
+        Publishing never fails the caller: events are notifications, and
+        clients recover missed ones from the regular routes.
+
+        Args:
+            event_type (str): The SSE event name, e.g. 'fight'.
+            data: JSON-serializable event payload.
+        """
+        payload = json.dumps(data)
+        if self.bridge is None:
+            with self._condition:
+                self._deliver(self._last_id + 1, event_type, payload)
+            return
+        try:
+            self.bridge.start(self)
+            self.bridge.publish(event_type, payload)
+        except Exception as e:
+            logger.error("Failed to publish %s event: %s", event_type, e)
+
+    def deliver(self, event_id: int, event_type: str, payload: str) -> None:
+        """
+        Add an event received from the bridge.
+        """
+        with self._condition:
+            if event_id <= self._last_id:
+                return  # Already delivered; IDs must keep increasing for Last-Event-ID to work
+            self._deliver(event_id, event_type, payload)
+
+    def _deliver(self, event_id: int, event_type: str, payload: str) -> None:
+        self._events.append((event_id, event_type, payload))
+        self._last_id = event_id
+        self._condition.notify_all()
+
+    def _events_after(self, last_id: int) -> list[tuple[int, str, str]]:
+        # Newest events are on the right and subscribers are usually a few behind
+        pending = []
+        for event in reversed(self._events):
+            if event[0] <= last_id:
+                break
+            pending.append(event)
+        pending.reverse()
+        return pending
+
+    def open_stream(self, last_event_id: Optional[int] = None,
+                    event_types: Optional[set] = None) -> Optional[Iterator[str]]:
+        """
+        Open a stream of SSE-formatted events.
+
+        Args:
+            last_event_id (int, optional): Resume after this event, as sent by
+                the browser in the Last-Event-ID header. New subscribers only
+                get events published from now on.
+            event_types (set, optional): Only send these event types.
+
+        Returns:
+            Iterator[str]: The stream, or None if the subscriber limit is reached.
+        """
+        if self._subscribers >= self.max_subscribers:
+            return None
+        if self.bridge is not None:
+            self.bridge.start(self)
+        return self._stream(self._last_id if last_event_id is None else last_event_id, event_types)
+
+    def _stream(self, last_id: int, event_types: Optional[set]) -> Iterator[str]:
+        # Counted here rather than in open_stream: a generator that is never started never runs its finally
+        with self._condition:
+            self._subscribers += 1
+            if last_id > self._last_id:
+                missed, last_id = True, self._last_id  # ID from before a restart
+            else:
+                missed = bool(self._events) and last_id < self._events[0][0] - 1
+        try:
+            yield "retry: 3000\n\n"
+            if missed:
+                yield f"event: {RESET_EVENT}\ndata: {{}}\n\n"
+
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._last_id > last_id, timeout=self.keepalive_seconds)
+                    pending = self._events_after(last_id)
+                if not pending:
+                    yield ": keepalive\n\n"
+                    continue
+                last_id = pending[-1][0]
+                chunk = "".join(
+                    f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+                    for event_id, event_type, payload in pending
+                    if event_types is None or event_type in event_types
+                )
+                # Still send the ID of filtered events so a reconnect resumes past them
+                yield chunk or f"id: {last_id}\n\n"
+        finally:
+            with self._condition:
+                self._subscribers -= 1
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._subscribers
+
+
+def init_events(app: Flask) -> EventBroker:
+    """
+    Create the event broker configured by EVENTS_BACKEND.
+
+    - memory: events reach subscribers connected to the same worker process.
+    - redis: events are bridged through EVENTS_REDIS_URL to every worker.
+
+    Args:
+        app (Flask): The application to configure.
+
+    Returns:
+        EventBroker: The broker to publish to and stream from.
+
+    Raises:
+        ValueError: If EVENTS_BACKEND is not a supported backend.
+    """
+    backend_name = app.config.get("EVENTS_BACKEND", "memory")
+
+    if backend_name == "memory":
+        bridge = None
+    elif backend_name == "redis":
+        bridge = RedisEventBridge(app.config["EVENTS_REDIS_URL"])
+    else:
+        raise ValueError(f"Invalid events backend '{backend_name}'. Must be one of: memory, redis")
+
+    logger.info("Event stream using %s backend", backend_name)
+    return EventBroker(
+        buffer_size=app.config.get("EVENTS_BUFFER_SIZE", 1000),
+        max_subscribers=app.config.get("EVENTS_MAX_SUBSCRIBERS", 1000),
+        keepalive_seconds=app.config.get("EVENTS_KEEPALIVE_SECONDS", 15),
+        bridge=bridge,
+    )
@@ -0,0 +1,99 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+
+def get_fighting_skill(weight: float, name: str, reach: float, age: int) -> float:
+    """
+    Calculate a boxer's fighting skill, using the same formula as RingModel.
+
+    Args:
+        weight (float): The boxer's weight.
+        name (str): The boxer's name.
+        reach (float): The boxer's reach in inches.
+        age (int): The boxer's age.
+
+    Returns:
+        float: The fighting skill.
+    """
+    age_modifier = -1 if age < 25 else (-2 if age > 35 else 0)
+    return (weight * len(name)) + (reach / 10) + age_modifier
+
+
+def win_probability(skill_1, skill_2):
+    """
+    Probability that the first boxer wins, as decided by RingModel.fight():
+    boxer 1 wins when a uniform draw falls below the logistic of the skill gap.
+    Works on floats and NumPy arrays.
+
+    Returns:
+        The probability that boxer 1 wins.
+    """
+    delta = abs(skill_1 - skill_2)
+    if isinstance(delta, np.ndarray):
+        return 1.0 / (1.0 + np.exp(-delta))
+    return 1.0 / (1.0 + math.exp(-delta))
+
+
+def simulate_bouts(seed: int, skills_1: np.ndarray, skills_2: np.ndarray) -> np.ndarray:
+    """
+    Simulate a batch of fights with a local, seedable random generator.
+
+    Module-level so it can be sent to worker processes.
+
+    Args:
+        seed (int): Seed of the random generator; the same seed gives the same results.
+        skills_1 (np.ndarray): Fighting skills of the first boxers.
+        skills_2 (np.ndarray): Fighting skills of the second boxers.
+
+    Returns:
+        np.ndarray: True where the first boxer won.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.random(len(skills_1)) < win_probability(skills_1, skills_2)
+
+
+# Trials drawn per batch, bounding memory for large simulations
+TRIALS_CHUNK = 1 << 20
+
+
+def simulate_win_count(seed: Optional[int], skill_1: float, skill_2: float, trials: int) -> int:
+    """
+    Simulate repeated fights between two boxers with a local random generator.
+
+    Args:
+        seed (int, optional): Seed of the random generator; fresh entropy when omitted.
+        skill_1 (float): Fighting skill of the first boxer.
+        skill_2 (float): Fighting skill of the second boxer.
+        trials (int): The number of fights to simulate.
+
+    Returns:
+        int: How many fights the first boxer won.
+    """
+    rng = np.random.default_rng(seed)
+    probability = win_probability(skill_1, skill_2)
+    wins = 0
+    for start in range(0, trials, TRIALS_CHUNK):
+        wins += int(np.count_nonzero(rng.random(min(TRIALS_CHUNK, trials - start)) < probability))
+    return wins
+
+
+def wilson_interval(wins: int, trials: int, z: float = 1.96) -> tuple[float, float]:
+    """
+    Wilson score confidence interval of a win rate, which unlike the normal
+    approximation stays within [0, 1] when the rate is close to 0 or 1.
+
+    Args:
+        wins (int): The number of wins.
+        trials (int): The number of trials.
+        z (float): Standard normal quantile; 1.96 for 95% confidence.
+
+    Returns:
+        tuple: The lower and upper bounds.
+    """
+    rate = wins / trials
+    denominator = 1 + z * z / trials
+    centre = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Optional
+
+from flask import Flask, Response, jsonify, make_response, request
+from flask_login import current_user
+
+from boxing.utils.logger import configure_logger
+from boxing.utils.redis_client import RedisClient
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+# Placeholder stored while the first request with a key is still running
+IN_PROGRESS = "in_progress"
+
+
+class MemoryIdempotencyStore:
+    """
+    Idempotency records kept in process memory. Records expire after the TTL,
+    and the number of keys is bounded, dropping the oldest record first.
+
+    Only requests reaching the same worker process are deduplicated, which is
+    why gunicorn.conf.py refuses to start several workers with this backend.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self._records: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_keys = max_keys
+
+    def _get_live(self, key: str, now: float) -> Optional[str]:
+        record = self._records.get(key)
+        if record is None:
+            return None
+        expires_at, value = record
+        if expires_at <= now:
+            del self._records[key]
+            return None
+        return value
+
+    def claim(self, key: str, value: str, ttl: int) -> Optional[str]:
+        """
+        Store the value unless the key already has a live record.
+
+        Returns:
+            str: The existing record, or None if the key was claimed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            existing = self._get_live(key, now)
+            if existing is not None:
+                return existing
+            self._records[key] = (now + ttl, value)
+            while len(self._records) > self.max_keys:
+                self._records.popitem(last=False)
+        return None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._records[key] = (time.monotonic() + ttl, value)
+            self._records.move_to_end(key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._records.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+class RedisIdempotencyStore:
+    """
+    Idempotency records shared by every worker through a Redis-protocol server.
+    Claims use SET NX, so only one worker can run a request for a given key.
+    """
+
+    def __init__(self, url: str, prefix: str = "idempotency:"):
+        self.client = RedisClient(url)
+        self.prefix = prefix
+
+    def claim(self, key: str, value: str, ttl: int) -> Optional[str]:
+        if self.client.execute("SET", self.prefix + key, value, "NX", "EX", int(ttl)) is not None:
+            return None
+        existing = self.client.get(self.prefix + key)
+        # The record may have expired in between, in which case the caller just retries later
+        return existing.decode() if existing is not None else IN_PROGRESS
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self.client.set(self.prefix + key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        self.client.delete_prefix(self.prefix)
+
+
+def _error(message: str, status: int) -> Response:
+    return make_response(jsonify({
+        "status": "error",
+        "message": message
+    }), status)
+
+
+class IdempotencyManager:
+    """
+    Makes routes safe to retry with an 'Idempotency-Key' header.
+
+    The first request with a key runs normally and its response is stored for
+    ttl seconds. Replays with the same key get the stored response, marked with
+    an 'Idempotent-Replayed' header, without running the route again. Keys are
+    scoped per user (or client IP when logged out) and per route.
+
+    While the first request runs, its key is only held for lease_seconds, so a
+    worker killed mid-request blocks retries for about a request timeout
+    rather than for the whole TTL.
+
+    - A replay sent while the first request is still running gets a 409.
+    - Reusing a key with a different request body gets a 422.
+    - 5xx and 429 responses are not stored, so the client can retry them.
+    - Requests without the header are not affected.
+    """
+
+    def __init__(self, store=None, ttl: int = 86400, lease_seconds: int = 30, enabled: bool = True):
+        self.store = store or MemoryIdempotencyStore()
+        self.ttl = ttl
+        self.lease_seconds = min(lease_seconds, ttl)
+        self.enabled = enabled
+
+    def clear(self) -> None:
+        """
+        Forget every stored response, e.g. after the data they describe was reset.
+        """
+        self.store.clear()
+
+    @staticmethod
+    def _record_key(func_name: str, idempotency_key: str) -> str:
+        if current_user.is_authenticated:
+            owner = f"user:{current_user.get_id()}"
+        else:
+            owner = f"ip:{request.remote_addr}"
+        return f"{func_name}:{owner}:{idempotency_key}"
+
+    @staticmethod
+    def _fingerprint() -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{request.method} {request.full_path}\n".encode())
+        digest.update(request.get_data())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _replay(record: dict) -> Response:
+        response = Response(record["body"], status=record["status"], mimetype=record["mimetype"])
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
+
+    def __call__(self, func: Callable) -> Callable:
+        if not self.enabled:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not idempotency_key:
+                return func(*args, **kwargs)
+            if len(idempotency_key) > MAX_KEY_LENGTH:
+                return _error(f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters", 400)
+
+            key = self._record_key(func.__name__, idempotency_key)
+            fingerprint = self._fingerprint()
+            pending = json.dumps({"state": IN_PROGRESS, "fingerprint": fingerprint})
+
+            try:
+                existing = self.store.claim(key, pending, self.lease_seconds)
+            except Exception as e:
+                # Fail open: without the store the route behaves as if no key was sent
+                logger.error("Idempotency store failed, running request without it: %s", e)
+                return func(*args, **kwargs)
+
+            if existing is not None:
+                record = json.loads(existing) if existing != IN_PROGRESS else {"state": IN_PROGRESS}
+                if record.get("fingerprint", fingerprint) != fingerprint:
+                    logger.warning("Idempotency key reused with a different request for %s", key)
+                    return _error(f"{IDEMPOTENCY_HEADER} was already used for a different request", 422)
+                if record["state"] == IN_PROGRESS:
+                    response = _error("A request with this idempotency key is still in progress", 409)
+                    response.headers["Retry-After"] = "1"
+                    return response
+                logger.info("Replaying stored response for %s", key)
+                return self._replay(record)
+
+            try:
+                response = make_response(func(*args, **kwargs))
+            except Exception:
+                self.store.delete(key)
+                raise
+
+            try:
+                if response.status_code >= 500 or response.status_code == 429 or response.is_streamed:
+                    self.store.delete(key)
+                else:
+                    self.store.set(key, json.dumps({
+                        "state": "done",
+                        "fingerprint": fingerprint,
+                        "status": response.status_code,
+                        "mimetype": response.mimetype,
+                        "body": response.get_data(as_text=True),
+                    }), self.ttl)
+            except Exception as e:
+                logger.error("Failed to store idempotent response for %s: %s", key, e)
+            return response
+
+        return wrapper
+
+
+def init_idempotency(app: Flask) -> IdempotencyManager:
+    """
+    Create the idempotency manager configured by IDEMPOTENCY_ENABLED and IDEMPOTENCY_BACKEND.
+
+    Args:
+        app (Flask): The application to configure.
+
+    Returns:
+        IdempotencyManager: The manager to decorate routes with.
+
+    Raises:
+        ValueError: If IDEMPOTENCY_BACKEND is not a supported backend.
+    """
+    enabled = app.config.get("IDEMPOTENCY_ENABLED", True)
+    backend_name = app.config.get("IDEMPOTENCY_BACKEND", "memory")
+    ttl = app.config.get("IDEMPOTENCY_TTL_SECONDS", 86400)
+    lease_seconds = app.config.get("IDEMPOTENCY_LEASE_SECONDS", 30)
+
+    if backend_name == "memory":
+        store = MemoryIdempotencyStore(app.config.get("IDEMPOTENCY_MAX_KEYS", 10000))
+    elif backend_name == "redis":
+        store = RedisIdempotencyStore(app.config["IDEMPOTENCY_REDIS_URL"])
+    else:
+        raise ValueError(f"Invalid idempotency backend '{backend_name}'. Must be one of: memory, redis")
+
+    logger.info("Idempotency keys %s (%s backend, %ds TTL, %ds lease)",
+                "enabled" if enabled else "disabled", backend_name, ttl, lease_seconds)
+    return IdempotencyManager(store, ttl=ttl, lease_seconds=lease_seconds, enabled=enabled)
@@ -0,0 +1,152 @@
+import cProfile
+import heapq
+import io
+import logging
+import pstats
+import random
+import time
+
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import event
+
+from boxing.db import db
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+PROFILE_HEADER = "X-Profile"
+
+
+def _sql_summary(stats: dict) -> str:
+    slowest = "; ".join(
+        f"{elapsed * 1000:.1f}ms {' '.join(statement.split())[:200]}"
+        for elapsed, _, statement in sorted(stats["slowest"], reverse=True)
+    )
+    return f"{stats['count']} queries, {stats['total'] * 1000:.1f}ms total. Slowest: {slowest or 'none'}"
+
+
+def _install_sql_tracing(app: Flask, slowest_n: int) -> None:
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        if not has_request_context():
+            return
+        stats = g.get("_sql_stats")
+        if stats is None:
+            return
+        stats["count"] += 1
+        stats["total"] += elapsed
+        # Bounded min-heap keeps only the N slowest statements; the counter breaks ties
+        entry = (elapsed, stats["count"], statement)
+        if len(stats["slowest"]) < slowest_n:
+            heapq.heappush(stats["slowest"], entry)
+        else:
+            heapq.heappushpop(stats["slowest"], entry)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # after_cursor_execute does not run for a failed statement; drop its start time here
+        if context.connection is not None and context.execution_context is not None and not context.is_pre_ping:
+            starts = context.connection.info.get("query_start")
+            if starts:
+                starts.pop()
+
+
+def init_profiling(app: Flask) -> None:
+    """
+    Install the profiling hooks enabled in the config.
+
+    - PROFILE_ALL_REQUESTS: cProfile every request and log the top functions.
+    - PROFILE_HEADER_ENABLED: cProfile requests sent with an 'X-Profile' header
+      matching PROFILE_HEADER_TOKEN, which is then required.
+    - SQL_TRACE_ENABLED: log the query count, total SQL time and the
+      SQL_TRACE_SLOWEST_N slowest statements of every request.
+    - SLOW_REQUEST_MS: log requests slower than this, sampled at SLOW_REQUEST_SAMPLE_RATE.
+
+    Hooks are only registered for enabled features, so with everything off
+    requests run exactly as if this module did not exist.
+
+    Args:
+        app (Flask): The application to instrument.
+
+    Raises:
+        ValueError: If PROFILE_HEADER_ENABLED is set without a PROFILE_HEADER_TOKEN.
+    """
+    profile_all = app.config.get("PROFILE_ALL_REQUESTS", False)
+    profile_header = app.config.get("PROFILE_HEADER_ENABLED", False)
+    profile_token = app.config.get("PROFILE_HEADER_TOKEN")
+    sql_trace = app.config.get("SQL_TRACE_ENABLED", False)
+    slowest_n = app.config.get("SQL_TRACE_SLOWEST_N", 5)
+    slow_ms = app.config.get("SLOW_REQUEST_MS", 0)
+    sample_rate = app.config.get("SLOW_REQUEST_SAMPLE_RATE", 1.0)
+
+    if not (profile_all or profile_header or sql_trace or slow_ms):
+        return
+    if profile_header and not profile_token:
+        # Anyone could otherwise make the server profile their requests
+        raise ValueError("PROFILE_HEADER_TOKEN must be set when PROFILE_HEADER_ENABLED is true")
+
+    if sql_trace:
+        _install_sql_tracing(app, slowest_n)
+
+    def wants_profile() -> bool:
+        if profile_all:
+            return True
+        if not profile_header:
+            return False
+        return request.headers.get(PROFILE_HEADER) == profile_token
+
+    @app.before_request
+    def start_profiling():
+        g._request_start = time.perf_counter()
+        if sql_trace:
+            g._sql_stats = {"count": 0, "total": 0.0, "slowest": []}
+        if wants_profile():
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another request on this process is already being profiled
+                logger.warning("Profiler busy, not profiling %s %s", request.method, request.path)
+                return
+            g._profiler = profiler
+
+    @app.after_request
+    def stop_profiling(response):
+        start = g.pop("_request_start", None)
+        if start is None:
+            return response
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        label = f"{request.method} {request.path} -> {response.status_code} in {elapsed_ms:.1f}ms"
+
+        profiler = g.pop("_profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(30)
+            logger.info("Profile for %s\n%s", label, output.getvalue())
+            response.headers["X-Profile-Time-ms"] = f"{elapsed_ms:.1f}"
+
+        stats = g.pop("_sql_stats", None)
+        if stats is not None:
+            logger.info("SQL for %s: %s", label, _sql_summary(stats))
+            response.headers["X-SQL-Queries"] = str(stats["count"])
+            response.headers["X-SQL-Time-ms"] = f"{stats['total'] * 1000:.1f}"
+
+        if slow_ms and elapsed_ms > slow_ms and random.random() < sample_rate:
+            logger.warning("Slow request: %s", label)
+
+        return response
+
+    logger.info("Profiling hooks enabled (profile all: %s, header: %s, SQL trace: %s, slow request ms: %s)",
+                profile_all, profile_header, sql_trace, slow_ms)
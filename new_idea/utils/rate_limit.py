@@ -0,0 +1,246 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable
+
+from flask import Flask, jsonify, make_response, request
+from flask_login import current_user
+
+from boxing.utils.logger import configure_logger
+from boxing.utils.redis_client import RedisClient
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(spec: str) -> tuple[float, int]:
+    """
+    Parse a rate such as '30/minute' into a refill rate and a burst size.
+
+    Args:
+        spec (str): The number of requests allowed per period.
+
+    Returns:
+        tuple: Tokens added per second and the bucket capacity.
+
+    Raises:
+        ValueError: If the spec is malformed.
+    """
+    try:
+        count, period = spec.split("/")
+        count = int(count)
+        seconds = PERIODS[period.strip().lower()]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit '{spec}'. Expected e.g. '30/minute'")
+    if count <= 0:
+        raise ValueError(f"Invalid rate limit '{spec}'. Count must be positive")
+    return count / seconds, count
+
+
+def _refill(tokens: float, updated_at: float, now: float, rate: float, capacity: int) -> float:
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+class MemoryBucketBackend:
+    """
+    Token buckets kept in process memory. The number of tracked keys is bounded,
+    and the least recently used bucket is dropped (i.e. refilled) first.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_keys = max_keys
+
+    def consume(self, key: str, rate: float, capacity: int, cost: int = 1) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = _refill(tokens, updated_at, now, rate, capacity)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+
+class RedisBucketBackend:
+    """
+    Token buckets shared by every worker through a Redis-protocol server.
+    The refill and take happen in one server-side script, so workers cannot race.
+    """
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        self.client = RedisClient(url)
+        self.prefix = prefix
+
+    def consume(self, key: str, rate: float, capacity: int, cost: int = 1) -> tuple[bool, float]:
+        allowed, tokens = self.client.execute(
+            "EVAL", self.SCRIPT, 1, self.prefix + key, capacity, rate, time.time(), cost
+        )
+        return bool(allowed), float(tokens)
+
+
+class RateLimiter:
+    """
+    Applies token-bucket limits to routes by decorator.
+
+    Scopes:
+        - 'user': per logged in user (falls back to the client IP).
+        - 'ip': per client IP.
+        - 'global': one bucket shared by every caller.
+    """
+
+    def __init__(self, backend=None, enabled: bool = True):
+        self.backend = backend or MemoryBucketBackend()
+        self.enabled = enabled
+
+    @staticmethod
+    def _scope_key(scope: str) -> str:
+        if scope == "global":
+            return "global"
+        if scope == "user" and current_user.is_authenticated:
+            return f"user:{current_user.get_id()}"
+        return f"ip:{request.remote_addr}"
+
+    def limit(self, scope: str, spec: str) -> Callable:
+        """
+        Decorator limiting a route to the given rate within a scope.
+
+        Args:
+            scope (str): One of 'user', 'ip' or 'global'.
+            spec (str): The allowed rate, e.g. '30/minute'.
+
+        Returns:
+            Callable: The decorator.
+
+        Raises:
+            ValueError: If the scope or rate is invalid.
+        """
+        if scope not in ("user", "ip", "global"):
+            raise ValueError(f"Invalid rate limit scope '{scope}'. Must be one of: user, ip, global")
+        rate, capacity = parse_rate(spec)
+
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key = f"{func.__name__}:{self._scope_key(scope)}"
+                try:
+                    allowed, tokens = self.backend.consume(key, rate, capacity)
+                except Exception as e:
+                    # Fail open: an unavailable limiter must not take the API down with it
+                    logger.error("Rate limiter backend failed, allowing request: %s", e)
+                    return func(*args, **kwargs)
+
+                if not allowed:
+                    retry_after = max(1, math.ceil((1 - tokens) / rate))
+                    logger.warning("Rate limit exceeded for %s (%s)", key, spec)
+                    response = make_response(jsonify({
+                        "status": "error",
+                        "message": f"Rate limit exceeded ({spec}). Try again in {retry_after} seconds"
+                    }), 429)
+                    response.headers["Retry-After"] = str(retry_after)
+                    return response
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+class ConcurrencyGate:
+    """
+    Bounds how many requests can run a route at once. Callers that cannot get
+    a slot within the timeout are turned away with a 503 instead of queueing.
+
+    The count is per worker process, and a worker can never run more requests
+    at once than it has threads (or greenlets), so the limit only has an
+    effect when it is below that.
+    """
+
+    def __init__(self, limit: int, timeout: float = 0.0, retry_after: int = 1):
+        self.limit = limit
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    def __call__(self, func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if self.timeout:
+                acquired = self._semaphore.acquire(timeout=self.timeout)
+            else:
+                acquired = self._semaphore.acquire(blocking=False)
+
+            if not acquired:
+                logger.warning("Concurrency limit of %d reached for %s", self.limit, func.__name__)
+                response = make_response(jsonify({
+                    "status": "error",
+                    "message": "Server is busy. Try again shortly"
+                }), 503)
+                response.headers["Retry-After"] = str(self.retry_after)
+                return response
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._semaphore.release()
+
+        return wrapper
+
+
+def init_rate_limiter(app: Flask) -> RateLimiter:
+    """
+    Create the rate limiter configured by RATE_LIMIT_ENABLED and RATE_LIMIT_BACKEND.
+
+    Args:
+        app (Flask): The application to configure.
+
+    Returns:
+        RateLimiter: The limiter to decorate routes with.
+
+    Raises:
+        ValueError: If RATE_LIMIT_BACKEND is not a supported backend.
+    """
+    enabled = app.config.get("RATE_LIMIT_ENABLED", True)
+    backend_name = app.config.get("RATE_LIMIT_BACKEND", "memory")
+
+    if backend_name == "memory":
+        backend = MemoryBucketBackend()
+    elif backend_name == "redis":
+        backend = RedisBucketBackend(app.config["RATE_LIMIT_REDIS_URL"])
+    else:
+        raise ValueError(f"Invalid rate limit backend '{backend_name}'. Must be one of: memory, redis")
+
+    logger.info("Rate limiting %s (%s backend)", "enabled" if enabled else "disabled", backend_name)
+    return RateLimiter(backend, enabled=enabled)
@@ -0,0 +1,173 @@
+import logging
+import socket
+import threading
+from typing import Any, Iterator, Optional
+from urllib.parse import urlparse
+
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class RedisClient:
+    """
+    Minimal client for servers speaking the Redis protocol (RESP2).
+
+    Only what the app needs is implemented: sending a command and reading its
+    reply. Each thread gets its own connection, which is reopened once if the
+    server dropped it.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> tuple[socket.socket, Any]:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        reader = sock.makefile("rb")
+        self._local.sock, self._local.reader = sock, reader
+        if self.password:
+            self._send(sock, reader, ("AUTH", self.password))
+        if self.db:
+            self._send(sock, reader, ("SELECT", self.db))
+        return sock, reader
+
+    def _close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = self._local.reader = None
+
+    @staticmethod
+    def _encode(args: tuple) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    @classmethod
+    def _read_reply(cls, reader) -> Any:
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RuntimeError(f"Redis error: {payload.decode()}")
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [cls._read_reply(reader) for _ in range(length)]
+        raise RuntimeError(f"Unexpected reply from Redis: {line!r}")
+
+    def _send(self, sock: socket.socket, reader, args: tuple) -> Any:
+        sock.sendall(self._encode(args))
+        return self._read_reply(reader)
+
+    def execute(self, *args) -> Any:
+        """
+        Send a command and return its decoded reply.
+
+        Args:
+            *args: The command name followed by its arguments.
+
+        Returns:
+            Any: The reply (str, int, bytes, list or None).
+
+        Raises:
+            RuntimeError: If the server returns an error or cannot be reached.
+        """
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None)
+            try:
+                if sock is None:
+                    sock, reader = self._connect()
+                else:
+                    reader = self._local.reader
+                return self._send(sock, reader, args)
+            except (ConnectionError, socket.timeout, OSError) as e:
+                self._close()
+                if attempt:
+                    logger.error("Redis command %s failed: %s", args[0], e)
+                    raise RuntimeError(f"Redis command {args[0]} failed: {e}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.execute("GET", key)
+
+    def set(self, key: str, value, ttl: Optional[int] = None) -> None:
+        if ttl:
+            self.execute("SET", key, value, "EX", int(ttl))
+        else:
+            self.execute("SET", key, value)
+
+    def delete(self, *keys: str) -> int:
+        return self.execute("DEL", *keys) if keys else 0
+
+    def delete_prefix(self, prefix: str) -> int:
+        """
+        Delete every key starting with the prefix, using SCAN so the server is never blocked.
+
+        Returns:
+            int: The number of keys deleted.
+        """
+        cursor, deleted = b"0", 0
+        while True:
+            cursor, keys = self.execute("SCAN", cursor, "MATCH", f"{prefix}*", "COUNT", 1000)
+            deleted += self.delete(*keys)
+            if cursor in (b"0", 0):
+                return deleted
+
+    def publish(self, channel: str, message) -> int:
+        return self.execute("PUBLISH", channel, message)
+
+    def subscribe(self, *channels: str) -> Iterator[tuple[str, bytes]]:
+        """
+        Subscribe to channels and yield (channel, message) pairs as they arrive.
+
+        Uses a dedicated connection without a read timeout, since a subscribed
+        connection cannot run other commands. The generator ends if the server
+        closes the connection; callers are expected to subscribe again.
+
+        Raises:
+            RuntimeError: If the server cannot be reached.
+        """
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError as e:
+            raise RuntimeError(f"Redis subscribe failed: {e}")
+        reader = sock.makefile("rb")
+        try:
+            if self.password:
+                self._send(sock, reader, ("AUTH", self.password))
+            sock.settimeout(None)
+            sock.sendall(self._encode(("SUBSCRIBE",) + channels))
+            while True:
+                reply = self._read_reply(reader)
+                if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                    yield reply[1].decode(), reply[2]
+        except (ConnectionError, OSError) as e:
+            logger.warning("Redis subscription to %s ended: %s", ", ".join(channels), e)
+        finally:
+            sock.close()
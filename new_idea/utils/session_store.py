@@ -0,0 +1,269 @@
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from flask import Flask, session
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from boxing.utils.logger import configure_logger
+from boxing.utils.redis_client import RedisClient
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class MemorySessionStore:
+    """
+    Process-local session store with TTL eviction.
+
+    Only suitable for a single worker process, since sessions are not shared.
+    """
+
+    def __init__(self, sweep_interval: int = 1000):
+        self._sessions: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._sweep_interval = sweep_interval
+        self._writes = 0
+
+    def get(self, sid: str) -> Optional[str]:
+        entry = self._sessions.get(sid)
+        if entry is None:
+            return None
+        expires, data = entry
+        if expires < time.time():
+            self.delete(sid)
+            return None
+        return data
+
+    def set(self, sid: str, data: str, ttl: int) -> None:
+        with self._lock:
+            self._sessions[sid] = (time.time() + ttl, data)
+            self._writes += 1
+            if self._writes % self._sweep_interval == 0:
+                self._evict_expired()
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        expired = [sid for sid, (expires, _) in self._sessions.items() if expires < now]
+        for sid in expired:
+            del self._sessions[sid]
+        if expired:
+            logger.debug("Evicted %d expired sessions", len(expired))
+
+
+class SQLiteSessionStore:
+    """
+    Session store backed by a SQLite file, shared by every worker on the host.
+    """
+
+    def __init__(self, path: str, sweep_interval: int = 1000):
+        self.path = path
+        self._local = threading.local()
+        self._sweep_interval = sweep_interval
+        self._writes = 0
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, sid: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT data FROM sessions WHERE sid = ? AND expires >= ?", (sid, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, sid: str, data: str, ttl: int) -> None:
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (sid, data, expires) VALUES (?, ?, ?)",
+            (sid, data, time.time() + ttl),
+        )
+        self._writes += 1
+        if self._writes % self._sweep_interval == 0:
+            conn.execute("DELETE FROM sessions WHERE expires < ?", (time.time(),))
+
+    def delete(self, sid: str) -> None:
+        self._connection().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM sessions")
+
+
+class RedisSessionStore:
+    """
+    Session store for any server speaking the Redis protocol. Expiry is left to the server.
+    """
+
+    def __init__(self, url: str, prefix: str = "session:"):
+        self.client = RedisClient(url)
+        self.prefix = prefix
+
+    def get(self, sid: str) -> Optional[str]:
+        data = self.client.get(self.prefix + sid)
+        return data.decode() if data is not None else None
+
+    def set(self, sid: str, data: str, ttl: int) -> None:
+        self.client.set(self.prefix + sid, data, ttl)
+
+    def delete(self, sid: str) -> None:
+        self.client.delete(self.prefix + sid)
+
+    def clear(self) -> None:
+        self.client.delete_prefix(self.prefix)
+
+
+def generate_sid() -> str:
+    return secrets.token_urlsafe(16)
+
+
+def regenerate_session() -> None:
+    """
+    Start a fresh session for the current request, e.g. on login, so a session
+    ID planted in the browser before login is worthless afterwards.
+
+    Clears the session; server-side sessions also get a new ID.
+    """
+    session.clear()
+    if isinstance(session, ServerSideSession):
+        session.regenerate()
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session whose contents live in a store; the cookie only carries its ID."""
+
+    def __init__(self, initial: Optional[dict] = None, sid: str = "", new: bool = False):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.previous_sid: Optional[str] = None
+
+    def regenerate(self) -> None:
+        """
+        Move the session to a new ID. The old ID is dropped from the store when
+        the session is saved.
+        """
+        if not self.new and self.previous_sid is None:
+            self.previous_sid = self.sid
+        self.sid = generate_sid()
+        self.modified = True
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Flask session interface that keeps session data in a server-side store.
+
+    Requests only look up a random session ID instead of verifying and decoding
+    a signed cookie, and deleting the stored entry revokes the session at once.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store, ttl: int):
+        self.store = store
+        self.ttl = ttl
+
+    def open_session(self, app: Flask, request) -> ServerSideSession:
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.store.get(sid)
+            if data is not None:
+                return ServerSideSession(self.serializer.loads(data), sid=sid)
+        return ServerSideSession(sid=generate_sid(), new=True)
+
+    def save_session(self, app: Flask, session: ServerSideSession, response) -> None:
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.previous_sid is not None:
+            self.store.delete(session.previous_sid)
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                       samesite=samesite, httponly=httponly)
+            return
+
+        if not session.modified:
+            return
+
+        self.store.set(session.sid, self.serializer.dumps(dict(session)), self.ttl)
+
+        response.set_cookie(
+            name,
+            session.sid,
+            max_age=self.ttl,
+            domain=domain,
+            path=path,
+            secure=secure,
+            samesite=samesite,
+            httponly=httponly,
+        )
+
+
+def init_session_store(app: Flask):
+    """
+    Install a server-side session interface according to SESSION_BACKEND.
+
+    Supported backends are 'cookie' (Flask's default signed cookies), 'memory',
+    'sqlite' and 'redis'.
+
+    Args:
+        app (Flask): The application to configure.
+
+    Returns:
+        The session store in use, or None for cookie sessions.
+
+    Raises:
+        ValueError: If SESSION_BACKEND is not a supported backend.
+    """
+    backend = app.config.get("SESSION_BACKEND", "cookie")
+    ttl = int(app.config.get("SESSION_LIFETIME_SECONDS", 86400))
+
+    if backend == "cookie":
+        return None
+    if backend == "memory":
+        store = MemorySessionStore()
+    elif backend == "sqlite":
+        store = SQLiteSessionStore(app.config["SESSION_SQLITE_PATH"])
+    elif backend == "redis":
+        store = RedisSessionStore(app.config["SESSION_REDIS_URL"])
+    else:
+        raise ValueError(f"Invalid session backend '{backend}'. Must be one of: cookie, memory, sqlite, redis")
+
+    app.session_interface = ServerSideSessionInterface(store, ttl)
+    logger.info("Using %s server-side session store", backend)
+    return store
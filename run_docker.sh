@@ -22,6 +22,12 @@ if [ ! -d "${DB_VOLUME_PATH}" ]; then
   mkdir -p ${DB_VOLUME_PATH}
 fi
 
+# Stop and remove the job worker container first, as it uses the API container's volume
+if [ "$(docker ps -q -a -f name=${IMAGE_NAME}_worker)" ]; then
+    echo "Stopping and removing container: ${IMAGE_NAME}_worker"
+    docker stop ${IMAGE_NAME}_worker && docker rm ${IMAGE_NAME}_worker
+fi
+
 # Stop and remove the running container if it exists
 if [ "$(docker ps -q -a -f name=${IMAGE_NAME}_container)" ]; then
     echo "Stopping running container: ${IMAGE_NAME}_container"
@@ -48,3 +54,14 @@ docker run -d \
   ${IMAGE_NAME}:${CONTAINER_TAG}
 
 echo "Docker container is running on port ${HOST_PORT}."
+
+# Run the background job worker, sharing the API container's database volume
+echo "Running job worker container..."
+docker run -d \
+  --name ${IMAGE_NAME}_worker \
+  --env-file .env \
+  --volumes-from ${IMAGE_NAME}_container \
+  ${IMAGE_NAME}:${CONTAINER_TAG} \
+  python worker.py
+
+echo "Job worker is running."
@@ -1,7 +1,10 @@
 #!/bin/bash
 
-# Check if the database file already exists
-if [ -f "$DB_PATH" ]; then
+# Only build the schema when the database is missing, or when explicitly asked to
+# with RECREATE_DB=true (this drops all existing data)
+if [ -f "$DB_PATH" ] && [ "$RECREATE_DB" != "true" ]; then
+    echo "Database already exists at $DB_PATH, skipping initialization."
+elif [ -f "$DB_PATH" ]; then
     echo "Recreating database at $DB_PATH."
     # Drop and recreate the tables
     sqlite3 "$DB_PATH" < /app/sql/init_db.sql
@@ -9,3 +9,25 @@ CREATE TABLE boxers (
     UNIQUE(name)
 );
 
+-- Search indexes used by GET /api/boxers (see boxing/models/search_model.py).
+-- Pages are read in (column, id) order, so every index ends with id.
+CREATE INDEX idx_boxers_weight_id ON boxers(weight, id);
+CREATE INDEX idx_boxers_age_weight_id ON boxers(age, weight, id);
+CREATE INDEX idx_boxers_reach_id ON boxers(reach, id);
+
+-- Full-text index over boxer names, kept in sync with the boxers table by triggers
+DROP TABLE IF EXISTS boxers_fts;
+CREATE VIRTUAL TABLE boxers_fts USING fts5(name, content='boxers', content_rowid='id', prefix='2 3');
+
+CREATE TRIGGER boxers_fts_ai AFTER INSERT ON boxers BEGIN
+    INSERT INTO boxers_fts(rowid, name) VALUES (new.id, new.name);
+END;
+
+CREATE TRIGGER boxers_fts_ad AFTER DELETE ON boxers BEGIN
+    INSERT INTO boxers_fts(boxers_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+
+CREATE TRIGGER boxers_fts_au AFTER UPDATE OF name ON boxers BEGIN
+    INSERT INTO boxers_fts(boxers_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO boxers_fts(rowid, name) VALUES (new.id, new.name);
+END;
@@ -0,0 +1,79 @@
+import pytest
+
+from app import create_app
+from config import TestConfig
+from resp_server import FakeRedisServer
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def logged_in_client(client):
+    client.put("/api/create-user", json={"username": "tester", "password": "secret"})
+    client.post("/api/login", json={"username": "tester", "password": "secret"})
+    return client
+
+
+@pytest.fixture
+def add_boxer(logged_in_client):
+    """Create a boxer through the API and return its ID."""
+    def add(name: str, weight: float = 150, height: float = 70, reach: float = 72.0, age: int = 28) -> int:
+        response = logged_in_client.post("/api/add-boxer", json={
+            "name": name, "weight": weight, "height": height, "reach": reach, "age": age
+        })
+        assert response.status_code == 201, response.json
+        return logged_in_client.get(f"/api/get-boxer-by-name/{name}").json["boxer"]["id"]
+    return add
+
+
+@pytest.fixture
+def redis_server():
+    server = FakeRedisServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fixed_random(monkeypatch):
+    """Decide fights with a fixed number instead of asking random.org."""
+    from boxing.models import ring_model
+    from boxing.utils import api_utils
+
+    monkeypatch.setattr(api_utils, "get_random", lambda: 0.42)
+    # RingModel imports the function by name
+    monkeypatch.setattr(ring_model, "get_random", lambda: 0.42, raising=False)
+
+
+@pytest.fixture
+def job_worker(app):
+    """A job worker without threads; run_jobs drives it from the test."""
+    from worker import JobWorker
+
+    return JobWorker(app, threads=1, poll_seconds=0, concurrency={}, timeout_seconds=300,
+                     backoff_seconds=0, retention_seconds=604800)
+
+
+@pytest.fixture
+def run_jobs(job_worker):
+    """Run queued jobs in the test thread until none is runnable, and return how many ran."""
+    from boxing.models.job_model import Jobs
+    from worker import HANDLERS
+
+    def run() -> int:
+        ran = 0
+        while (job := Jobs.claim_next("test-worker", tuple(HANDLERS), {})) is not None:
+            job_worker._run_job(job)
+            ran += 1
+        return ran
+
+    return run
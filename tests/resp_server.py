@@ -0,0 +1,237 @@
+"""
+In-process stand-in for a Redis server, speaking enough RESP2 for the app's
+Redis-backed stores. Keys live in one dict; Lua scripts cannot run here, so a
+test registers a Python function to stand in for each script it needs.
+"""
+import fnmatch
+import socketserver
+import threading
+import time
+from typing import Callable, Optional
+
+
+class RedisError(Exception):
+    pass
+
+
+class FakeRedisServer:
+
+    def __init__(self, password: Optional[str] = None):
+        self.password = password
+        self.data: dict[bytes, object] = {}
+        self.expires: dict[bytes, float] = {}
+        self.scripts: dict[bytes, Callable] = {}
+        self.commands: list[tuple] = []
+        self.selected_dbs: list[int] = []
+        self._subscribers: list[tuple[bytes, "socketserver.StreamRequestHandler"]] = []
+        self._handlers: set = set()
+        self._lock = threading.RLock()
+
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def setup(self):
+                super().setup()
+                self.write_lock = threading.Lock()
+                self.authenticated = fake.password is None
+                with fake._lock:
+                    fake._handlers.add(self)
+
+            def finish(self):
+                with fake._lock:
+                    fake._handlers.discard(self)
+                    fake._subscribers = [(c, h) for c, h in fake._subscribers if h is not self]
+                try:
+                    super().finish()
+                except OSError:
+                    pass
+
+            def send(self, payload: bytes) -> None:
+                with self.write_lock:
+                    self.wfile.write(payload)
+                    self.wfile.flush()
+
+            def handle(self):
+                while True:
+                    try:
+                        args = fake._read_command(self.rfile)
+                    except (ConnectionError, OSError, ValueError):
+                        return
+                    if args is None:
+                        return
+                    try:
+                        reply = fake._dispatch(self, args)
+                    except RedisError as e:
+                        self.send(b"-%s\r\n" % str(e).encode())
+                        continue
+                    if reply is not NO_REPLY:
+                        self.send(encode_reply(reply))
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.port}/0"
+
+    def start(self) -> "FakeRedisServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self.drop_connections()
+
+    def drop_connections(self) -> None:
+        """Close every client connection, as a restarted server would."""
+        with self._lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            try:
+                handler.connection.shutdown(2)
+            except OSError:
+                pass
+
+    def ttl(self, key: str) -> Optional[float]:
+        expires = self.expires.get(key.encode())
+        return None if expires is None else expires - time.time()
+
+    def expire_now(self, key: str) -> None:
+        """Make a key expire as if its TTL had run out."""
+        self.expires[key.encode()] = time.time() - 1
+
+    @staticmethod
+    def _read_command(rfile) -> Optional[list[bytes]]:
+        line = rfile.readline()
+        if not line:
+            return None
+        if line[:1] != b"*":
+            raise ValueError(f"Expected a command array, got {line!r}")
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(rfile.readline()[1:])
+            args.append(rfile.read(length + 2)[:-2])
+        return args
+
+    def _live(self, key: bytes):
+        expires = self.expires.get(key)
+        if expires is not None and expires <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def publish(self, channel: bytes, message: bytes) -> int:
+        with self._lock:
+            receivers = [handler for subscribed, handler in self._subscribers if subscribed == channel]
+        for handler in receivers:
+            handler.send(encode_reply([b"message", channel, message]))
+        return len(receivers)
+
+    def _dispatch(self, handler, args: list[bytes]):
+        command = args[0].upper().decode()
+        self.commands.append(tuple(args))
+
+        if command == "AUTH":
+            if args[-1].decode() != self.password:
+                raise RedisError("ERR invalid password")
+            handler.authenticated = True
+            return OK
+        if not handler.authenticated:
+            raise RedisError("NOAUTH Authentication required.")
+
+        with self._lock:
+            if command == "PING":
+                return PONG
+            if command == "SELECT":
+                self.selected_dbs.append(int(args[1]))
+                return OK
+            if command == "GET":
+                value = self._live(args[1])
+                if isinstance(value, set):
+                    raise RedisError("WRONGTYPE Operation against a key holding the wrong kind of value")
+                return value
+            if command == "SET":
+                options = [arg.upper() for arg in args[3:]]
+                if b"NX" in options and self._live(args[1]) is not None:
+                    return None
+                self.data[args[1]] = args[2]
+                self.expires.pop(args[1], None)
+                if b"EX" in options:
+                    self.expires[args[1]] = time.time() + int(args[3 + options.index(b"EX") + 1])
+                return OK
+            if command == "DEL":
+                deleted = 0
+                for key in args[1:]:
+                    if self._live(key) is not None:
+                        deleted += 1
+                    self.data.pop(key, None)
+                    self.expires.pop(key, None)
+                return deleted
+            if command == "EXPIRE":
+                if self._live(args[1]) is None:
+                    return 0
+                self.expires[args[1]] = time.time() + int(args[2])
+                return 1
+            if command == "INCR":
+                value = int(self._live(args[1]) or 0) + 1
+                self.data[args[1]] = str(value).encode()
+                return value
+            if command == "SCAN":
+                pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+                keys = [key for key in list(self.data) if self._live(key) is not None
+                        and fnmatch.fnmatchcase(key.decode(), pattern)]
+                return [b"0", keys]
+            if command == "SADD":
+                members = self.data.setdefault(args[1], set())
+                added = len(set(args[2:]) - members)
+                members.update(args[2:])
+                return added
+            if command == "SMEMBERS":
+                return sorted(self._live(args[1]) or set())
+            if command == "PUBLISH":
+                return self.publish(args[1], args[2])
+            if command == "EVAL":
+                script = self.scripts.get(args[1])
+                if script is None:
+                    raise RedisError("ERR no stand-in registered for this script")
+                key_count = int(args[2])
+                return script(self, args[3:3 + key_count], args[3 + key_count:])
+            if command == "SUBSCRIBE":
+                for index, channel in enumerate(args[1:], start=1):
+                    self._subscribers.append((channel, handler))
+                    handler.send(encode_reply([b"subscribe", channel, index]))
+                return NO_REPLY
+        raise RedisError(f"ERR unknown command '{command}'")
+
+
+class _Simple(str):
+    pass
+
+
+OK = _Simple("OK")
+PONG = _Simple("PONG")
+NO_REPLY = object()
+
+
+def encode_reply(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, _Simple):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+    raise TypeError(f"Cannot encode {value!r}")
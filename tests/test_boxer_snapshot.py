@@ -0,0 +1,69 @@
+import pickle
+
+import pytest
+
+from boxing.models.boxer_snapshot import WEIGHT_CLASSES, BoxerSnapshot
+from boxing.models.boxers_model import Boxers
+from boxing.models.rating_model import DEFAULT_RATING, Ratings
+
+
+def test_weight_class_comes_from_the_boxer_model(monkeypatch):
+    snapshot = BoxerSnapshot(1, "Ali", 150, 70, 72.0, 28, DEFAULT_RATING)
+    assert snapshot.weight_class == Boxers.get_weight_class(150)
+
+    monkeypatch.setattr(Boxers, "get_weight_class", staticmethod(lambda weight: "CRUISERWEIGHT"))
+    assert snapshot.weight_class == "CRUISERWEIGHT"
+
+
+def test_weight_classes_are_the_ones_the_model_returns():
+    assert {Boxers.get_weight_class(weight) for weight in (125, 133, 166, 203)} == set(WEIGHT_CLASSES)
+
+
+def test_snapshot_survives_pickling():
+    snapshot = BoxerSnapshot(1, "Ali", 150, 70, 72.0, 28, 1612.5)
+
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+
+
+def test_ring_shows_current_ratings(logged_in_client, add_boxer):
+    ali, frazier = add_boxer("Ali"), add_boxer("Frazier")
+    ratings = Ratings.record_fight(ali, frazier)
+    logged_in_client.post("/api/enter-ring", json={"name": "Ali"})
+    response = logged_in_client.post("/api/enter-ring", json={"name": "Frazier"})
+
+    shown = {boxer["id"]: boxer["rating"] for boxer in response.json["boxers"]}
+
+    assert shown[ali] == pytest.approx(ratings[ali]["rating"], abs=0.05)
+    assert shown[frazier] == pytest.approx(ratings[frazier]["rating"], abs=0.05)
+    assert shown[frazier] < DEFAULT_RATING < shown[ali]
+
+
+def test_unrated_boxer_has_the_starting_rating(logged_in_client, add_boxer):
+    add_boxer("Ali")
+
+    response = logged_in_client.post("/api/enter-ring", json={"name": "Ali"})
+
+    assert response.json["boxers"][0]["rating"] == DEFAULT_RATING
+
+
+def test_matchmake_rejects_unknown_weight_class(logged_in_client):
+    response = logged_in_client.post("/api/matchmake", json={"weight_class": "CRUISERWEIGHT"})
+
+    assert response.status_code == 400
+    assert "Must be one of: HEAVYWEIGHT, MIDDLEWEIGHT" in response.json["message"]
+
+
+def test_ring_routes_send_the_same_shape_as_ring_events(logged_in_client, add_boxer):
+    ali, frazier = add_boxer("Ali"), add_boxer("Frazier")
+    Ratings.record_fight(ali, frazier)
+    entered = logged_in_client.post("/api/enter-ring", json={"name": "Ali"}).json["boxers"]
+    listed = logged_in_client.get("/api/get-boxers").json["boxers"]
+    logged_in_client.post("/api/clear-boxers")
+    matched = logged_in_client.post("/api/matchmake", json={}).json["boxers"]
+
+    expected = BoxerSnapshot.from_boxer(Boxers.get_boxer_by_id(ali), Ratings.get_ratings([ali])[ali]).to_dict()
+    assert entered == listed == [expected]
+    assert expected["weight_class"] == Boxers.get_weight_class(150)
+    assert expected["rating"] == round(expected["rating"], 1) != DEFAULT_RATING
+    assert sorted(boxer["id"] for boxer in matched) == [ali, frazier]
+    assert all(set(boxer) == set(expected) for boxer in matched)
@@ -0,0 +1,81 @@
+import weakref
+
+from app import create_app
+from boxing.db import db
+from boxing.models.boxers_model import Boxers
+from boxing.models.user_model import Users
+from boxing.utils import cache
+from config import ProductionConfig, TestConfig
+
+
+def boxer_stats(client) -> dict:
+    return client.get("/api/cache-stats").json["caches"]["boxers"]
+
+
+def test_cache_stats_require_login(client):
+    response = client.get("/api/cache-stats")
+
+    assert response.status_code == 401
+
+
+def test_deleted_user_is_logged_out_on_commit():
+    # Without the app fixture's context, so each request gets its own, as in production
+    app = create_app(TestConfig)
+    client = app.test_client()
+    client.put("/api/create-user", json={"username": "tester", "password": "secret"})
+    client.post("/api/login", json={"username": "tester", "password": "secret"})
+    assert client.get("/api/cache-stats").status_code == 200  # Caches the user
+
+    with app.app_context():
+        Users.delete_user("tester")
+
+    assert client.get("/api/cache-stats").status_code == 401
+
+
+def test_boxer_change_invalidates_cached_boxer_on_commit(logged_in_client, add_boxer):
+    boxer_id = add_boxer("Ali", age=28)
+    assert logged_in_client.get(f"/api/get-boxer-by-id/{boxer_id}").json["boxer"]["age"] == 28
+
+    db.session.get(Boxers, boxer_id).age = 30
+    db.session.commit()
+
+    assert logged_in_client.get(f"/api/get-boxer-by-id/{boxer_id}").json["boxer"]["age"] == 30
+
+
+def test_rolled_back_change_keeps_cached_boxer(logged_in_client, add_boxer):
+    boxer_id = add_boxer("Ali", age=28)
+    logged_in_client.get(f"/api/get-boxer-by-id/{boxer_id}")
+    misses = boxer_stats(logged_in_client)["misses"]
+
+    db.session.get(Boxers, boxer_id).age = 30
+    db.session.flush()
+    db.session.rollback()
+
+    assert logged_in_client.get(f"/api/get-boxer-by-id/{boxer_id}").json["boxer"]["age"] == 28
+    assert boxer_stats(logged_in_client)["misses"] == misses
+
+
+def test_users_expire_quickly_without_the_redis_backend(logged_in_client):
+    users = logged_in_client.get("/api/cache-stats").json["caches"]["users"]
+
+    assert users["ttl"] == ProductionConfig.CACHE_USERS_LOCAL_TTL
+    assert users["ttl"] < ProductionConfig.CACHE_USERS_TTL
+
+
+def test_users_keep_their_ttl_with_the_redis_backend(redis_server, monkeypatch):
+    # Keeps this app's manager, and its stopped server, out of later tests' invalidations
+    monkeypatch.setattr(cache, "_managers", weakref.WeakSet())
+
+    class RedisCacheConfig(TestConfig):
+        CACHE_BACKEND = "redis"
+        CACHE_REDIS_URL = redis_server.url
+
+    app = create_app(RedisCacheConfig)
+    with app.app_context():
+        client = app.test_client()
+        client.put("/api/create-user", json={"username": "tester", "password": "secret"})
+        client.post("/api/login", json={"username": "tester", "password": "secret"})
+
+        users = client.get("/api/cache-stats").json["caches"]["users"]
+
+    assert users["ttl"] == ProductionConfig.CACHE_USERS_TTL
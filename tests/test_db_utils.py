@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+from app import create_app
+from boxing.db import db
+from boxing.models.job_model import Jobs
+from boxing.models.rating_model import FightRecord, Ratings
+from boxing.models.tournament_model import TournamentBouts, TournamentEntrants, Tournaments
+from boxing.utils import db_utils
+from boxing.utils.db_utils import restore_template, save_template
+from config import TestConfig
+
+
+@pytest.mark.parametrize("mode", ["fast", "recreate"])
+def test_reset_boxers_clears_everything_that_refers_to_boxers(app, logged_in_client, add_boxer, run_jobs, mode):
+    boxer_ids = [add_boxer(name) for name in ("Ali", "Frazier", "Foreman")]
+    Ratings.record_fight(boxer_ids[0], boxer_ids[1])
+    logged_in_client.post("/api/tournaments", json={"name": "Open", "format": "round_robin", "seed": 1})
+    run_jobs()
+    app.config["RESET_MODE"] = mode
+
+    assert logged_in_client.delete("/api/reset-boxers").status_code == 200
+
+    for model in (Ratings, FightRecord, Tournaments, TournamentEntrants, TournamentBouts, Jobs):
+        assert db.session.query(model).count() == 0, model.__tablename__
+    # IDs restart, so a new tournament cannot pick up the old one's entrants
+    response = logged_in_client.post("/api/tournaments", json={"name": "Open", "format": "round_robin"})
+    assert response.status_code == 400
+    assert "at least two boxers" in response.json["message"]
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def opened_connections(monkeypatch) -> list:
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(db_utils.sqlite3, "connect", tracking_connect)
+    return opened
+
+
+def assert_closed(connection) -> None:
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        connection.execute("SELECT 1")
+
+
+def test_template_round_trip_closes_its_connections(file_app, tmp_path, opened_connections):
+    template = str(tmp_path / "template.db")
+    Ratings.record_fight(1, 2)
+
+    save_template(db.engine, template)
+    db.session.remove()
+    db_utils.reset_tables(db.engine, FightRecord)
+    restore_template(db.engine, template)
+
+    assert db.session.query(FightRecord).count() == 1
+    assert len(opened_connections) == 2
+    for connection in opened_connections:
+        assert_closed(connection)
+
+
+def test_restore_requires_an_existing_template(file_app, tmp_path):
+    with pytest.raises(ValueError, match="not found"):
+        restore_template(db.engine, str(tmp_path / "missing.db"))
@@ -0,0 +1,170 @@
+import runpy
+import time
+from pathlib import Path
+
+import pytest
+
+from app import create_app
+from boxing.utils.events import RESET_EVENT, EventBroker, RedisEventBridge
+from config import ProductionConfig, TestConfig
+
+
+class EventsConfig(TestConfig):
+    EVENTS_KEEPALIVE_SECONDS = 0.05
+    EVENTS_MAX_SUBSCRIBERS = 1
+
+
+@pytest.fixture
+def events_client():
+    app = create_app(EventsConfig)
+    with app.app_context():
+        client = app.test_client()
+        client.put("/api/create-user", json={"username": "tester", "password": "secret"})
+        client.post("/api/login", json={"username": "tester", "password": "secret"})
+        yield client
+
+
+def read_stream(response, until: str, max_chunks: int = 50) -> str:
+    """Read an open event stream until `until` appears in it, then close it."""
+    received = ""
+    chunks = iter(response.response)
+    try:
+        for _ in range(max_chunks):
+            received += next(chunks).decode()
+            if until in received:
+                return received
+    finally:
+        response.close()
+    raise AssertionError(f"{until!r} not in stream: {received!r}")
+
+
+def add_ring_events(client) -> None:
+    for name in ("Ali", "Frazier"):
+        client.post("/api/add-boxer", json={"name": name, "weight": 150, "height": 70, "reach": 72.0, "age": 28})
+    client.post("/api/enter-ring", json={"name": "Ali"})    # Event 1
+    client.post("/api/enter-ring", json={"name": "Frazier"})  # Event 2
+    client.post("/api/clear-boxers")                        # Event 3
+
+
+def test_last_event_id_resumes_after_that_event(events_client):
+    add_ring_events(events_client)
+
+    response = events_client.get("/api/events", headers={"Last-Event-ID": "1"}, buffered=False)
+    received = read_stream(response, "id: 3\n")
+
+    assert response.mimetype == "text/event-stream"
+    assert "id: 1\n" not in received
+    assert received.index("id: 2\nevent: ring") < received.index("id: 3\nevent: ring")
+
+
+def test_filtered_stream_still_advances_the_event_id(events_client):
+    add_ring_events(events_client)
+
+    response = events_client.get("/api/events?types=fight&last_event_id=0", buffered=False)
+    received = read_stream(response, "id: 3\n")
+
+    assert "event: ring" not in received
+
+
+def test_invalid_last_event_id_is_rejected(events_client):
+    response = events_client.get("/api/events", headers={"Last-Event-ID": "latest"})
+
+    assert response.status_code == 400
+
+
+def test_subscriber_limit_returns_503(events_client):
+    first = events_client.get("/api/events", buffered=False)
+    first_chunk = next(iter(first.response))  # Only a started stream holds a slot
+    assert first_chunk.startswith(b"retry:")
+    try:
+        response = events_client.get("/api/events")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+    finally:
+        first.close()
+
+    assert events_client.get("/api/events", buffered=False).status_code == 200
+
+
+def test_resume_from_an_evicted_event_asks_for_a_reset():
+    broker = EventBroker(buffer_size=2, keepalive_seconds=0.01)
+    for i in range(5):
+        broker.publish("fight", {"n": i})
+
+    stream = broker.open_stream(last_event_id=1)
+
+    assert next(stream).startswith("retry:")
+    assert next(stream) == f"event: {RESET_EVENT}\ndata: {{}}\n\n"
+    assert next(stream).startswith("id: 4\n")
+    stream.close()
+    assert broker.subscriber_count == 0
+
+
+def events_script(server, keys, args):
+    """Stands in for RedisEventBridge.SCRIPT."""
+    event_id = int(server._live(keys[0]) or 0) + 1
+    server.data[keys[0]] = str(event_id).encode()
+    server.publish(args[0], b"%d\n%s" % (event_id, args[1]))
+    return event_id
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+def test_bridge_delivers_events_to_every_worker_with_the_same_ids(redis_server):
+    redis_server.scripts[RedisEventBridge.SCRIPT.encode()] = events_script
+    workers = [EventBroker(keepalive_seconds=0.01, bridge=RedisEventBridge(redis_server.url)) for _ in range(2)]
+    streams = [broker.open_stream() for broker in workers]
+    for stream in streams:
+        next(stream)  # Subscribes the bridge
+    wait_for(lambda: sum(channel == b"boxing:events" for channel, _ in redis_server._subscribers) == 2)
+
+    workers[0].publish("fight", {"winner": "Ali"})
+    workers[1].publish("ring", {"action": "clear"})
+
+    for stream in streams:
+        received = ""
+        while "id: 2\n" not in received:
+            received += next(stream)
+        assert 'id: 1\nevent: fight\ndata: {"winner": "Ali"}' in received
+        assert "id: 2\nevent: ring" in received
+        stream.close()
+
+
+def load_gunicorn_conf(monkeypatch, **env) -> dict:
+    for name in ("GUNICORN_WORKER_CLASS", "GUNICORN_WORKERS", "GUNICORN_THREADS", "GUNICORN_PRELOAD"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(str(Path(__file__).parent.parent / "gunicorn.conf.py"))
+
+
+def test_gunicorn_defaults_to_gevent_without_preloading(monkeypatch):
+    conf = load_gunicorn_conf(monkeypatch)
+
+    assert conf["worker_class"] == "gevent"
+    assert conf["preload_app"] is False
+    assert "monkey" not in conf
+
+
+def test_gthread_refuses_more_subscribers_than_threads(monkeypatch):
+    monkeypatch.setattr(ProductionConfig, "EVENTS_MAX_SUBSCRIBERS", 4)
+    with pytest.raises(RuntimeError, match="EVENTS_MAX_SUBSCRIBERS=4"):
+        load_gunicorn_conf(monkeypatch, GUNICORN_WORKER_CLASS="gthread", GUNICORN_THREADS="4")
+
+    monkeypatch.setattr(ProductionConfig, "EVENTS_MAX_SUBSCRIBERS", 2)
+    conf = load_gunicorn_conf(monkeypatch, GUNICORN_WORKER_CLASS="gthread", GUNICORN_THREADS="4")
+    assert conf["preload_app"] is True
+
+
+def test_several_workers_need_the_event_bridge(monkeypatch):
+    for name in ("SESSION_BACKEND", "RATE_LIMIT_BACKEND", "IDEMPOTENCY_BACKEND"):
+        monkeypatch.setattr(ProductionConfig, name, "redis")
+    monkeypatch.setattr(ProductionConfig, "EVENTS_BACKEND", "memory")
+
+    with pytest.raises(RuntimeError, match="EVENTS_BACKEND is 'memory'"):
+        load_gunicorn_conf(monkeypatch, GUNICORN_WORKERS="2")
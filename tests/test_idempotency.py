@@ -0,0 +1,144 @@
+import threading
+
+import pytest
+
+from app import create_app
+from boxing.db import db
+from boxing.models.boxers_model import Boxers
+from boxing.utils import idempotency
+from boxing.utils.idempotency import IN_PROGRESS, MemoryIdempotencyStore
+from config import TestConfig
+
+
+BOXER = {"name": "Ali", "weight": 150, "height": 70, "reach": 72.0, "age": 28}
+
+
+def add_boxer(client, key, body=BOXER):
+    return client.post("/api/add-boxer", json=body, headers={"Idempotency-Key": key})
+
+
+def boxer_count() -> int:
+    return db.session.query(Boxers).count()
+
+
+def test_retry_replays_the_stored_response(logged_in_client):
+    first = add_boxer(logged_in_client, "k1")
+    retry = add_boxer(logged_in_client, "k1")
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_data() == first.get_data()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert boxer_count() == 1
+
+
+def test_key_reused_for_another_request_is_rejected(logged_in_client):
+    add_boxer(logged_in_client, "k1")
+
+    response = add_boxer(logged_in_client, "k1", dict(BOXER, name="Frazier"))
+
+    assert response.status_code == 422
+    assert boxer_count() == 1
+
+
+def test_failed_request_is_not_stored(logged_in_client, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("database is locked")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Boxers, "create_boxer", broken)
+        assert add_boxer(logged_in_client, "k1").status_code == 500
+
+    response = add_boxer(logged_in_client, "k1")
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+
+
+def test_retry_while_the_first_request_runs_gets_409(app, logged_in_client, monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+    create_boxer = Boxers.create_boxer.__func__
+
+    def slow_create(cls, *args):
+        entered.set()
+        release.wait(5)
+        return create_boxer(cls, *args)
+
+    monkeypatch.setattr(Boxers, "create_boxer", classmethod(slow_create))
+    second = app.test_client()
+    second.post("/api/login", json={"username": "tester", "password": "secret"})
+
+    responses = {}
+    first = threading.Thread(target=lambda: responses.setdefault("first", add_boxer(logged_in_client, "k1")))
+    first.start()
+    assert entered.wait(5)
+    try:
+        responses["retry"] = add_boxer(second, "k1")
+    finally:
+        release.set()
+        first.join(5)
+
+    assert responses["retry"].status_code == 409
+    assert responses["retry"].headers["Retry-After"] == "1"
+    assert responses["first"].status_code == 201
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_claim_lapses_after_the_lease_but_responses_keep_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(idempotency, "time", clock)
+    store = MemoryIdempotencyStore()
+
+    assert store.claim("crashed", IN_PROGRESS, 30) is None
+    assert store.claim("crashed", IN_PROGRESS, 30) == IN_PROGRESS
+    store.claim("done", IN_PROGRESS, 30)
+    store.set("done", "response", 86400)
+
+    clock.now += 31
+    assert store.claim("crashed", "retry", 30) is None
+    assert store.claim("done", "retry", 30) == "response"
+
+
+def test_lease_cannot_outlive_the_ttl():
+    manager = idempotency.IdempotencyManager(ttl=10, lease_seconds=30)
+
+    assert manager.lease_seconds == 10
+
+
+@pytest.fixture
+def redis_app(redis_server):
+    class RedisConfig(TestConfig):
+        IDEMPOTENCY_BACKEND = "redis"
+        IDEMPOTENCY_REDIS_URL = redis_server.url
+        IDEMPOTENCY_LEASE_SECONDS = 30
+
+    app = create_app(RedisConfig)
+    with app.app_context():
+        yield app
+
+
+def test_redis_claim_uses_the_lease_and_the_response_the_ttl(redis_app, redis_server, monkeypatch):
+    client = redis_app.test_client()
+    client.put("/api/create-user", json={"username": "tester", "password": "secret"})
+    client.post("/api/login", json={"username": "tester", "password": "secret"})
+    lease_ttls = []
+    create_boxer = Boxers.create_boxer.__func__
+
+    def record_lease(cls, *args):
+        key = next(key.decode() for key in redis_server.data if key.startswith(b"idempotency:"))
+        lease_ttls.append(redis_server.ttl(key))
+        return create_boxer(cls, *args)
+
+    monkeypatch.setattr(Boxers, "create_boxer", classmethod(record_lease))
+
+    assert add_boxer(client, "k1").status_code == 201
+
+    key = next(key.decode() for key in redis_server.data if key.startswith(b"idempotency:"))
+    assert 0 < lease_ttls[0] <= 30
+    assert redis_server.ttl(key) > 86000
+    assert add_boxer(client, "k1").headers["Idempotent-Replayed"] == "true"
@@ -0,0 +1,224 @@
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from boxing.db import db
+from boxing.models.boxers_model import Boxers
+from boxing.models.job_model import FIGHT_JOB, IMPORT_BOXERS_JOB, TOURNAMENT_JOB, JobLostError, Jobs
+from boxing.models.rating_model import FightRecord, Ratings
+from boxing.models.tournament_model import TournamentBouts, Tournaments
+from config import TestConfig
+
+
+def boxer(name: str) -> dict:
+    return {"name": name, "weight": 150, "height": 70, "reach": 72.0, "age": 28}
+
+
+def run_one(job_worker) -> None:
+    job_worker._run_job(Jobs.claim_next("test-worker", (FIGHT_JOB, IMPORT_BOXERS_JOB), {}))
+
+
+def stats(boxer_ids) -> list[tuple]:
+    return [(b.fights or 0, b.wins or 0) for b in (db.session.get(Boxers, i) for i in boxer_ids)]
+
+
+def test_failed_import_resumes_after_the_last_boxer_created(logged_in_client, job_worker, run_jobs, monkeypatch):
+    rows = [boxer("A"), {**boxer("Light"), "weight": 100}, boxer("B"), boxer("C"), boxer("D")]
+    job_id = logged_in_client.post("/api/import-boxers", json={"boxers": rows}).json["job_id"]
+
+    create_boxer = Boxers.create_boxer.__func__
+    calls = []
+
+    def flaky_create(cls, name, *args):
+        calls.append(name)
+        if name == "C" and calls.count("C") == 1:
+            raise RuntimeError("database went away")
+        return create_boxer(cls, name, *args)
+
+    monkeypatch.setattr(Boxers, "create_boxer", classmethod(flaky_create))
+
+    run_one(job_worker)
+    job = db.session.get(Jobs, job_id)
+    assert job.status == "queued"
+    assert job.get_checkpoint()["next"] == 3
+
+    run_jobs()
+    job = logged_in_client.get(f"/api/jobs/{job_id}").json["job"]
+    assert job["status"] == "succeeded"
+    assert job["result"]["created"] == 4
+    assert [error["name"] for error in job["result"]["errors"]] == ["Light"]
+    # Rows finished by the first attempt were not tried again
+    assert calls == ["A", "Light", "B", "C", "C", "D"]
+    assert db.session.query(Boxers).count() == 4
+
+
+def test_failed_fight_job_leaves_nothing_behind_and_is_applied_once(add_boxer, job_worker, run_jobs, monkeypatch,
+                                                                   fixed_random):
+    boxer_ids = [add_boxer("A"), add_boxer("B")]
+    job_id = Jobs.enqueue(FIGHT_JOB, {"boxer_ids": boxer_ids}).id
+
+    record_fight = Ratings.record_fight.__func__
+
+    def fail_once(cls, *args, **kwargs):
+        monkeypatch.setattr(Ratings, "record_fight", classmethod(record_fight))
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(Ratings, "record_fight", classmethod(fail_once))
+
+    run_one(job_worker)
+    assert db.session.get(Jobs, job_id).status == "queued"
+    assert stats(boxer_ids) == [(0, 0), (0, 0)]
+    assert db.session.query(FightRecord).count() == 0
+
+    run_jobs()
+    job = db.session.get(Jobs, job_id)
+    assert job.status == "succeeded"
+    assert sorted(stats(boxer_ids)) == [(1, 0), (1, 1)]
+    assert db.session.query(FightRecord).count() == 1
+
+
+def take_over(job_id: int) -> None:
+    # The job timed out and another worker claimed it while the first one was still running it
+    db.session.execute(text("UPDATE jobs SET locked_by = 'other-worker' WHERE id = :id"), {"id": job_id})
+    db.session.commit()
+
+
+def test_fight_job_taken_over_by_another_worker_is_not_applied(add_boxer, job_worker, fixed_random,
+                                                               monkeypatch):
+    boxer_ids = [add_boxer("A"), add_boxer("B")]
+    job_id = Jobs.enqueue(FIGHT_JOB, {"boxer_ids": boxer_ids}).id
+    job = Jobs.claim_next("slow-worker", (FIGHT_JOB,), {})
+    take_over(job_id)
+    record_fight = Ratings.record_fight.__func__
+    recorded = []
+
+    def record(cls, *args, **kwargs):
+        recorded.append(args)
+        return record_fight(cls, *args, **kwargs)
+
+    monkeypatch.setattr(Ratings, "record_fight", classmethod(record))
+
+    job_worker._run_job(job)
+
+    assert len(recorded) == 1  # The fight ran, and was only dropped when the job was completed
+
+    job = db.session.get(Jobs, job_id)
+    assert (job.status, job.locked_by) == ("running", "other-worker")
+    assert stats(boxer_ids) == [(0, 0), (0, 0)]
+    assert db.session.query(FightRecord).count() == 0
+
+
+def test_import_taken_over_by_another_worker_stops_before_the_next_boxer(app, job_worker):
+    job_id = Jobs.enqueue(IMPORT_BOXERS_JOB, {"boxers": [boxer("A"), boxer("B")]}).id
+    job = Jobs.claim_next("slow-worker", (IMPORT_BOXERS_JOB,), {})
+    take_over(job_id)
+
+    job_worker._run_job(job)
+
+    job = db.session.get(Jobs, job_id)
+    assert (job.status, job.locked_by, job.checkpoint) == ("running", "other-worker", None)
+    assert db.session.query(Boxers).count() == 0
+
+
+def test_tournament_taken_over_by_another_worker_is_left_to_it(logged_in_client, add_boxer, job_worker, run_jobs):
+    boxer_ids = [add_boxer(f"Boxer {name}", weight=130 + 5 * i) for i, name in enumerate("ABCD")]
+    response = logged_in_client.post("/api/tournaments", json={"name": "Open", "format": "round_robin",
+                                                               "boxer_ids": boxer_ids, "seed": 42})
+    tournament_id, job_id = response.json["tournament"]["id"], response.json["job_id"]
+    job = Jobs.claim_next("slow-worker", (TOURNAMENT_JOB,), {})
+    take_over(job_id)
+
+    job_worker._run_job(job)
+
+    assert db.session.get(Tournaments, tournament_id).status == "pending"
+    assert db.session.query(TournamentBouts).count() == 0
+    job = db.session.get(Jobs, job_id)
+    assert (job.status, job.locked_by) == ("running", "other-worker")
+
+    # The worker that took it over dies too; the job is retried and runs to the end
+    db.session.execute(text("UPDATE jobs SET status = 'queued', locked_by = NULL WHERE id = :id"), {"id": job_id})
+    db.session.commit()
+    assert run_jobs() == 1
+    assert db.session.get(Tournaments, tournament_id).status == "completed"
+    assert db.session.get(Jobs, job_id).status == "succeeded"
+
+
+def test_tournament_lost_after_a_round_stops_without_failing(logged_in_client, add_boxer, job_worker):
+    boxer_ids = [add_boxer(f"Boxer {name}", weight=130 + 5 * i) for i, name in enumerate("ABCD")]
+    response = logged_in_client.post("/api/tournaments", json={"name": "Open", "format": "round_robin",
+                                                               "boxer_ids": boxer_ids, "seed": 42})
+    tournament_id, job_id = response.json["tournament"]["id"], response.json["job_id"]
+    job = Jobs.claim_next("slow-worker", (TOURNAMENT_JOB,), {})
+    hold = job.hold
+    checks = []
+
+    def lose_after_first_round():
+        checks.append(True)
+        if len(checks) == 3:  # Start, round 1, then round 2
+            # Not committed, which would save round 2 too; hold() sees it all the same
+            db.session.execute(text("UPDATE jobs SET locked_by = 'other-worker' WHERE id = :id"), {"id": job_id})
+        hold()
+
+    job.hold = lose_after_first_round
+
+    job_worker._run_job(job)
+
+    tournament = db.session.get(Tournaments, tournament_id)
+    assert (tournament.status, tournament.current_round) == ("running", 1)
+    assert {bout.round for bout in db.session.query(TournamentBouts)} == {1}
+    assert db.session.get(Jobs, job_id).status == "running"  # Not failed; requeue_stale retries it
+
+
+def test_heartbeat_keeps_a_long_job_from_being_requeued(app):
+    job_id = Jobs.enqueue(IMPORT_BOXERS_JOB, {"boxers": []}).id
+    job = Jobs.claim_next("worker", (IMPORT_BOXERS_JOB,), {})
+    db.session.execute(text("UPDATE jobs SET locked_at = :old WHERE id = :id"),
+                       {"old": time.time() - 600, "id": job_id})
+    db.session.commit()
+
+    job.heartbeat()
+
+    assert Jobs.requeue_stale(300) == 0
+    assert db.session.get(Jobs, job_id).status == "running"
+
+
+def test_heartbeat_of_a_requeued_job_raises(app):
+    job_id = Jobs.enqueue(IMPORT_BOXERS_JOB, {"boxers": []}).id
+    job = Jobs.claim_next("worker", (IMPORT_BOXERS_JOB,), {})
+    db.session.execute(text("UPDATE jobs SET locked_at = :old WHERE id = :id"),
+                       {"old": time.time() - 600, "id": job_id})
+    db.session.commit()
+    assert Jobs.requeue_stale(300) == 1
+
+    with pytest.raises(JobLostError):
+        job.heartbeat()
+    assert db.session.get(Jobs, job_id).status == "queued"
+
+
+def test_job_fails_after_its_last_attempt(logged_in_client, run_jobs, monkeypatch):
+    job_id = logged_in_client.post("/api/import-boxers", json={"boxers": [boxer("A")]}).json["job_id"]
+
+    def broken_create(cls, *args):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(Boxers, "create_boxer", classmethod(broken_create))
+
+    assert run_jobs() == 3
+    job = logged_in_client.get(f"/api/jobs/{job_id}").json["job"]
+    assert job["status"] == "failed"
+    assert "database went away" in job["error"]
+
+
+def test_sqlite_connections_wait_for_locks_and_use_wal(tmp_path):
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+        SQLITE_BUSY_TIMEOUT_MS = 2500
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 2500
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        db.engine.dispose()
@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import delete
+
+from boxing.db import db
+from boxing.models.boxers_model import Boxers
+from boxing.models.ring_slot_model import RingSlots
+
+
+def ring_ids(client) -> list[int]:
+    return [boxer["id"] for boxer in client.get("/api/get-boxers").json["boxers"]]
+
+
+@pytest.mark.parametrize("body", [
+    {"max_reach_diff": -1},
+    {"max_reach_diff": "5"},
+    {"max_reach_diff": True},
+    {"max_age_diff": 2.5},
+    {"max_age_diff": -3},
+])
+def test_invalid_limits_are_rejected(logged_in_client, body):
+    response = logged_in_client.post("/api/matchmake", json=body)
+
+    assert response.status_code == 400
+    assert "must be a non-negative" in response.json["message"]
+
+
+def test_reach_limit_rules_out_distant_opponents(logged_in_client, add_boxer):
+    add_boxer("Ali", reach=60.0)
+    add_boxer("Frazier", reach=80.0)
+
+    response = logged_in_client.post("/api/matchmake", json={"max_reach_diff": 5})
+    assert response.status_code == 400
+    assert ring_ids(logged_in_client) == []
+
+    response = logged_in_client.post("/api/matchmake", json={"max_reach_diff": 20})
+    assert response.status_code == 200
+    assert len(ring_ids(logged_in_client)) == 2
+
+
+def test_age_limit_applies_to_the_opponent_of_a_waiting_boxer(logged_in_client, add_boxer):
+    add_boxer("Ali", age=25)
+    add_boxer("Frazier", age=38)
+    logged_in_client.post("/api/enter-ring", json={"name": "Ali"})
+
+    response = logged_in_client.post("/api/matchmake", json={"max_age_diff": 10})
+
+    assert response.status_code == 400
+    assert "No eligible opponent" in response.json["message"]
+
+
+def test_card_leaves_out_pairs_outside_the_limits(logged_in_client, add_boxer):
+    add_boxer("Ali", age=25)
+    add_boxer("Frazier", age=38)
+
+    response = logged_in_client.post("/api/matchmake", json={"bouts": 1, "max_age_diff": 5})
+
+    assert response.status_code == 200
+    assert response.json["card"] == []
+
+
+def test_boxer_deleted_by_another_worker_is_not_matched(logged_in_client, add_boxer):
+    ali = add_boxer("Ali")
+    frazier = add_boxer("Frazier")
+    assert logged_in_client.post("/api/matchmake", json={"bouts": 1}).status_code == 200  # Builds the index
+
+    # Deleted behind this worker's back, so its matchmaking index still holds the boxer
+    db.session.execute(delete(Boxers).where(Boxers.id == frazier))
+    db.session.commit()
+
+    response = logged_in_client.post("/api/matchmake", json={})
+    assert response.status_code == 400
+    assert "no longer exists" in response.json["message"]
+    assert ring_ids(logged_in_client) == []
+
+    # The stale entry was dropped, so the next attempt fails cleanly as well
+    response = logged_in_client.post("/api/matchmake", json={})
+    assert response.status_code == 400
+    assert "Not enough eligible boxers" in response.json["message"]
+    assert ali not in ring_ids(logged_in_client)
+
+
+def test_ring_filled_concurrently_leaves_no_half_match(logged_in_client, add_boxer, monkeypatch):
+    add_boxer("Ali")
+    add_boxer("Frazier")
+    enter = RingSlots.enter.__func__
+    calls = []
+
+    def enter_then_fill(cls, boxer_id):
+        calls.append(boxer_id)
+        if len(calls) == 2:
+            raise ValueError("Ring is full, cannot add more boxers.")
+        return enter(cls, boxer_id)
+
+    monkeypatch.setattr(RingSlots, "enter", classmethod(enter_then_fill))
+
+    response = logged_in_client.post("/api/matchmake", json={})
+
+    assert response.status_code == 400
+    assert "Ring is full" in response.json["message"]
+    assert RingSlots.get_boxer_ids() == []
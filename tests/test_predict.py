@@ -0,0 +1,91 @@
+import pytest
+
+from app import create_app
+from boxing.utils.fight_utils import simulate_win_count, wilson_interval
+from config import TestConfig
+
+
+def make_client(**config):
+    class PredictConfig(TestConfig):
+        pass
+    for name, value in config.items():
+        setattr(PredictConfig, name, value)
+
+    app = create_app(PredictConfig)
+    client = app.test_client()
+    client.put("/api/create-user", json={"username": "tester", "password": "secret"})
+    client.post("/api/login", json={"username": "tester", "password": "secret"})
+    for name, reach in (("Ali", 72.0), ("Bob", 70.0)):
+        client.post("/api/add-boxer", json={"name": name, "weight": 150, "height": 70, "reach": reach, "age": 28})
+    return client
+
+
+def test_same_seed_gives_the_same_prediction():
+    # Without the cache, so the second request runs the simulation again
+    client = make_client(CACHE_ENABLED=False)
+
+    first, second = (client.get("/api/predict?a=1&b=2&n=5000&seed=7").json for _ in range(2))
+
+    assert first["status"] == "success"
+    assert first["wins_a"] == second["wins_a"]
+    assert first["confidence_interval"] == second["confidence_interval"]
+
+
+def test_simulation_depends_only_on_the_seed():
+    assert simulate_win_count(7, 100.0, 99.8, 5000) == simulate_win_count(7, 100.0, 99.8, 5000)
+    assert simulate_win_count(7, 100.0, 99.8, 5000) != simulate_win_count(8, 100.0, 99.8, 5000)
+
+
+def test_prediction_interval_contains_the_estimate():
+    prediction = make_client().get("/api/predict?a=1&b=2&n=5000&seed=7").json
+
+    lower, upper = prediction["confidence_interval"]
+    assert 0.0 <= lower <= prediction["probability_a"] <= upper <= 1.0
+
+
+@pytest.mark.parametrize("wins, trials", [(0, 10), (10, 10), (1, 1), (5, 10), (9999, 10000)])
+def test_wilson_interval_stays_within_bounds(wins, trials):
+    lower, upper = wilson_interval(wins, trials)
+
+    assert 0.0 <= lower <= wins / trials <= upper <= 1.0
+
+
+def test_wilson_interval_is_exact_at_the_extremes_and_narrows_with_trials():
+    assert wilson_interval(0, 10)[0] == 0.0
+    assert wilson_interval(10, 10)[1] == 1.0
+
+    small, large = wilson_interval(50, 100), wilson_interval(5000, 10000)
+    assert large[1] - large[0] < small[1] - small[0]
+    assert wilson_interval(50, 100) == pytest.approx((0.404, 0.596), abs=0.001)
+
+
+@pytest.mark.parametrize("query, message", [
+    ("a=1", "'a' and 'b' must be boxer IDs"),
+    ("a=x&b=2", "'a' and 'b' must be boxer IDs"),
+    ("a=1&b=1", "cannot fight themselves"),
+    ("a=1&b=2&n=0", "'n' must be an integer between 1 and 100"),
+    ("a=1&b=2&n=101", "'n' must be an integer between 1 and 100"),
+    ("a=1&b=2&n=ten", "'n' must be an integer between 1 and 100"),
+    ("a=1&b=2&n=10&seed=-1", "'seed' must be a non-negative integer"),
+    ("a=1&b=99&n=10", "Boxer with ID 99 not found"),
+])
+def test_invalid_prediction_requests_return_400(query, message):
+    response = make_client(PREDICT_MAX_TRIALS=100).get(f"/api/predict?{query}")
+
+    assert response.status_code == 400
+    assert message in response.json["message"]
+
+
+def test_prediction_requires_login():
+    client = create_app(TestConfig).test_client()
+
+    assert client.get("/api/predict?a=1&b=2").status_code == 401
+
+
+def test_predictions_share_a_global_rate_limit():
+    client = make_client(RATE_LIMIT_ENABLED=True, RATE_LIMIT_PREDICT_GLOBAL="2/minute")
+
+    assert [client.get("/api/predict?a=1&b=2&n=10").status_code for _ in range(2)] == [200, 200]
+    response = client.get("/api/predict?a=1&b=2&n=10")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from boxing.db import db
+from config import TestConfig
+
+
+class ProfilingConfig(TestConfig):
+    PROFILE_HEADER_ENABLED = True
+    PROFILE_HEADER_TOKEN = "let-me-profile"
+    SQL_TRACE_ENABLED = True
+
+
+@pytest.fixture
+def profiled_app():
+    app = create_app(ProfilingConfig)
+    with app.app_context():
+        yield app
+
+
+def test_header_profiling_requires_a_token():
+    class NoToken(TestConfig):
+        PROFILE_HEADER_ENABLED = True
+
+    with pytest.raises(ValueError, match="PROFILE_HEADER_TOKEN must be set"):
+        create_app(NoToken)
+
+
+@pytest.mark.parametrize("header, profiled", [
+    ({"X-Profile": "let-me-profile"}, True),
+    ({"X-Profile": "1"}, False),
+    ({}, False),
+])
+def test_only_requests_with_the_token_are_profiled(profiled_app, header, profiled):
+    response = profiled_app.test_client().get("/api/health", headers=header)
+
+    assert response.status_code == 200
+    assert ("X-Profile-Time-ms" in response.headers) is profiled
+
+
+def test_failed_statements_do_not_leak_start_times(profiled_app):
+    for _ in range(3):
+        with pytest.raises(OperationalError):
+            db.session.execute(text("SELECT * FROM no_such_table"))
+        db.session.rollback()
+
+    assert db.session.connection().info.get("query_start", []) == []
+
+
+def test_queries_are_counted_per_request(profiled_app):
+    client = profiled_app.test_client()
+    client.put("/api/create-user", json={"username": "tester", "password": "secret"})
+
+    response = client.post("/api/login", json={"username": "tester", "password": "secret"})
+
+    assert int(response.headers["X-SQL-Queries"]) > 0
+    assert float(response.headers["X-SQL-Time-ms"]) >= 0
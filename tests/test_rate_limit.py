@@ -0,0 +1,162 @@
+import threading
+
+import pytest
+
+from app import create_app
+from boxing.models.ring_model import RingModel
+from boxing.utils import rate_limit
+from boxing.utils.rate_limit import ConcurrencyGate, MemoryBucketBackend, parse_rate
+from config import TestConfig
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("30/minute", (0.5, 30)),
+    ("1/second", (1.0, 1)),
+    ("7200/hour", (2.0, 7200)),
+])
+def test_parse_rate(spec, expected):
+    assert parse_rate(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["30", "30/fortnight", "x/minute", "0/minute"])
+def test_parse_rate_rejects_malformed_specs(spec):
+    with pytest.raises(ValueError):
+        parse_rate(spec)
+
+
+def test_memory_bucket_allows_a_burst_then_refills(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    backend = MemoryBucketBackend()
+
+    assert [backend.consume("key", rate=1.0, capacity=3)[0] for _ in range(4)] == [True, True, True, False]
+    clock.now += 1
+    assert backend.consume("key", rate=1.0, capacity=3)[0]
+    assert not backend.consume("key", rate=1.0, capacity=3)[0]
+
+
+def test_memory_bucket_drops_least_recently_used_keys():
+    backend = MemoryBucketBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        backend.consume(key, rate=1.0, capacity=1)
+
+    # 'a' was dropped, so it starts again with a full bucket
+    assert backend.consume("a", rate=1.0, capacity=1)[0]
+    assert not backend.consume("c", rate=1.0, capacity=1)[0]
+
+
+def make_client(**config):
+    class LimitedConfig(TestConfig):
+        RATE_LIMIT_ENABLED = True
+    for name, value in config.items():
+        setattr(LimitedConfig, name, value)
+
+    client = create_app(LimitedConfig).test_client()
+    client.put("/api/create-user", json={"username": "tester", "password": "secret"})
+    client.post("/api/login", json={"username": "tester", "password": "secret"})
+    return client
+
+
+def test_fight_user_limit_returns_429_with_retry_after():
+    client = make_client(RATE_LIMIT_FIGHT_USER="2/minute")
+
+    assert [client.get("/api/fight").status_code for _ in range(2)] == [400, 400]
+    response = client.get("/api/fight")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_global_limit_is_checked_before_the_user_limit(monkeypatch):
+    consumed = []
+    original = MemoryBucketBackend.consume
+
+    def record(self, key, rate, capacity, cost=1):
+        consumed.append(key.split(":")[1])
+        return original(self, key, rate, capacity, cost)
+    monkeypatch.setattr(MemoryBucketBackend, "consume", record)
+    client = make_client(RATE_LIMIT_FIGHT_GLOBAL="1/minute", RATE_LIMIT_FIGHT_USER="5/minute")
+
+    consumed.clear()
+    client.get("/api/fight")
+    assert consumed == ["global", "user"]
+
+    consumed.clear()
+    assert client.get("/api/fight").status_code == 429
+    assert consumed == ["global"]  # The rejected request did not take one of the user's tokens
+
+
+def test_login_is_limited_per_ip():
+    client = make_client(RATE_LIMIT_LOGIN="3/minute")  # One login is used by make_client
+
+    for _ in range(2):
+        assert client.post("/api/login", json={"username": "tester", "password": "wrong"}).status_code == 401
+    assert client.post("/api/login", json={"username": "tester", "password": "secret"}).status_code == 429
+
+
+def test_disabled_limiter_never_rejects(logged_in_client):
+    assert all(logged_in_client.get("/api/fight").status_code == 400 for _ in range(40))
+
+
+def test_concurrency_gate_turns_away_callers_beyond_the_limit(app):
+    gate = ConcurrencyGate(1)
+    started, release = threading.Event(), threading.Event()
+
+    @gate
+    def slow():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    thread = threading.Thread(target=slow)
+    thread.start()
+    started.wait(5)
+    with app.test_request_context():
+        response = slow()
+    release.set()
+    thread.join()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    with app.test_request_context():
+        assert slow() == "done"  # The slot was released
+
+
+def test_fight_returns_503_when_the_gate_is_full(monkeypatch):
+    clients = [make_client(FIGHT_MAX_CONCURRENCY=1, RATE_LIMIT_ENABLED=False)]
+    app = clients[0].application
+    clients.append(app.test_client())
+    clients[1].post("/api/login", json={"username": "tester", "password": "secret"})
+    for name in ("Ali", "Frazier", "Foreman", "Liston"):
+        clients[0].post("/api/add-boxer", json={"name": name, "weight": 150, "height": 70, "reach": 72.0, "age": 28})
+
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fight(self):
+        started.set()
+        release.wait(5)
+        return self.get_boxers()[0].name
+    monkeypatch.setattr(RingModel, "fight", slow_fight)
+
+    clients[0].post("/api/enter-ring", json={"name": "Ali"})
+    clients[0].post("/api/enter-ring", json={"name": "Frazier"})
+    results = {}
+    thread = threading.Thread(target=lambda: results.update(first=clients[0].get("/api/fight").status_code))
+    thread.start()
+    started.wait(5)
+
+    clients[1].post("/api/enter-ring", json={"name": "Foreman"})
+    clients[1].post("/api/enter-ring", json={"name": "Liston"})
+    busy = clients[1].get("/api/fight")
+    release.set()
+    thread.join()
+
+    assert busy.status_code == 503
+    assert results["first"] == 200
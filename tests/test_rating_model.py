@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+import pytest
+
+from boxing.models.rating_model import (
+    DEFAULT_RATING,
+    DEFAULT_RD,
+    ELO_K_FACTOR,
+    MIN_RD,
+    Ratings,
+    compute_ratings,
+)
+
+
+def sequential_replay(fights: list[tuple[int, int]]) -> dict:
+    """Plain one-fight-at-a-time Elo and Glicko-1 replay, as record_fight applies it."""
+    q = math.log(10) / 400
+    elo, glicko, rd, count = {}, {}, {}, {}
+
+    def g(opp_rd):
+        return 1 / math.sqrt(1 + 3 * q ** 2 * opp_rd ** 2 / math.pi ** 2)
+
+    def glicko_player(rating, own_rd, opp_rating, opp_rd, score):
+        expected = 1 / (1 + 10 ** (-g(opp_rd) * (rating - opp_rating) / 400))
+        precision = 1 / own_rd ** 2 + q ** 2 * g(opp_rd) ** 2 * expected * (1 - expected)
+        return (rating + q / precision * g(opp_rd) * (score - expected),
+                max(math.sqrt(1 / precision), MIN_RD))
+
+    for winner, loser in fights:
+        for boxer in (winner, loser):
+            elo.setdefault(boxer, DEFAULT_RATING)
+            glicko.setdefault(boxer, DEFAULT_RATING)
+            rd.setdefault(boxer, DEFAULT_RD)
+            count[boxer] = count.get(boxer, 0) + 1
+
+        change = ELO_K_FACTOR * (1 - 1 / (1 + 10 ** ((elo[loser] - elo[winner]) / 400)))
+        elo[winner], elo[loser] = elo[winner] + change, elo[loser] - change
+
+        new_winner = glicko_player(glicko[winner], rd[winner], glicko[loser], rd[loser], 1.0)
+        new_loser = glicko_player(glicko[loser], rd[loser], glicko[winner], rd[winner], 0.0)
+        (glicko[winner], rd[winner]), (glicko[loser], rd[loser]) = new_winner, new_loser
+
+    return {boxer: (elo[boxer], glicko[boxer], rd[boxer], count[boxer]) for boxer in elo}
+
+
+def assert_matches_replay(fights: list[tuple[int, int]]):
+    boxer_ids, elo, glicko, glicko_rd, fights_count = compute_ratings(
+        np.array([w for w, _ in fights], dtype=np.int64),
+        np.array([l for _, l in fights], dtype=np.int64),
+    )
+    expected = sequential_replay(fights)
+
+    assert sorted(expected) == boxer_ids.tolist()
+    for i, boxer_id in enumerate(boxer_ids.tolist()):
+        exp_elo, exp_glicko, exp_rd, exp_count = expected[boxer_id]
+        assert elo[i] == pytest.approx(exp_elo)
+        assert glicko[i] == pytest.approx(exp_glicko)
+        assert glicko_rd[i] == pytest.approx(exp_rd)
+        assert fights_count[i] == exp_count
+
+
+def test_compute_ratings_matches_sequential_replay_with_repeat_fighters():
+    # Boxer 10 fights in most bouts, including back-to-back, so rounds must keep its order
+    fights = [(10, 42), (10, 7), (42, 7), (7, 10), (10, 42), (99, 10), (42, 99), (10, 99), (7, 42)]
+    assert_matches_replay(fights)
+
+
+def test_compute_ratings_matches_sequential_replay_on_random_history():
+    rng = np.random.default_rng(1234)
+    fights = []
+    for _ in range(500):
+        winner, loser = rng.choice(12, size=2, replace=False)
+        fights.append((int(winner) * 3 + 1, int(loser) * 3 + 1))
+    assert_matches_replay(fights)
+
+
+def test_compute_ratings_empty_history():
+    boxer_ids, elo, glicko, glicko_rd, fights = compute_ratings(np.array([], dtype=np.int64),
+                                                                np.array([], dtype=np.int64))
+    assert len(boxer_ids) == len(elo) == len(glicko) == len(glicko_rd) == len(fights) == 0
+
+
+def test_recompute_all_matches_incremental_ratings(app):
+    fights = [(1, 2), (1, 3), (2, 3), (3, 1), (1, 2), (2, 1)]
+    for winner, loser in fights:
+        Ratings.record_fight(winner, loser)
+    incremental = {rating.boxer_id: (rating.elo, rating.glicko, rating.glicko_rd, rating.fights)
+                   for rating in Ratings.query.all()}
+
+    assert Ratings.recompute_all() == len(fights)
+
+    recomputed = {rating.boxer_id: (rating.elo, rating.glicko, rating.glicko_rd, rating.fights)
+                  for rating in Ratings.query.all()}
+    assert recomputed.keys() == incremental.keys()
+    for boxer_id, values in incremental.items():
+        assert recomputed[boxer_id] == pytest.approx(values)
+
+
+def test_record_fight_rejects_same_boxer(app):
+    with pytest.raises(ValueError, match="cannot fight themself"):
+        Ratings.record_fight(1, 1)
@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+from boxing.utils.redis_client import RedisClient
+from resp_server import FakeRedisServer
+
+
+def test_set_get_delete(redis_server):
+    client = RedisClient(redis_server.url)
+
+    client.set("greeting", "hello")
+    assert client.get("greeting") == b"hello"
+    assert client.delete("greeting", "missing") == 1
+    assert client.get("greeting") is None
+
+
+def test_set_with_ttl(redis_server):
+    client = RedisClient(redis_server.url)
+
+    client.set("temp", "value", ttl=30)
+    assert 0 < redis_server.ttl("temp") <= 30
+    redis_server.expire_now("temp")
+    assert client.get("temp") is None
+
+
+def test_error_reply_raises(redis_server):
+    with pytest.raises(RuntimeError, match="unknown command"):
+        RedisClient(redis_server.url).execute("FLUSHEVERYTHING")
+
+
+def test_authenticates_and_selects_database():
+    server = FakeRedisServer(password="hunter2").start()
+    try:
+        client = RedisClient(f"redis://:hunter2@127.0.0.1:{server.port}/3")
+        assert client.execute("PING") == "PONG"
+        assert server.selected_dbs == [3]
+
+        with pytest.raises(RuntimeError, match="NOAUTH"):
+            RedisClient(f"redis://127.0.0.1:{server.port}/0").execute("PING")
+    finally:
+        server.stop()
+
+
+def test_reconnects_once_after_the_server_drops_the_connection(redis_server):
+    client = RedisClient(redis_server.url)
+    client.set("key", "before")
+
+    redis_server.drop_connections()
+    assert client.get("key") == b"before"
+
+
+def test_unreachable_server_raises_runtime_error():
+    server = FakeRedisServer().start()
+    url = server.url
+    server.stop()
+
+    with pytest.raises(RuntimeError, match="failed"):
+        RedisClient(url, timeout=0.5).execute("PING")
+
+
+def test_delete_prefix_only_deletes_matching_keys(redis_server):
+    client = RedisClient(redis_server.url)
+    for key in ("session:a", "session:b", "other:c"):
+        client.set(key, "1")
+
+    assert client.delete_prefix("session:") == 2
+    assert client.get("other:c") == b"1"
+
+
+def test_publish_reaches_subscribers(redis_server):
+    client = RedisClient(redis_server.url)
+    received = []
+    subscribed = threading.Event()
+
+    def listen():
+        for channel, message in client.subscribe("news"):
+            received.append((channel, message))
+            return
+
+    thread = threading.Thread(target=listen, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if client.publish("news", "extra") == 1:
+            subscribed.set()
+            break
+        thread.join(0.01)
+
+    thread.join(2)
+    assert subscribed.is_set()
+    assert received == [("news", b"extra")]
+
+
+def test_connections_are_per_thread(redis_server):
+    client = RedisClient(redis_server.url)
+    errors = []
+
+    def work(i):
+        try:
+            for j in range(50):
+                client.set(f"k:{i}:{j}", j)
+                assert client.get(f"k:{i}:{j}") == str(j).encode()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
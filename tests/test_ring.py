@@ -0,0 +1,116 @@
+import pytest
+
+from app import create_app
+from boxing.models.ring_model import RingModel
+from boxing.models.ring_slot_model import RingSlots
+from config import TestConfig
+
+
+def ring_names(client) -> list[str]:
+    response = client.get("/api/get-boxers")
+    assert response.status_code == 200
+    return [boxer["name"] for boxer in response.json["boxers"]]
+
+
+def test_enter_ring_keeps_entry_order_and_rejects_a_third_boxer(logged_in_client, add_boxer):
+    for name in ("Ali", "Frazier", "Foreman"):
+        add_boxer(name)
+
+    assert logged_in_client.post("/api/enter-ring", json={"name": "Frazier"}).status_code == 200
+    assert logged_in_client.post("/api/enter-ring", json={"name": "Ali"}).status_code == 200
+
+    response = logged_in_client.post("/api/enter-ring", json={"name": "Foreman"})
+    assert response.status_code == 400
+    assert "Ring is full" in response.json["message"]
+    assert ring_names(logged_in_client) == ["Frazier", "Ali"]
+
+
+def test_fight_requires_two_boxers(logged_in_client, add_boxer):
+    add_boxer("Ali")
+    logged_in_client.post("/api/enter-ring", json={"name": "Ali"})
+
+    response = logged_in_client.get("/api/fight")
+    assert response.status_code == 400
+    assert ring_names(logged_in_client) == ["Ali"]
+
+
+def test_fight_empties_the_ring(logged_in_client, add_boxer, monkeypatch):
+    add_boxer("Ali")
+    add_boxer("Frazier")
+    monkeypatch.setattr(RingModel, "fight", lambda self: self.get_boxers()[0].name)
+    logged_in_client.post("/api/enter-ring", json={"name": "Ali"})
+    logged_in_client.post("/api/enter-ring", json={"name": "Frazier"})
+
+    response = logged_in_client.get("/api/fight")
+    assert response.status_code == 200
+    assert response.json["winner"] == "Ali"
+    assert ring_names(logged_in_client) == []
+
+
+def test_failed_fight_puts_the_boxers_back(logged_in_client, add_boxer, monkeypatch):
+    add_boxer("Ali")
+    add_boxer("Frazier")
+    logged_in_client.post("/api/enter-ring", json={"name": "Ali"})
+    logged_in_client.post("/api/enter-ring", json={"name": "Frazier"})
+
+    def fail(self):
+        raise RuntimeError("Request to random.org timed out.")
+    monkeypatch.setattr(RingModel, "fight", fail)
+
+    assert logged_in_client.get("/api/fight").status_code == 500
+    assert ring_names(logged_in_client) == ["Ali", "Frazier"]
+
+
+def test_deleted_boxer_leaves_the_ring(logged_in_client, add_boxer):
+    boxer_id = add_boxer("Ali")
+    add_boxer("Frazier")
+    logged_in_client.post("/api/enter-ring", json={"name": "Ali"})
+    logged_in_client.post("/api/enter-ring", json={"name": "Frazier"})
+
+    assert logged_in_client.delete(f"/api/delete-boxer/{boxer_id}").status_code == 200
+    assert ring_names(logged_in_client) == ["Frazier"]
+
+
+def test_boxers_can_only_be_taken_once(app):
+    RingSlots.enter(1)
+    RingSlots.enter(2)
+
+    assert RingSlots.take_all() == [1, 2]
+    with pytest.raises(ValueError, match="two boxers"):
+        RingSlots.take_all()
+
+    RingSlots.restore([1, 2])
+    assert RingSlots.get_boxer_ids() == [1, 2]
+
+
+def test_restore_does_not_overwrite_a_refilled_ring(app):
+    RingSlots.enter(1)
+    RingSlots.enter(2)
+    RingSlots.take_all()
+    RingSlots.enter(3)
+
+    RingSlots.restore([1, 2])
+    assert RingSlots.get_boxer_ids() == [3]
+
+
+def test_ring_is_shared_by_worker_processes(tmp_path, monkeypatch):
+    class SharedConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'shared.db'}"
+
+    # Two apps on one database stand in for two gunicorn workers
+    clients = [create_app(SharedConfig).test_client() for _ in range(2)]
+    clients[0].put("/api/create-user", json={"username": "tester", "password": "secret"})
+    for client in clients:
+        client.post("/api/login", json={"username": "tester", "password": "secret"})
+    for name in ("Ali", "Frazier"):
+        clients[0].post("/api/add-boxer", json={"name": name, "weight": 150, "height": 70, "reach": 72.0, "age": 28})
+    monkeypatch.setattr(RingModel, "fight", lambda self: self.get_boxers()[1].name)
+
+    clients[0].post("/api/enter-ring", json={"name": "Ali"})
+    clients[1].post("/api/enter-ring", json={"name": "Frazier"})
+    assert ring_names(clients[0]) == ring_names(clients[1]) == ["Ali", "Frazier"]
+
+    response = clients[1].get("/api/fight")
+    assert response.status_code == 200
+    assert response.json["winner"] == "Frazier"
+    assert ring_names(clients[0]) == []
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+from sqlalchemy import event
+
+from boxing.db import db
+
+
+def page_through(client, **params) -> list[dict]:
+    """Follow next_cursor until the last page and return every boxer seen."""
+    boxers, after = [], None
+    while True:
+        query = dict(params, limit=3)
+        if after is not None:
+            query["after"] = after
+        response = client.get("/api/boxers", query_string=query)
+        assert response.status_code == 200
+        boxers.extend(response.json["boxers"])
+        after = response.json["next_cursor"]
+        if after is None:
+            return boxers
+
+
+@pytest.fixture
+def roster(add_boxer) -> list[dict]:
+    rng = random.Random(7)
+    boxers = []
+    for i in range(20):
+        # Few distinct weights and reaches, so pages split runs of equal values
+        boxer = {"name": f"Boxer {i}", "weight": rng.choice([130, 150, 170]),
+                 "height": 70, "reach": rng.choice([68.5, 72.0, 75.5]), "age": rng.choice([25, 30])}
+        boxer["id"] = add_boxer(**boxer)
+        boxers.append(boxer)
+    return boxers
+
+
+@pytest.mark.parametrize("params, matches, sort_key", [
+    ({}, lambda b: True, lambda b: b["id"]),
+    ({"weight_min": 140, "weight_max": 170}, lambda b: 140 <= b["weight"] <= 170,
+     lambda b: (b["weight"], b["id"])),
+    ({"age": 30}, lambda b: b["age"] == 30, lambda b: (b["weight"], b["id"])),
+    ({"reach_min": 70}, lambda b: b["reach"] >= 70, lambda b: (b["reach"], b["id"])),
+    ({"weight_max": 150, "reach_max": 72}, lambda b: b["weight"] <= 150 and b["reach"] <= 72,
+     lambda b: (b["weight"], b["id"])),
+])
+def test_paging_returns_every_match_once_in_index_order(logged_in_client, roster, params, matches, sort_key):
+    expected = sorted((b for b in roster if matches(b)), key=sort_key)
+
+    seen = page_through(logged_in_client, **params)
+
+    assert [b["id"] for b in seen] == [b["id"] for b in expected]
+
+
+def test_name_prefix_pages_by_id(logged_in_client, add_boxer):
+    ids = [add_boxer(name) for name in ("Joe Louis", "Joe Frazier", "Ali", "Joe Calzaghe", "Jack Johnson")]
+
+    seen = page_through(logged_in_client, name_prefix="jo")
+
+    assert [b["id"] for b in seen] == [ids[0], ids[1], ids[3], ids[4]]
+
+
+@pytest.mark.parametrize("params", [
+    {"after": "abc"},
+    {"weight_min": 140, "after": "12"},
+    {"reach_min": 70, "after": "x:3"},
+])
+def test_invalid_cursor_is_rejected(logged_in_client, params):
+    response = logged_in_client.get("/api/boxers", query_string=params)
+
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json["message"]
+
+
+@pytest.mark.parametrize("params", [
+    {"weight_min": 140, "weight_max": 170, "after": "150:4"},
+    {"age": 30, "after": "150:4"},
+    {"age": 30, "reach_min": 70, "after": "150:4"},
+    {"reach_min": 70, "reach_max": 74, "after": "72.0:4"},
+    {"after": "4"},
+])
+def test_page_query_is_served_by_an_index_without_sorting(app, logged_in_client, params):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT id, name"):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        assert logged_in_client.get("/api/boxers", query_string=params).status_code == 200
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    rows = db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    plan = " ".join(row[-1] for row in rows)
+    assert "TEMP B-TREE" not in plan
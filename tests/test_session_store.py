@@ -0,0 +1,144 @@
+import sqlite3
+
+import pytest
+
+from app import create_app
+from boxing.utils import session_store
+from boxing.utils.session_store import MemorySessionStore, RedisSessionStore, SQLiteSessionStore
+from config import TestConfig
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def local_store(request, tmp_path, clock):
+    if request.param == "memory":
+        return MemorySessionStore(sweep_interval=2)
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"), sweep_interval=2)
+
+
+def test_local_store_round_trip(local_store):
+    local_store.set("sid", '{"a": 1}', ttl=60)
+    assert local_store.get("sid") == '{"a": 1}'
+
+    local_store.delete("sid")
+    assert local_store.get("sid") is None
+
+
+def test_local_store_expires_sessions(local_store, clock):
+    local_store.set("sid", "data", ttl=60)
+
+    clock.now += 59
+    assert local_store.get("sid") == "data"
+    clock.now += 2
+    assert local_store.get("sid") is None
+
+
+def test_memory_store_sweep_evicts_expired_sessions(clock):
+    store = MemorySessionStore(sweep_interval=2)
+    store.set("old", "data", ttl=10)
+    clock.now += 11
+
+    store.set("new", "data", ttl=10)  # Second write triggers the sweep
+    assert "old" not in store._sessions
+    assert "new" in store._sessions
+
+
+def test_sqlite_store_sweep_deletes_expired_rows(tmp_path, clock):
+    path = str(tmp_path / "sessions.db")
+    store = SQLiteSessionStore(path, sweep_interval=2)
+    store.set("old", "data", ttl=10)
+    clock.now += 11
+
+    store.set("new", "data", ttl=10)
+    rows = sqlite3.connect(path).execute("SELECT sid FROM sessions").fetchall()
+    assert rows == [("new",)]
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / "sessions.db")
+    SQLiteSessionStore(path).set("sid", "data", ttl=60)
+    assert SQLiteSessionStore(path).get("sid") == "data"
+
+
+def test_redis_store_leaves_expiry_to_the_server(redis_server):
+    store = RedisSessionStore(redis_server.url)
+
+    store.set("sid", "data", ttl=60)
+    assert store.get("sid") == "data"
+    assert 0 < redis_server.ttl("session:sid") <= 60
+
+    redis_server.expire_now("session:sid")
+    assert store.get("sid") is None
+
+
+def test_redis_store_clear_only_removes_sessions(redis_server):
+    store = RedisSessionStore(redis_server.url)
+    store.set("a", "data", ttl=60)
+    store.set("b", "data", ttl=60)
+    redis_server.data[b"other"] = b"keep"
+
+    store.clear()
+    assert store.get("a") is None and store.get("b") is None
+    assert redis_server.data[b"other"] == b"keep"
+
+
+def session_id(client) -> str:
+    cookie = client.get_cookie("session")
+    return cookie.value if cookie else None
+
+
+def login(client, username: str):
+    client.put("/api/create-user", json={"username": username, "password": "secret"})
+    response = client.post("/api/login", json={"username": username, "password": "secret"})
+    assert response.status_code == 200
+
+
+def test_login_issues_a_new_session_id(client, app):
+    store = app.session_interface.store
+    login(client, "first")
+    planted = session_id(client)
+    assert store.get(planted) is not None
+
+    # Someone who knew the ID from before the login must not share the new session
+    login(client, "second")
+    assert session_id(client) != planted
+    assert store.get(planted) is None
+    assert client.get("/api/get-boxers").status_code == 200
+
+
+def test_logout_removes_the_stored_session(client, app):
+    login(client, "tester")
+    sid = session_id(client)
+
+    assert client.post("/api/logout").status_code == 200
+    assert app.session_interface.store.get(sid) is None
+
+
+def test_redis_sessions_through_the_app(redis_server):
+    class RedisConfig(TestConfig):
+        SESSION_BACKEND = "redis"
+        SESSION_REDIS_URL = redis_server.url
+
+    client = create_app(RedisConfig).test_client()
+    login(client, "tester")
+
+    sid = session_id(client)
+    assert redis_server.ttl(f"session:{sid}") > 0
+    assert client.get("/api/get-boxers").status_code == 200
+
+    redis_server.expire_now(f"session:{sid}")
+    assert client.get("/api/get-boxers").status_code == 401
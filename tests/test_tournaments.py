@@ -0,0 +1,95 @@
+import pytest
+
+from boxing.db import db
+from boxing.models.job_model import Jobs
+from boxing.models.tournament_model import TournamentBouts, Tournaments
+
+
+@pytest.fixture
+def entrants(add_boxer) -> list[int]:
+    return [add_boxer(f"Boxer {name}", weight=130 + 5 * i) for i, name in enumerate("ABCDEF")]
+
+
+def create(client, boxer_ids, seed=42, format="round_robin"):
+    return client.post("/api/tournaments", json={"name": "Open", "format": format,
+                                                 "boxer_ids": boxer_ids, "seed": seed})
+
+
+def bouts_of(tournament_id: int) -> list[tuple]:
+    return [
+        (bout.round, bout.boxer_1_id, bout.boxer_2_id, bout.winner_id)
+        for bout in db.session.query(TournamentBouts).filter_by(tournament_id=tournament_id)
+        .order_by(TournamentBouts.id)
+    ]
+
+
+def test_tournament_is_run_by_the_job_worker(logged_in_client, entrants, run_jobs):
+    response = create(logged_in_client, entrants)
+    assert response.status_code == 202
+    tournament = response.json["tournament"]
+    assert tournament["status"] == "pending"
+    assert tournament["job_id"] == response.json["job_id"]
+
+    assert run_jobs() == 1
+
+    tournament = logged_in_client.get(f"/api/tournaments/{tournament['id']}").json["tournament"]
+    assert tournament["status"] == "completed"
+    assert tournament["current_round"] == tournament["total_rounds"] == 5
+    job = logged_in_client.get(f"/api/jobs/{response.json['job_id']}").json["job"]
+    assert job["status"] == "succeeded"
+
+
+def test_duplicate_entrants_are_rejected(logged_in_client, entrants):
+    response = create(logged_in_client, entrants + [entrants[0]])
+
+    assert response.status_code == 400
+    assert f"Duplicate boxer IDs: [{entrants[0]}]" in response.json["message"]
+    assert db.session.query(Tournaments).count() == 0
+
+
+def test_interrupted_tournament_starts_over_with_the_same_results(logged_in_client, entrants, run_jobs):
+    reference_id = create(logged_in_client, entrants).json["tournament"]["id"]
+    run_jobs()
+
+    tournament_id = create(logged_in_client, entrants).json["tournament"]["id"]
+    job = db.session.get(Jobs, db.session.get(Tournaments, tournament_id).job_id)
+    # A worker died in round 2: the tournament is running with a partial round behind it
+    tournament = db.session.get(Tournaments, tournament_id)
+    tournament.status = "running"
+    tournament.current_round = 2
+    db.session.add(TournamentBouts(tournament_id=tournament_id, round=1, boxer_1_id=entrants[0],
+                                   boxer_2_id=entrants[1], winner_id=entrants[1]))
+    db.session.commit()
+    assert job.status == "queued"  # As requeue_stale leaves it
+
+    run_jobs()
+
+    assert db.session.get(Tournaments, tournament_id).status == "completed"
+    assert bouts_of(tournament_id) == bouts_of(reference_id)
+
+
+def test_failed_job_fails_its_tournament(logged_in_client, entrants, job_worker):
+    tournament_id = create(logged_in_client, entrants).json["tournament"]["id"]
+    job = db.session.get(Jobs, db.session.get(Tournaments, tournament_id).job_id)
+    job.status, job.error = "failed", "Worker timed out"
+    db.session.commit()
+
+    job_worker._maintain()
+
+    tournament = logged_in_client.get(f"/api/tournaments/{tournament_id}").json["tournament"]
+    assert tournament["status"] == "failed"
+    assert tournament["error"] == "Tournament job failed"
+
+
+def test_finished_tournament_is_not_run_again(logged_in_client, entrants, run_jobs):
+    response = create(logged_in_client, entrants)
+    run_jobs()
+    job = db.session.get(Jobs, response.json["job_id"])
+    job.status = "queued"
+    db.session.commit()
+
+    run_jobs()
+
+    job = logged_in_client.get(f"/api/jobs/{response.json['job_id']}").json["job"]
+    assert job["status"] == "failed"
+    assert "already completed" in job["error"]
@@ -0,0 +1,277 @@
+"""Background job worker.
+
+Runs jobs queued by the API (e.g. /api/fight?async=1, /api/import-boxers and
+/api/tournaments) on a pool of threads. Start one or more next to the web server, against the
+same database:
+
+    python worker.py
+
+Jobs spend most of their time waiting on random.org or the database, so
+threads are enough; run more processes to scale past one machine's GIL.
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+from typing import Callable
+
+from sqlalchemy import update
+
+from app import create_app
+from boxing.db import db
+from boxing.models.boxer_snapshot import BoxerSnapshot
+from boxing.models.boxers_model import Boxers
+from boxing.models.job_model import FIGHT_JOB, IMPORT_BOXERS_JOB, TOURNAMENT_JOB, JobLostError, Jobs
+from boxing.models.rating_model import Ratings
+from boxing.models.ring_model import RingModel
+from boxing.models.tournament_model import Tournaments, run_tournament
+from boxing.utils.events import EventBroker, init_events
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# How often stale jobs are recovered and old ones purged
+MAINTENANCE_INTERVAL_SECONDS = 30
+
+
+class _UnrecordedSnapshot(BoxerSnapshot):
+    """
+    Snapshot whose fight results are not saved by RingModel.fight(), so that
+    run_fight_job can save them in the same commit as the rest of the fight.
+    """
+    __slots__ = ()
+
+    def update_stats(self, result: str) -> None:
+        pass
+
+
+def _stage_stats(boxer_id: int, result: str) -> None:
+    # Same change as Boxers.update_stats, without its commit
+    values = {"fights": Boxers.fights + 1}
+    if result == "win":
+        values["wins"] = Boxers.wins + 1
+    db.session.execute(update(Boxers).where(Boxers.id == boxer_id).values(**values))
+
+
+def run_fight_job(job: Jobs, events: EventBroker) -> dict:
+    """
+    Fight the two boxers taken out of the ring when the job was queued.
+
+    The boxers' stats, the ratings and the job's completion are committed
+    together, so an attempt that fails or times out part way leaves nothing
+    behind, and a fight is never applied twice.
+
+    Raises:
+        ValueError: If a boxer no longer exists.
+        RuntimeError: If random.org could not be reached; the job is retried.
+    """
+    boxer_ids = job.get_payload()["boxer_ids"]
+    ratings = Ratings.get_ratings(boxer_ids)
+    boxers = [_UnrecordedSnapshot.from_boxer(Boxers.get_boxer_by_id(boxer_id), ratings[boxer_id])
+              for boxer_id in boxer_ids]
+    ring = RingModel()
+    for boxer in boxers:
+        ring.enter_ring(boxer)
+    winner = ring.fight()
+
+    winner_boxer = next(boxer for boxer in boxers if boxer.name == winner)
+    loser_boxer = next(boxer for boxer in boxers if boxer.name != winner)
+    _stage_stats(winner_boxer.id, "win")
+    _stage_stats(loser_boxer.id, "loss")
+    new_ratings = Ratings.record_fight(winner_boxer.id, loser_boxer.id, commit=False)
+    result = {"winner": winner, "ratings": list(new_ratings.values())}
+    job.complete(result)
+
+    events.publish("fight", {
+        "winner": winner,
+        "boxers": [{"id": boxer.id, "name": boxer.name} for boxer in boxers]
+    })
+    events.publish("leaderboard", {"ratings": result["ratings"]})
+    return result
+
+
+def run_import_boxers_job(job: Jobs, events: EventBroker) -> dict:
+    """
+    Create the boxers of a bulk import. Boxers that cannot be created, e.g.
+    because the name is taken, are reported and do not stop the import.
+
+    Each boxer is committed together with the job's checkpoint and a check
+    that this worker still holds the job, which also heartbeats it. A retried
+    import resumes after the last boxer created instead of from the start, and
+    a worker that lost its job stops before creating another boxer.
+
+    Raises:
+        JobLostError: If the import timed out and another worker took it over.
+    """
+    boxers = job.get_payload()["boxers"]
+    progress = job.get_checkpoint() or {"next": 0, "created": 0, "errors": []}
+    if progress["next"]:
+        logger.info("Resuming import job %d at boxer %d of %d", job.id, progress["next"], len(boxers))
+
+    for index in range(progress["next"], len(boxers)):
+        boxer = boxers[index]
+        # Checked and saved by create_boxer's commit, together with the boxer
+        job.hold()
+        job.stage_checkpoint({**progress, "next": index + 1, "created": progress["created"] + 1})
+        try:
+            Boxers.create_boxer(boxer["name"], boxer["weight"], boxer["height"], boxer["reach"], boxer["age"])
+        except ValueError as e:
+            db.session.rollback()
+            progress["errors"].append({"index": index, "name": boxer["name"], "error": str(e)})
+            job.stage_checkpoint({**progress, "next": index + 1})
+            job.heartbeat()
+        progress = job.get_checkpoint()
+
+    errors = progress["errors"]
+    logger.info("Imported %d boxers, %d failed", progress["created"], len(errors))
+    return {"created": progress["created"], "failed": len(errors), "errors": errors[:100]}
+
+
+def run_tournament_job(job: Jobs, events: EventBroker) -> dict:
+    """
+    Run every round of a tournament created by POST /api/tournaments.
+
+    Each round is committed as it finishes, together with a check that this
+    worker still holds the job, which also heartbeats it. A long tournament is
+    therefore not taken for an abandoned job, and a worker that lost its job
+    stops without writing rounds alongside the new holder.
+
+    Raises:
+        ValueError: If the tournament does not exist, has already finished, or
+            failed while running; run_tournament has then marked it failed, so
+            a retry would not run it again.
+        JobLostError: If the tournament timed out and another worker took it over.
+    """
+    tournament_id = job.get_payload()["tournament_id"]
+    try:
+        run_tournament(tournament_id, before_commit=job.hold)
+    except (ValueError, JobLostError):
+        raise
+    except Exception as e:
+        raise ValueError(f"Tournament {tournament_id} failed: {e}") from e
+    return {"tournament_id": tournament_id, "status": "completed"}
+
+
+HANDLERS: dict[str, Callable[[Jobs, EventBroker], dict]] = {
+    FIGHT_JOB: run_fight_job,
+    IMPORT_BOXERS_JOB: run_import_boxers_job,
+    TOURNAMENT_JOB: run_tournament_job,
+}
+
+
+class JobWorker:
+    """
+    Pool of threads that claim and run queued jobs until stopped.
+
+    Job errors are retried with backoff, except ValueError, which means the
+    input is invalid and would fail again.
+    """
+
+    def __init__(self, app, threads: int, poll_seconds: float, concurrency: dict[str, int],
+                 timeout_seconds: float, backoff_seconds: float, retention_seconds: float):
+        self.app = app
+        self.threads = threads
+        self.poll_seconds = poll_seconds
+        self.concurrency = concurrency
+        self.timeout_seconds = timeout_seconds
+        self.backoff_seconds = backoff_seconds
+        self.retention_seconds = retention_seconds
+        self.events = init_events(app)
+        self._stop = threading.Event()
+
+    def stop(self, *_) -> None:
+        logger.info("Stopping job worker after running jobs finish")
+        self._stop.set()
+
+    def _run_job(self, job: Jobs) -> None:
+        logger.info("Running %s job %d (attempt %d of %d)", job.kind, job.id, job.attempts, job.max_attempts)
+        try:
+            try:
+                result = HANDLERS[job.kind](job, self.events)
+            except JobLostError:
+                raise
+            except ValueError as e:
+                db.session.rollback()
+                job.fail(str(e), retry=False)
+            except Exception as e:
+                db.session.rollback()
+                job.fail(str(e), retry=True, backoff_seconds=self.backoff_seconds)
+            else:
+                if job.status == "running":  # Handlers that commit their work with the job complete it themselves
+                    job.complete(result)
+        except JobLostError as e:
+            # The job timed out and was requeued; its new holder saves the outcome
+            logger.warning("Abandoning %s job: %s", job.kind, e)
+
+    def _work(self, worker_id: str) -> None:
+        with self.app.app_context():
+            while not self._stop.is_set():
+                try:
+                    job = Jobs.claim_next(worker_id, tuple(HANDLERS), self.concurrency)
+                    if job is None:
+                        self._stop.wait(self.poll_seconds)
+                        continue
+                    self._run_job(job)
+                except Exception as e:
+                    logger.error("Job worker %s error: %s", worker_id, e)
+                    db.session.rollback()
+                    self._stop.wait(self.poll_seconds)
+                finally:
+                    db.session.remove()
+
+    def _maintain(self) -> None:
+        with self.app.app_context():
+            try:
+                Jobs.requeue_stale(self.timeout_seconds)
+                Tournaments.fail_abandoned()
+                Jobs.purge_finished(self.retention_seconds)
+            except Exception as e:
+                logger.error("Job maintenance failed: %s", e)
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    def run(self) -> None:
+        """
+        Run the worker threads until SIGTERM or SIGINT.
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        workers = [
+            threading.Thread(target=self._work, args=(f"{prefix}:{i}",), name=f"job-worker-{i}")
+            for i in range(self.threads)
+        ]
+        for thread in workers:
+            thread.start()
+        logger.info("Job worker %s started with %d threads", prefix, self.threads)
+
+        while not self._stop.is_set():
+            self._maintain()
+            self._stop.wait(MAINTENANCE_INTERVAL_SECONDS)
+
+        for thread in workers:
+            thread.join()
+        logger.info("Job worker %s stopped", prefix)
+
+
+if __name__ == "__main__":
+    app = create_app()
+    JobWorker(
+        app,
+        threads=app.config.get("JOB_WORKER_THREADS", 4),
+        poll_seconds=app.config.get("JOB_POLL_SECONDS", 0.5),
+        concurrency={
+            FIGHT_JOB: app.config.get("JOB_FIGHT_CONCURRENCY", 4),
+            IMPORT_BOXERS_JOB: app.config.get("JOB_IMPORT_CONCURRENCY", 1),
+            TOURNAMENT_JOB: app.config.get("JOB_TOURNAMENT_CONCURRENCY", 1),
+        },
+        timeout_seconds=app.config.get("JOB_TIMEOUT_SECONDS", 300),
+        backoff_seconds=app.config.get("JOB_RETRY_BACKOFF_SECONDS", 2.0),
+        retention_seconds=app.config.get("JOB_RETENTION_SECONDS", 604800),
+    ).run()